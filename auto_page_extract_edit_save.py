@@ -11,6 +11,9 @@ Auto Page Extract, Edit, Save for CBR Files
 How To Use:
     Either drag one or more files or directories onto this script or run the script in your
     root directory with CBR files.
+    
+    Or import this script to extract, edit and encode the pages of a CBR file held in memory (Bytes
+    or a file-like object) without any files being read or written, see iterEncodedPages.
 
 Requirements:
     Pillow is an imaging library that must be installed in order to modify pages which are images.
@@ -37,7 +40,7 @@ Requirements:
 
 TODO:
     [X] Create log file.
-        [] Record completion times
+        [X] Record completion times
     [] Support for other comic book file types (CBZ,CB7,CBC,etc - Many of these use the .cbr extension even though they are not using RAR compression)
     [] Add more image editing options that make sense for pages of book/magazine/etc.
         [X] Combine two pages vertically or horizontal.
@@ -58,8 +61,59 @@ loop_script = True
 # Create a log file that will record all the details of each playlist created, which includes
 # the full file paths of the playlists and the disc image files recorded within.
 # Note: Log file creation is always overwritten, not appended too.
+# Everything done is also recorded as it happens in a JSON lines run log ("__log.jsonl") that the log file
+# is created from, so a run that stops early still leaves a record of every page finished.
 create_log_file = True
 
+# How much is printed while running.
+# 0 = Only errors and totals, 1 = Errors and a single line showing progress, 2 = Every step done to every page.
+verbosity = 1
+
+# Progress is shown as JSON lines on stderr (for other programs to read) instead of a single line.
+progress_as_json = False
+
+# Seconds between progress updates.
+progress_interval = 0.5
+
+# Watch one or more inbox directories for new CBR files and process them as they arrive, never waiting for input.
+# Runs until stopped (Ctrl+C). Directories can also be given on the command line: --watch DIR [DIR ...]
+watch_directories = []
+
+# Seconds between checks for new files in the watched directories.
+watch_poll_interval = 2.0
+
+# Seconds a new file's size and modified time must stay the same before it's processed (still being copied/written).
+watch_settle_time = 5.0
+
+# Profile every stage (listing, extracting, decoding, editing and saving) with cProfile and/or track the memory
+# allocated in each stage with tracemalloc. Results are saved next to the log file. (Slows everything down)
+profile_stages = False
+track_allocations = False
+
+# Largest page (in pixels, width x height) that will be opened. Larger pages are skipped and logged as an extraction
+# error, protecting against "decompression bombs" (tiny files that decode to huge images). Tall webtoon strips can be
+# 800 x 60,000 pixels or more. 0 = No limit.
+max_image_pixels = 300_000_000
+
+# Share the work with other computers (or processes) running this script on the same CBR files, through a directory
+# they can all reach (a NAS for example). Each CBR file is claimed with a lease file before it's processed, so no two
+# workers process the same CBR file, and marked done after. Leases are renewed while working, and a lease not renewed
+# for "lease_expiry" seconds (crashed worker) is taken over. All workers must see the CBR files at the same paths.
+# Delete the directory's files to process everything again. None = Don't share.
+# Can also be given on the command line: --lease-dir DIR
+lease_directory = None
+lease_expiry = 300.0
+
+# Save a checkpoint of the run, adding each CBR file to it as soon as it's done. If this script stops mid-run (crash,
+# power loss), run it again with --resume to skip every CBR file already done and keep logging where it left off.
+# The checkpoint is deleted once a run ends normally. Also turned on with --checkpoint PATH or --resume.
+save_checkpoints = False
+
+# CBR files that are copies of each other (same size and same files inside) are only extracted, edited and saved once.
+# The pages saved from the first copy are hard linked (or copied if they can't be) to where each other copy's pages
+# would have been saved. Copies are found from a fingerprint of each CBR file, not by reading every page.
+reuse_duplicate_archives = True
+
 
 # Preset Options
 DESCRIPTION = 20
@@ -78,6 +132,8 @@ OVERWRITE_FILES = 13
 MODIFY_FILE_NAMES = 14
 SAVE_DIR_PATH = 15
 KEEP_FILE_PATHS_INTACT = 16
+RESOLVE_NAME_CONFLICTS = 17
+SLICE_TALL_PAGES = 18
 
 # Page Sort Modifiers
 ALPHA = 0         # Sort alphabetically where digits are sorted individually (100 < 99). [Default]
@@ -122,6 +178,12 @@ TIF = ('TIFF', '.tif', '.tiff')
 WEB = ('Web Picture', '.webp')
 SUPPORTED_IMAGE_FORMATS = [BMP, GIF, ICN, ICO, JP2, JPG, PBM, PNG, RAS, TIF, WEB]
 
+# Pick JPEG or WebP (photographic pages) or palettized PNG (line-art and text pages) for each page. (CHANGE_IMAGE_FORMAT Only)
+AUTO = ('Automatic', '.jpg', '.webp', '.png')
+
+# Document Formats - All pages of a CBR file are saved into one document. (CHANGE_IMAGE_FORMAT Only)
+PDF = ('Portable Document Format', '.pdf')
+
 # Extra Image Saving Parameters
 QUALITY = 0       # Quality settings are equivalent to the Photoshop settings with possible values between 0-100, default 75. (JPEG, TIFF, WEBP Only)
 QUANT_TABLES = 1  # Quantization Tables - Note: specific values are not supported here, only preset values accepted. (JPEG Only)
@@ -131,11 +193,17 @@ PROGRESSIVE = 4   # Possible progressive values are True or False. (JPEG Only)
 SIZES = 5         # Default: [(16,16), (24,24), (32,32), (48,48), (64,64), (128,128), (256,256)] - Maximum Size: 256 (ICO Only)
 COMPRESSION = 6   # Possible compress levels are between 1-9, default 6, and auto-set to 9 if OPTIMIZE is set to True. (BMP, PNG Only)
                   # - Note: BMP only allows values between 1-2 (1 = 256 Colors, 2 = 16 Colors)
+MAX_FILE_SIZE = 7            # Largest size in bytes a page may be saved as, by lowering QUALITY or the number of colors (PNG) just enough. (JPEG, WEBP, PNG Only)
+MAX_BYTES_PER_MEGAPIXEL = 8  # Same as MAX_FILE_SIZE but relative to the size of each page, if both are used the smaller size is used.
+                             # - Note: QUALITY is then where the search starts from, the highest quality tried.
+SHARED_PALETTE = 9  # Number of colors (2-256) in one palette made for all pages of a CBR file instead of one for each page, or True for 256.
+                    # PNG pages are then saved with a palette too (AUTO only line-art pages). (GIF, PNG Only)
 # The following presets are available by default:
 # 'keep', 'web_low', 'web_medium', 'web_high', 'web_very_high', 'web_maximum', 'low', 'medium', 'high', 'maximum'.
 # To apply a preset use   IMAGE_SAVING_PARAMS : { QUALITY : 'preset_name' }
 # To apply 'only' the quantization table use    { QUANT_TABLES : 'preset_name' }
 # To apply 'only' the subsampling setting use   { SUBSAMPLING : 'preset_name' }
+# To fit each page into 200 KB use              { MAX_FILE_SIZE : 200_000 }
 
 # Resampling Filters
 NEAREST = 0
@@ -176,6 +244,7 @@ selected_preset = 4
 preset0 = { #           : Defaults          # If option omitted, the default value will be used.
   DESCRIPTION           : '',               # Description of this preset.
   PAGES_TO_EXTRACT      : (1,-1),           # (1,-1) = All Pages. Examples: Range of Pages = ('Starting Page','Ending Page') or Specific Pages = [1,3,6,-1] or One Page = 3
+                                            # - Or a page selection string. Example: '1-5, -3:-1, odd, every 4th, !2' (see getPageSelectionTerm for all terms)
                                             # - Negative numbers start from the last page and count backwards. Example: If 50 total pages, -1 = 50 and -7 = 43.
                                             # - Ranged numbers outside the bounds of the total pages will be forced inbounds and specific out-of-bound numbers will be ignored.
   SORT_PAGES_BY         :(ALPHA, ASCENDING),# Before extracting, sort pages alphabetically, alphabetically with whole numbers, or only using numbers.
@@ -184,10 +253,12 @@ preset0 = { #           : Defaults          # If option omitted, the default val
   CHANGE_HEIGHT         : NO_CHANGE,        # - Example: (Modifier, Number)  Modifiers: NO_CHANGE, CHANGE_TO, MODIFY_BY_PIXELS, MODIFY_BY_PERCENT, UPSCALE, DOWNSCALE
   KEEP_ASPECT_RATIO     : True,             # Keep aspect ratio only if one size, width or height, has changed.
   ROTATE_PAGES          : None,             # Rotate angle in degrees counter clockwise any or all pages from PAGES_TO_EXTRACT.
-                                            # - Example: All Pages = Degrees or Specific Pages = {1:90, 2:180,...}
+                                            # - Example: All Pages = Degrees or Specific Pages = {1:90, 2:180,...} or Page Selections = {'odd':90, 'even':270}
   COMBINE_PAGES         : None,             # Combine two pages from PAGES_TO_EXTRACT. Example: [(VERTICAL,1,2),(HORIZONTAL,3,4),...]
   RESAMPLING_FILTER     : NEAREST,          # When editing a page/image use this resampling filter. Examples: NEAREST, BILINEAR, BICUBIC
   CHANGE_IMAGE_FORMAT   : NO_CHANGE,        # Change the image format of a page too... BMP, GIF, ICO, JPG, JP2, PBM, PNG, RAS, TIF, WEB
+                                            # - Or AUTO to pick a format for each page from what it looks like (see chooseAutoFormat).
+                                            # - Or save all pages of a CBR file into one PDF file (named like a page, INSERT_PAGE_NAME = CBR file name).
   IMAGE_SAVING_PARAMS   : None,             # Extra Image Saving Parameters: QUALITY, QUANT_TABLES, SUBSAMPLING, OPTIMIZE, PROGRESSIVE, COMPRESSION
                                             # - Examples: {QUALITY : 90, QUANT_TABLES : 'high', SUBSAMPLING : 1, OPTIMIZE : True, PROGRESSIVE : False, COMPRESSION : 7}
   SEARCH_SUB_DIRS       : False,            # After searching a directory also search it's sub-directories if True.
@@ -201,6 +272,10 @@ preset0 = { #           : Defaults          # If option omitted, the default val
                                             # - Extracted page file names can be the same if each is saved in a different directory.
   KEEP_FILE_PATHS_INTACT: True,             # When extracting pages/files they may be in one or more folders. So when saving, stick with the same file structure.
                                             # If False, all extracted pages/files will be placed directly in the SAVE_DIR_PATH and there may be file name conflicts.
+  RESOLVE_NAME_CONFLICTS: False,            # Before extracting, the save paths of all pages are planned and any pages that would be saved to the same file are reported.
+                                            # - If True, those file name conflicts are resolved by adding a number to the file name. Example: 'Page (2).jpg'
+  SLICE_TALL_PAGES      : None,             # Save pages taller than this many pixels (after editing) as slices this tall, top to bottom. Example: 2000
+                                            # - Slices are numbered after the page number, Page 5 -> 5_1, 5_2, ... (INSERT_PAGE_NUMBER) and each is counted (INSERT_COUNTER).
 }                                           # Note: Any 'pages numbers' that are 'strings' are considered disabled and ignored. Example: 5 -> '5'
                                             #       This is mainly for use in the app. Page numbers are used in: PAGES_TO_EXTRACT, ROTATE_PAGES, COMBINE_PAGES
 ##TODO: Some preset options:
@@ -285,47 +360,1013 @@ preset_options = [preset0,preset1,preset2,preset3,preset4]
 
 debug = True ## TODO
 
-from common_functions import MakeDirectories, ModifyImageSize, MakeList, SortFiles
+from common_functions import GetSortKeyFunction, LazyImport, ListFileNames, ModifyImageSize, MakeList, StartTimer, StopTimer
+import argparse
+from datetime import datetime
+import hashlib
+import heapq
+import io
+import json
 from pathlib import Path, PurePath
-import patoolib
-from PIL import Image, UnidentifiedImageError
-from os import startfile as OpenFile, walk as Search
-import rarfile
+import os
+from os import walk as Search
+import pickle
 import re
+import shutil
+import signal
+import socket
+import struct
 import sys
 import tempfile
+import threading
+from time import perf_counter, sleep as Wait, time as CurrentTime
+import zlib
+from array import array
 
 ROOT_DIR = Path(__file__).parent
 
 # If the UnRAR Tool is not located in below path or properly installed on this machine,
 # then this script won't work.
 unrar_app_path = Path(PurePath().joinpath(ROOT_DIR, 'UnRAR.exe'))
-if unrar_app_path.exists():
-    rarfile.UNRAR_TOOL = unrar_app_path
+
+### Use the UnRAR Tool in this script's directory (if there) once rarfile is imported.
+###     (rarfile_module) The rarfile module.
+###     --> Returns a [None]
+def setUnrarTool(rarfile_module):
+    if unrar_app_path.exists():
+        rarfile_module.UNRAR_TOOL = unrar_app_path
+    return None
+
+### Pillow's own decompression bomb check uses the same limit as openImage (see max_image_pixels), so it still
+### protects everything else that opens images in this process. Pillow only refuses images twice its limit.
+### A max_image_pixels of 0 turns both off.
+###     (image_module) The PIL.Image module.
+###     --> Returns a [None]
+def setUpPillow(image_module):
+    image_module.MAX_IMAGE_PIXELS = max_image_pixels or None
+    return None
+
+# Modules only needed once work starts, or only by some options, are imported when first used so starting
+# this script (or importing it) stays fast. Example: patoolib is only used if rarfile fails to extract a page.
+cProfile = LazyImport('cProfile')
+Image = LazyImport('PIL.Image', setUpPillow)
+patoolib = LazyImport('patoolib')
+pstats = LazyImport('pstats')
+rarfile = LazyImport('rarfile', setUnrarTool)
+subprocess = LazyImport('subprocess')
+tracemalloc = LazyImport('tracemalloc')
+zipfile = LazyImport('zipfile')
 
 # Log data for internal use.
 LOG_DATA = 1137
-CBR_FILE_PATHS =      0
+CBR_FILE_PATHS =      0   # {CBR File Path : None} In the order found (a set that keeps it's order)
 IMAGE_EXTENSIONS =    1
-PAGE_DATA =           2
-PAGE_INDEXES =         20
-PAGE_META_DATA =       21
-PAGE_EDITS_MADE =      22
-PAGE_SAVE_PATHS =      23
-PAGE_SAVE_DETAILS =     24
-NOT_SAVED =              240
-#SAVE_ERROR =             241
-NEW_SAVE =               241
-OVERWRITTEN =            242
-PAGE_EXTRACT_ERRORS =  25
-PAGE_EDIT_ERRORS =     26
-
+PAGE_DATA =           2   # {CBR File Path : PageTable}
 TEMP_DIR =            3
+SAVE_DIR_LISTINGS =   4
+PLANNED_SAVE_PATHS =  5
+RUN_LOG =             6   # RunLog
+RUN_COUNTERS =        7   # RunCounters
+ARCHIVES_IN_MEMORY =  8   # {CBR File Path : Bytes or file-like object}
+WORK_LEASES =         9   # WorkLeases or None
+CHECKPOINT =         10   # Checkpoint or None
+ARCHIVE_FINGERPRINTS = 11 # {(size, member table hash) : CBR File Path of the first copy found}
 IMAGE_DATA = 7777
 
+# Page Save Details
+NO_SAVE_DETAILS = 0
+NOT_SAVED =       240
+NEW_SAVE =        241
+OVERWRITTEN =     242
+SAVE_ERROR =      243
+ENCODED =         244  # Encoded in memory (see iterEncodedPages), not saved to a file.
+
+# Timed Stages
+TIME_LIST =    0  # Listing and sorting the files archived in a CBR file.
+TIME_EXTRACT = 1  # Reading a page out of a CBR file.
+TIME_DECODE =  2  # Decoding a page into an image.
+TIME_RESIZE =  3
+TIME_ROTATE =  4
+TIME_COMBINE = 5
+TIME_SAVE =    6  # Encoding and saving a page/image file.
+TIMED_STAGES = {
+    TIME_LIST : 'Listing', TIME_EXTRACT : 'Extraction', TIME_DECODE : 'Decoding', TIME_RESIZE : 'Resizing',
+    TIME_ROTATE : 'Rotating', TIME_COMBINE : 'Combining', TIME_SAVE : 'Encoding/Saving'
+}
+SLOWEST_PAGES_LOGGED = 10
+
+# Stage Hook Events
+BEFORE_STAGE = 0
+AFTER_STAGE = 1
+
+# Verbosity Levels
+SHOW_ERRORS = 0
+SHOW_PROGRESS = 1
+SHOW_EVERYTHING = 2
+
+# Names used for save details and edits in the run log.
+SAVE_DETAIL_ORDER = (NO_SAVE_DETAILS, NOT_SAVED, ENCODED, NEW_SAVE, OVERWRITTEN, SAVE_ERROR) # Least to most important.
+SAVE_DETAIL_NAMES = {NOT_SAVED : 'Not Saved', NEW_SAVE : 'New Save', OVERWRITTEN : 'Overwritten', SAVE_ERROR : 'Error', ENCODED : 'Encoded'}
+EDIT_NAMES = {CHANGE_WIDTH : 'width', CHANGE_HEIGHT : 'height', ROTATE_PAGES : 'rotate', COMBINE_PAGES : 'combine'}
+
 WIDTH = 0
 HEIGHT = 1
 
+# Tall Pages (Webtoon Strips)
+TALL_PAGE_HEIGHT = 8192  # Pages this tall are resized in bands and, if JPEGs being made smaller, decoded at a reduced scale.
+BAND_HEIGHT = 1024       # Rows of a tall page resized at a time.
+SLICE_SEPARATOR = '_'    # Between the page number and slice number of a page sliced (SLICE_TALL_PAGES). Example: 5_2
+AUTO_SAMPLE_SIZE = 256   # Pages are measured from a copy shrunk to fit in this size (CHANGE_IMAGE_FORMAT : AUTO).
+AUTO_KEY_COLORS = 16     # How much of a page it's most used colors (a quarter as many if grayscale) cover decides what it is.
+AUTO_LINE_ART_COVERAGE = 0.90  # Pages covered this much are saved as palettized PNGs, pages covered less than
+AUTO_PHOTO_COVERAGE = 0.75     # this as JPEGs, and pages in between are encoded both ways and the smaller kept.
+AUTO_PALETTE_COVERAGE = 0.98   # Palettes have the fewest colors (2, 4, 16 or 256) that cover this much of a page.
+AUTO_PHOTO_FORMATS = [JPG, WEB] # Photographic pages are encoded in each of these formats (Pillow can save) and the smallest kept.
+PALETTE_SAMPLE_PAGES = 8    # Most pages a shared palette (SHARED_PALETTE) is made from, spread across the CBR file.
+PALETTE_SAMPLE_SIZE = 256   # Each page sampled is shrunk to this size (width and height) first.
+LEASE_POLL_INTERVAL = 10.0  # Most seconds between checks on CBR files claimed by other workers (see WorkLeases).
+WATCH_REUSABLE_ARCHIVES = 1000  # CBR files done kept when watching, only for later copies to reuse (see evictFinishedArchives).
+ICO_SIZES = [(16,16), (24,24), (32,32), (48,48), (64,64), (128,128), (256,256)]  # Sizes in an ICO file unless SIZES used.
+ICNS_SIZES = [(32,32), (64,64), (128,128), (256,256), (512,512), (1024,1024)]    # Sizes in an ICNS file.
+NESTED_ARCHIVE_EXTENSIONS = ('.zip', '.cbz', '.rar', '.cbr')  # Archives (like chapters) inside CBR files, pages are read from them too.
+MAX_NESTED_ARCHIVES = 4  # Most archives deep a page can be nested.
+TARGET_SIZE_SETTINGS = { # Settings tried to fit pages into a target file size (MAX_FILE_SIZE), largest files first.
+    'JPEG' : ('quality', tuple(range(95, 0, -5))),
+    'WEBP' : ('quality', tuple(range(95, 0, -5))),
+    'PNG' : ('colors', (None, 256, 128, 64, 32, 16, 8, 4, 2)) # Compression barely changes the size of a PNG, fewer colors do. None = All colors.
+}
+
+
+### All the log data of the pages in one CBR file. Page file names are interned and kept in one sorted
+### List (the index of a name is its page index), save details are kept as one byte per page, and
+### everything else is only recorded for pages that were actually edited, saved or had errors.
+###     (page_names) A sorted List of the file names of all pages/images archived in a CBR file.
+class PageTable:
+    __slots__ = (
+        'page_names',      # [List] File names of each page inside the CBR file. Example: "Chapter 1.zip/01.jpg" if nested.
+        'nested_pages',    # [Dictionary] {page_index : (nested archive file name, ..., page file name)} Pages in nested archives.
+        'page_indexes',    # [PageSelection] Indexes of pages to extract.
+        'resizes',         # [Dictionary] {page_index : (org_width, org_height, new_width, new_height)}
+        'org_sizes',       # [Dictionary] {page_index : (org_width, org_height)} Pages decoded at a reduced scale (see decodePage).
+        'rotations',       # [Dictionary] {page_index : degrees}
+        'combines',        # [Dictionary] {page_index : [(page_index_two, layout), ...] or page_index_combined_into}
+        'extract_errors',  # [Dictionary] {page_index : [error messages]}
+        'edit_errors',     # [Dictionary] {page_index : {CHANGE_WIDTH/CHANGE_HEIGHT/ROTATE_PAGES/COMBINE_PAGES : error message}}
+                           #   A failed combine's error is kept on the first page, the second page's is that page index.
+        'save_plan',       # [Dictionary] {page_index : (save_dir_path, page_number, counter, save_file_path)}
+        'planned_paths',   # [List] Save file paths planned for this CBR file (see planSavePaths), to forget them quickly.
+        'save_paths',      # [Dictionary] {page_index : save_file_path} The first slice's if sliced.
+        'slices',          # [Dictionary] {page_index : [save_file_path of each slice]} Pages sliced (SLICE_TALL_PAGES).
+        'save_details',    # [Bytearray] NO_SAVE_DETAILS, NOT_SAVED, NEW_SAVE, OVERWRITTEN, SAVE_ERROR, or ENCODED for each page.
+        'save_errors',     # [Dictionary] {page_index : error message}
+        'save_formats',    # [Dictionary] {page_index : description} Formats chosen for pages (CHANGE_IMAGE_FORMAT : AUTO).
+        'palette',         # [Image] Palette shared by all pages (SHARED_PALETTE), None until first needed.
+        'encode_settings', # [Dictionary] {image format : setting index} Last setting that fit a target file size (see encodeToFileSize).
+        'archive_times',   # [Dictionary] {TIME_LIST/TIME_EXTRACT/etc : [wall_seconds, cpu_seconds]} Totals for the whole CBR file.
+        'page_times',      # [Dictionary] {page_index : {TIME_EXTRACT/TIME_DECODE/etc : [wall_seconds, cpu_seconds]}}
+        'processed',       # [Boolean] All pages have been extracted, edited and saved.
+        'fingerprint',     # [Tuple] (size, member table hash) of the CBR file (see getArchiveFingerprint).
+        'duplicate_of',    # [Path] The CBR file this one is a copy of (same fingerprint), or None.
+    )
+    
+    def __init__(self, page_names):
+        self.page_names = [sys.intern(name) for name in page_names]
+        self.nested_pages = {}
+        self.page_indexes = PageSelection(len(self.page_names))
+        self.resizes = {}
+        self.org_sizes = {}
+        self.rotations = {}
+        self.combines = {}
+        self.extract_errors = {}
+        self.edit_errors = {}
+        self.save_plan = {}
+        self.planned_paths = []
+        self.save_paths = {}
+        self.slices = {}
+        self.save_details = bytearray(len(self.page_names))
+        self.save_errors = {}
+        self.save_formats = {}
+        self.palette = None
+        self.encode_settings = {}
+        self.archive_times = {}
+        self.page_times = {}
+        self.processed = False
+        self.fingerprint = None
+        self.duplicate_of = None
+    
+    ### Get the local file path of a page within the CBR file.
+    ###     (page_index) Index of a page.
+    ###     --> Returns a [Path]
+    def getPagePath(self, page_index):
+        return Path(self.page_names[page_index])
+    
+    ### Record if and how a page was saved.
+    ###     (page_index) Index of a page.
+    ###     (save_detail) NOT_SAVED, NEW_SAVE, OVERWRITTEN, SAVE_ERROR, or ENCODED.
+    ###     (error) An error message if the page failed to save.
+    ###     --> Returns a [None]
+    def setSaveDetail(self, page_index, save_detail, error = None):
+        self.save_details[page_index] = save_detail
+        if error:
+            self.save_errors[page_index] = error
+        else:
+            self.save_errors.pop(page_index, None)
+        return None
+    
+    ### Record the time a stage took, adding to the totals of the whole CBR file and to the page (if any).
+    ###     (stage) TIME_LIST, TIME_EXTRACT, TIME_DECODE, TIME_RESIZE, TIME_ROTATE, TIME_COMBINE, or TIME_SAVE.
+    ###     (timing) A Tuple (wall_seconds, cpu_seconds) returned by StopTimer.
+    ###     (page_index) Index of the page timed or None if timing the whole CBR file.
+    ###     --> Returns a [None]
+    def addTime(self, stage, timing, page_index = None):
+        wall, cpu = timing
+        times = self.archive_times.setdefault(stage, [0.0, 0.0])
+        times[0] += wall
+        times[1] += cpu
+        if page_index is not None:
+            times = self.page_times.setdefault(page_index, {}).setdefault(stage, [0.0, 0.0])
+            times[0] += wall
+            times[1] += cpu
+        return None
+    
+    ### Get the total time spent on a page in all stages.
+    ###     (page_index) Index of a page.
+    ###     --> Returns a [Tuple] (wall_seconds, cpu_seconds)
+    def getPageTime(self, page_index):
+        page_times = self.page_times.get(page_index, {}).values()
+        return sum(times[0] for times in page_times), sum(times[1] for times in page_times)
+    
+    ### Check if extraction failed using both extraction methods.
+    ###     (page_index) Index of a page.
+    ###     --> Returns a [Boolean]
+    def failedExtraction(self, page_index):
+        return len(self.extract_errors.get(page_index, [])) > 1
+    
+    ### Check if every page planned to be saved has been (or failed to be) saved.
+    ###     --> Returns a [Boolean]
+    def isComplete(self):
+        return self.processed and all(
+            self.save_details[page_index] != NO_SAVE_DETAILS or self.failedExtraction(page_index) for page_index in self.save_plan
+        )
+    
+    ### Check if copies of this CBR file can reuse it's saved pages (see canReuseArchive).
+    ###     --> Returns a [Boolean]
+    def canBeReused(self):
+        return bool(self.processed and self.save_paths and not self.slices and not self.extract_errors and not self.save_errors)
+
+
+### A compiled selection of pages (see compilePageSelection). Which pages are selected is kept in a bitset
+### so checking if a page is selected takes the same time no matter how many pages there are, while the
+### page indexes themselves are kept in the order they were selected.
+###     (total_pages) Total number of pages in a CBR.
+class PageSelection:
+    __slots__ = ('bits', 'indexes')
+    
+    def __init__(self, total_pages):
+        self.bits = bytearray((total_pages + 7) >> 3)
+        self.indexes = array('L')
+    
+    def __contains__(self, page_index):
+        if type(page_index) != int or page_index < 0 or page_index >= len(self.bits) << 3:
+            return False
+        return bool(self.bits[page_index >> 3] & (1 << (page_index & 7)))
+    
+    def __iter__(self):
+        return iter(self.indexes)
+    
+    def __len__(self):
+        return len(self.indexes)
+    
+    ### Show selected pages as page numbers with runs of pages shortened. Example: [1-5, 8, 10-12]
+    def __repr__(self):
+        page_runs = []
+        run_start = run_end = None
+        for page_index in self.indexes:
+            if run_end is not None and page_index == run_end + 1:
+                run_end = page_index
+                continue
+            if run_start is not None:
+                page_runs.append(f'{run_start+1}' if run_start == run_end else f'{run_start+1}-{run_end+1}')
+            run_start = run_end = page_index
+        if run_start is not None:
+            page_runs.append(f'{run_start+1}' if run_start == run_end else f'{run_start+1}-{run_end+1}')
+        return f'[{", ".join(page_runs)}]'
+    
+    ### Add pages to the selection, any pages already selected are ignored.
+    ###     (page_indexes) An iterable of page indexes.
+    ###     --> Returns a [None]
+    def add(self, page_indexes):
+        for page_index in page_indexes:
+            if page_index not in self:
+                self.bits[page_index >> 3] |= 1 << (page_index & 7)
+                self.indexes.append(page_index)
+        return None
+    
+    ### Remove pages from the selection.
+    ###     (page_indexes) An iterable of page indexes.
+    ###     --> Returns a [None]
+    def remove(self, page_indexes):
+        for page_index in page_indexes:
+            if page_index in self:
+                self.bits[page_index >> 3] &= ~(1 << (page_index & 7))
+        self.indexes = array('L', [page_index for page_index in self.indexes if page_index in self])
+        return None
+
+
+### Running totals of everything done in a run. Each stage adds to these as it goes so the totals never
+### need to be counted up again from the log data of every CBR file.
+class RunCounters:
+    __slots__ = (
+        'archives_found',    # CBR files prepared.
+        'archives_done',     # CBR files extracted, edited and saved.
+        'pages_to_extract',  # Pages selected to extract.
+        'pages_done',        # Pages finished (saved, not saved, combined into another page or failed).
+        'extract_errors',    # Pages that failed both extraction methods.
+        'pages_saved',       # Pages given a save path (saved, not saved or failed to save).
+        'edit_errors',       # Edits that failed. A failed combine of two pages is one failed edit.
+        'save_errors',       # Pages that failed to save.
+        'bytes_read',        # Bytes of page files read out of CBR files.
+        'bytes_written',     # Bytes of page/image files saved.
+    )
+    
+    def __init__(self):
+        self.archives_found = 0
+        self.archives_done = 0
+        self.pages_to_extract = 0
+        self.pages_done = 0
+        self.extract_errors = 0
+        self.pages_saved = 0
+        self.edit_errors = 0
+        self.save_errors = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+    
+    ### Get all the counters by name.
+    ###     --> Returns a [Dictionary]
+    def asDict(self):
+        return {name : getattr(self, name) for name in self.__slots__}
+
+
+### Shows how far along a run is: CBR files and pages done, pages per second, MB per second read and written,
+### and the estimated time left. Shown as a single line that keeps being rewritten, or as JSON lines on stderr
+### (see progress_as_json). Updates are limited to one every "progress_interval" seconds. Each thread has a
+### progress of it's own, so runs on other threads (like jobs in the Page Job Server) never mix up their counters.
+class Progress(threading.local):
+    
+    def __init__(self):
+        self.counters = None
+        self.started = 0.0
+        self.last_update = 0.0
+        self.line_length = 0
+        self.start_counts = (0, 0, 0)
+    
+    ### Start showing the progress of a run.
+    ###     (counters) The RunCounters of the run.
+    ###     --> Returns a [None]
+    def start(self, counters):
+        self.counters = counters
+        self.started = perf_counter()
+        self.last_update = 0.0
+        self.start_counts = (counters.pages_done, counters.bytes_read, counters.bytes_written)
+        return None
+    
+    ### Get the current progress.
+    ###     --> Returns a [Dictionary]
+    def getStatus(self):
+        counters = self.counters
+        elapsed = max(perf_counter() - self.started, 1e-9)
+        pages_done = counters.pages_done - self.start_counts[0]
+        pages_per_second = pages_done / elapsed
+        pages_left = max(counters.pages_to_extract - counters.pages_done, 0)
+        return {
+            'archives_done' : counters.archives_done,
+            'archives_found' : counters.archives_found,
+            'pages_done' : counters.pages_done,
+            'pages_to_extract' : counters.pages_to_extract,
+            'pages_per_second' : round(pages_per_second, 2),
+            'mb_read_per_second' : round((counters.bytes_read - self.start_counts[1]) / elapsed / 1048576, 2),
+            'mb_written_per_second' : round((counters.bytes_written - self.start_counts[2]) / elapsed / 1048576, 2),
+            'elapsed_seconds' : round(elapsed, 1),
+            'eta_seconds' : round(pages_left / pages_per_second, 1) if pages_per_second else None
+        }
+    
+    ### Show the current progress if enough time has passed since it was last shown.
+    ###     (force) Show it now no matter how long ago it was last shown.
+    ###     --> Returns a [None]
+    def update(self, force = False):
+        if not self.counters or verbosity < SHOW_PROGRESS:
+            return None
+        now = perf_counter()
+        if not force and now - self.last_update < progress_interval:
+            return None
+        self.last_update = now
+        status = self.getStatus()
+        
+        if progress_as_json:
+            sys.stderr.write(json.dumps(status) + '\n')
+            sys.stderr.flush()
+        else:
+            eta = status['eta_seconds']
+            eta = f'{int(eta // 60)}:{int(eta % 60):02d}' if eta is not None else '-:--'
+            line = (f'CBR Files {status["archives_done"]}/{status["archives_found"]} | '
+                    f'Pages {status["pages_done"]}/{status["pages_to_extract"]} | '
+                    f'{status["pages_per_second"]:.1f} pages/s | '
+                    f'Read {status["mb_read_per_second"]:.1f} MB/s | '
+                    f'Written {status["mb_written_per_second"]:.1f} MB/s | ETA {eta}')
+            sys.stdout.write('\r' + line.ljust(self.line_length))
+            sys.stdout.flush()
+            self.line_length = len(line)
+        return None
+    
+    ### Remove the progress line so other messages can be printed, it's shown again on the next update.
+    ###     --> Returns a [None]
+    def clearLine(self):
+        if self.line_length:
+            sys.stdout.write('\r' + ' ' * self.line_length + '\r')
+            self.line_length = 0
+            self.last_update = 0.0
+        return None
+    
+    ### Show the final progress and stop.
+    ###     --> Returns a [None]
+    def finish(self):
+        self.update(force=True)
+        if self.line_length:
+            sys.stdout.write('\n')
+            self.line_length = 0
+        self.counters = None
+        return None
+
+progress = Progress()
+
+
+### Print a message if the verbosity level allows it, moving the progress line out of the way.
+###     (message) Message to print.
+###     (level) SHOW_ERRORS, SHOW_PROGRESS, or SHOW_EVERYTHING.
+###     --> Returns a [None]
+def printMessage(message, level = SHOW_EVERYTHING):
+    if verbosity >= level:
+        progress.clearLine()
+        print(message)
+    return None
+
+
+# Hooks are shared by all threads, the CBR file path given to a callback tells runs on different threads apart.
+# Lists of callbacks are replaced, never changed, so a stage running on another thread is never disturbed.
+stage_hooks = {} # {(BEFORE_STAGE/AFTER_STAGE, TIME_LIST/TIME_EXTRACT/etc) : [callbacks]}
+stage_hooks_lock = threading.Lock()
+
+### Register a callback to be called before and/or after stages. Callbacks are called with the event, stage,
+### CBR file path, page index (None when a stage is for a whole CBR file) and the time the stage took (None
+### before a stage). Example: registerStageHook(lambda event, stage, cbr, page, timing: print(stage, timing), [TIME_SAVE], [AFTER_STAGE])
+###     (callback) A Function (event, stage, cbr_file_path, page_index, timing).
+###     (stages) A List of stages: TIME_LIST, TIME_EXTRACT, TIME_DECODE, TIME_RESIZE, TIME_ROTATE, TIME_COMBINE, TIME_SAVE. None for all stages.
+###     (events) A List of events: BEFORE_STAGE, AFTER_STAGE.
+###     --> Returns a [Function] (the callback)
+def registerStageHook(callback, stages = None, events = (BEFORE_STAGE, AFTER_STAGE)):
+    with stage_hooks_lock:
+        for stage in (stages if stages is not None else TIMED_STAGES):
+            for event in events:
+                stage_hooks[(event, stage)] = stage_hooks.get((event, stage), []) + [callback]
+    return callback
+
+
+### Stop calling a callback registered with registerStageHook.
+###     (callback) A Function.
+###     --> Returns a [None]
+def unregisterStageHook(callback):
+    with stage_hooks_lock:
+        for key in list(stage_hooks):
+            hooks = [hook for hook in stage_hooks[key] if hook is not callback]
+            if hooks:
+                stage_hooks[key] = hooks
+            else:
+                del stage_hooks[key]
+    return None
+
+
+### Call all the callbacks registered for an event and stage. A callback that fails is reported and skipped.
+###     --> Returns a [None]
+def runStageHooks(event, stage, cbr_file_path, page_index, timing):
+    for callback in stage_hooks.get((event, stage), ()):
+        try:
+            callback(event, stage, cbr_file_path, page_index, timing)
+        except Exception as err:
+            printMessage(f'Stage Hook Error: {type(err).__name__}: {err}', SHOW_ERRORS)
+    return None
+
+
+### Start a stage, calling any BEFORE_STAGE hooks and starting its timer.
+###     (stage) TIME_LIST, TIME_EXTRACT, TIME_DECODE, TIME_RESIZE, TIME_ROTATE, TIME_COMBINE, or TIME_SAVE.
+###     (cbr_file_path) A Path to a CBR file.
+###     (page_index) Index of the page or None if the stage is for the whole CBR file.
+###     --> Returns a [Tuple] timer
+def startStage(stage, cbr_file_path, page_index = None):
+    if stage_hooks:
+        runStageHooks(BEFORE_STAGE, stage, cbr_file_path, page_index, None)
+    return StartTimer()
+
+
+### Finish a stage, recording the time it took and calling any AFTER_STAGE hooks.
+###     (page_table) The PageTable of the CBR file.
+###     (stage) TIME_LIST, TIME_EXTRACT, TIME_DECODE, TIME_RESIZE, TIME_ROTATE, TIME_COMBINE, or TIME_SAVE.
+###     (timer) Timer returned by startStage.
+###     (cbr_file_path) A Path to a CBR file.
+###     (page_index) Index of the page or None if the stage is for the whole CBR file.
+###     --> Returns a [Tuple] (wall_seconds, cpu_seconds)
+def stopStage(page_table, stage, timer, cbr_file_path, page_index = None):
+    timing = StopTimer(timer)
+    page_table.addTime(stage, timing, page_index)
+    if stage_hooks:
+        runStageHooks(AFTER_STAGE, stage, cbr_file_path, page_index, timing)
+    return timing
+
+
+### A stage hook that profiles stages with cProfile, only while they run. Meant for one run at a time.
+###     Example: profiler = registerStageHook(ProfilerHook()) ... profiler.saveStats(file_path)
+class ProfilerHook:
+    
+    def __init__(self):
+        self.profile = cProfile.Profile()
+        self.depth = 0
+    
+    def __call__(self, event, stage, cbr_file_path, page_index, timing):
+        if event == BEFORE_STAGE:
+            if self.depth == 0:
+                self.profile.enable()
+            self.depth += 1
+        elif self.depth:
+            self.depth -= 1
+            if self.depth == 0:
+                self.profile.disable()
+    
+    ### Save the profile stats as text, sorted by cumulative time.
+    ###     (file_path) Path of the text file to save.
+    ###     (limit) Number of functions to include.
+    ###     --> Returns a [Path]
+    def saveStats(self, file_path, limit = 50):
+        with open(file_path, 'w', encoding='utf-8') as stats_file:
+            pstats.Stats(self.profile, stream=stats_file).sort_stats('cumulative').print_stats(limit)
+        return Path(file_path)
+
+
+### A stage hook that tracks the memory allocated in each stage with tracemalloc. The peak memory used above
+### what was in use when a stage started is recorded for each stage, along with the page that used the most.
+### Note: Only memory allocated by Python is traced, Pillow allocates image data itself. Meant for one run at a time.
+###     Example: allocations = registerStageHook(AllocationHook()) ... allocations.saveStats(file_path)
+class AllocationHook:
+    
+    def __init__(self, frames = 1):
+        self.frames = frames
+        self.started_at = 0
+        self.stage_peaks = {} # {stage : (peak_bytes, cbr_file_path, page_index)}
+    
+    def __call__(self, event, stage, cbr_file_path, page_index, timing):
+        if event == BEFORE_STAGE:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(self.frames)
+            tracemalloc.reset_peak()
+            self.started_at = tracemalloc.get_traced_memory()[0]
+        else:
+            peak = tracemalloc.get_traced_memory()[1] - self.started_at
+            if peak > self.stage_peaks.get(stage, (0,))[0]:
+                self.stage_peaks[stage] = (peak, str(cbr_file_path), page_index)
+    
+    ### Save the peak memory of each stage and the code that allocated the most memory still in use.
+    ###     (file_path) Path of the text file to save.
+    ###     (limit) Number of allocating lines of code to include.
+    ###     --> Returns a [Path]
+    def saveStats(self, file_path, limit = 25):
+        text_lines = ['Peak Memory Allocated In Each Stage:']
+        for stage, (peak, cbr_file_path, page_index) in self.stage_peaks.items():
+            page = f'Page {page_index+1} of ' if page_index is not None else ''
+            text_lines.append(f'  {TIMED_STAGES[stage] + ":":<17} {getSizeString(peak):>10}  ({page}{cbr_file_path})')
+        if tracemalloc.is_tracing():
+            text_lines.append(f'\nTop {limit} Allocations Still In Use:')
+            for statistic in tracemalloc.take_snapshot().statistics('lineno')[:limit]:
+                text_lines.append(f'  {statistic}')
+        Path(file_path).write_text('\n'.join(text_lines), encoding='utf-8')
+        return Path(file_path)
+
+
+### A JSON lines log of everything done in a run, one record (JSON object) per line. Each record is written
+### and flushed as soon as it's made, so everything done so far is kept even if this script stops mid-run.
+### Records: "run" (start of a run), "archive" (CBR file prepared), "page" (page finished), "archive_done"
+### (CBR file finished) and "end" (end of a run). Without a path the records are only kept in memory (records).
+###     (run_log_path) Path of the JSON lines log file or None.
+###     (append) Add to the end of the log file instead of starting a new one (resuming a run).
+class RunLog:
+    __slots__ = ('path', 'file', 'records')
+    
+    def __init__(self, run_log_path = None, append = False):
+        self.path = Path(run_log_path) if run_log_path else None
+        self.file = open(self.path, 'a' if append else 'w', encoding='utf-8') if self.path else None
+        self.records = []
+    
+    ### Write a record to the log and flush it to disk.
+    ###     (record) A Dictionary.
+    ###     --> Returns a [None]
+    def write(self, record):
+        if not self.file:
+            self.records.append(record)
+            return None
+        self.file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.file.flush()
+        return None
+    
+    ### Close the log file.
+    ###     --> Returns a [None]
+    def close(self):
+        if self.file and not self.file.closed:
+            self.file.close()
+        return None
+
+
+### Checkpoints of a run, so a run that stops early can be resumed (see save_checkpoints). The checkpoint file is only
+### ever added to: it starts with the version of this script and the preset used, then has one record for each CBR
+### file done (it's page table, planned save paths and the run counters it added to, along with where the run log
+### was at). Records are pickled, compressed, prefixed with their size and written to disk (fsync) one at a time, so
+### saving one costs the same no matter how many came before. A record cut short (stopped while saving it) is dropped.
+### Note: A checkpoint file is local state of this script, only resume from checkpoints made by it. Records are
+###       unpickled with CheckpointUnpickler so only the few classes a record is made of can be loaded from one.
+###     (checkpoint_path) Path of the checkpoint file.
+class Checkpoint:
+    __slots__ = ('path', 'file', 'counts_before')
+    VERSION = 1
+    
+    def __init__(self, checkpoint_path):
+        self.path = Path(checkpoint_path)
+        self.file = None
+        self.counts_before = None
+    
+    ### Get what a checkpoint is made for: the version of this script, the preset's description and a hash of all
+    ### the preset's options. A run can only be resumed with the same.
+    ###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
+    ###     --> Returns a [Dictionary]
+    def getHeader(self, all_the_data):
+        options = sorted((key, value) for key, value in all_the_data.items() if key not in (LOG_DATA, IMAGE_DATA))
+        return {
+            'version' : self.VERSION,
+            'description' : all_the_data.get(DESCRIPTION, ''),
+            'preset' : hashlib.sha256(repr(options).encode('utf-8')).hexdigest()
+        }
+    
+    ### Write one record to the end of the checkpoint file and to disk.
+    ###     (record) A Dictionary.
+    ###     --> Returns a [None]
+    def writeRecord(self, record):
+        data = zlib.compress(pickle.dumps(record, pickle.HIGHEST_PROTOCOL))
+        self.file.write(struct.pack('>I', len(data)) + data)
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        return None
+    
+    ### Read every whole record in the checkpoint file.
+    ###     --> Returns a [Tuple] (List of records, size of the file up to the end of the last whole record)
+    ###     Raises a [pickle.UnpicklingError] if a record holds anything a checkpoint isn't made of.
+    def readRecords(self):
+        records = []
+        end = 0
+        with open(self.path, 'rb') as checkpoint_file:
+            while True:
+                header = checkpoint_file.read(4)
+                if len(header) < 4:
+                    break
+                data = checkpoint_file.read(struct.unpack('>I', header)[0])
+                try:
+                    data = zlib.decompress(data)
+                except zlib.error: # Cut short
+                    break
+                records.append(CheckpointUnpickler(io.BytesIO(data)).load())
+                end = checkpoint_file.tell()
+        return records, end
+    
+    ### Start keeping track of what a CBR file adds to the run counters (call before it's extracted).
+    ###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
+    ###     --> Returns a [None]
+    def startArchive(self, all_the_data):
+        counters = all_the_data[LOG_DATA][RUN_COUNTERS]
+        self.counts_before = [getattr(counters, name) for name in RunCounters.__slots__]
+        return None
+    
+    ### Add a CBR file that's done to the checkpoint, starting a new checkpoint file first if there isn't one open.
+    ###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
+    ###     (cbr_file_path) A Path to a CBR file.
+    ###     --> Returns a [None]
+    def save(self, all_the_data, cbr_file_path):
+        log_data = all_the_data[LOG_DATA]
+        page_table = log_data[PAGE_DATA][cbr_file_path]
+        if not self.file:
+            self.file = open(self.path, 'wb')
+            self.writeRecord(self.getHeader(all_the_data))
+        
+        # Counted when the CBR file was prepared, before it was started.
+        counters = log_data[RUN_COUNTERS]
+        counts = {name : getattr(counters, name) - count_before for name, count_before in zip(RunCounters.__slots__, self.counts_before)}
+        counts['archives_found'] = 1
+        counts['pages_to_extract'] = len(page_table.page_indexes)
+        
+        planned_save_paths = log_data[PLANNED_SAVE_PATHS]
+        run_log = log_data.get(RUN_LOG)
+        self.writeRecord({
+            'cbr_file_path' : cbr_file_path,
+            'page_table' : page_table,
+            'planned_save_paths' : {path : planned_save_paths[path] for path in page_table.planned_paths if path in planned_save_paths},
+            'counts' : counts,
+            'run_log' : (run_log.path, run_log.file.tell()) if run_log and run_log.file else None
+        })
+        printMessage(f'Checkpoint Saved: {cbr_file_path}', SHOW_EVERYTHING)
+        return None
+    
+    ### Resume a run from the checkpoint. CBR files already done are added back as done (and skipped by
+    ### extractEditSavePages) and the run log is cut back to where it was at and added to from there. New CBR files
+    ### done are added to the same checkpoint file.
+    ###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
+    ###     --> Returns a [Dictionary]
+    ###     Raises a [ValueError] if the checkpoint was made by another version of this script or with another preset.
+    def load(self, all_the_data):
+        try:
+            records, end = self.readRecords()
+        except FileNotFoundError:
+            printMessage(f'No Checkpoint To Resume From: {self.path}', SHOW_ERRORS)
+            return all_the_data
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as err:
+            raise ValueError(f'Failed To Load Checkpoint: {self.path} - {err}')
+        if not records:
+            printMessage(f'No Checkpoint To Resume From (empty): {self.path}', SHOW_ERRORS)
+            return all_the_data
+        
+        header = self.getHeader(all_the_data)
+        if records[0].get('version') != header['version']:
+            raise ValueError(f'The checkpoint was made by another version of this script: {self.path}')
+        if records[0].get('description') != header['description'] or records[0].get('preset') != header['preset']:
+            raise ValueError(f'The checkpoint was made with a different preset ("{records[0].get("description")}"): {self.path}')
+        
+        log_data = all_the_data[LOG_DATA]
+        counters = log_data[RUN_COUNTERS]
+        archives_done = 0
+        for record in records[1:]:
+            cbr_file_path, page_table = record['cbr_file_path'], record['page_table']
+            if cbr_file_path in log_data[PAGE_DATA] or not page_table.isComplete():
+                continue
+            log_data[CBR_FILE_PATHS][cbr_file_path] = None
+            log_data[PAGE_DATA][cbr_file_path] = page_table
+            log_data[ARCHIVE_FINGERPRINTS].setdefault(page_table.fingerprint, cbr_file_path)
+            for path, planned_by in record['planned_save_paths'].items():
+                log_data[PLANNED_SAVE_PATHS].setdefault(path, planned_by)
+            for name, count in record['counts'].items():
+                setattr(counters, name, getattr(counters, name) + count)
+            archives_done += 1
+        
+        # Drop a record cut short and keep adding to the end.
+        self.file = open(self.path, 'r+b')
+        self.file.truncate(end)
+        self.file.seek(end)
+        
+        run_logs = [record['run_log'] for record in records[1:] if record['run_log']]
+        if run_logs and create_log_file:
+            run_log_path, run_log_size = run_logs[-1]
+            if run_log_path.exists() and run_log_path.stat().st_size >= run_log_size:
+                with open(run_log_path, 'r+b') as run_log_file:
+                    run_log_file.truncate(run_log_size)
+                openRunLog(all_the_data, run_log_path, append=True)
+        
+        printMessage(f'Resuming From Checkpoint: {archives_done} CBR files already done', SHOW_PROGRESS)
+        return all_the_data
+    
+    ### Close and delete the checkpoint (the run ended normally).
+    ###     --> Returns a [None]
+    def remove(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+        self.path.unlink(missing_ok=True)
+        return None
+
+
+### Unpickles checkpoint records (see Checkpoint), refusing any class a record isn't made of.
+class CheckpointUnpickler(pickle.Unpickler):
+    CLASSES = {
+        ('array', 'array'), ('array', '_array_reconstructor'), ('builtins', 'bytearray'), ('builtins', 'set'), ('builtins', 'frozenset'),
+        ('pathlib', 'Path'), ('pathlib', 'PosixPath'), ('pathlib', 'WindowsPath'), ('pathlib', 'PurePosixPath'), ('pathlib', 'PureWindowsPath'),
+        (__name__, 'PageTable'), (__name__, 'PageSelection')
+    }
+    
+    def find_class(self, module, name):
+        if (module, name) not in self.CLASSES:
+            raise pickle.UnpicklingError(f'Not part of a checkpoint: {module}.{name}')
+        return super().find_class(module, name)
+
+
+### Leases on CBR files shared with other workers (computers or processes) through a directory they can all reach.
+### A CBR file is claimed by creating it's lease file, which only one worker can do (O_EXCL), and once processed the
+### lease is replaced with a done file. While any leases are held a heartbeat thread renews them (touches the files)
+### every third of the expiry time. A lease not renewed in time is renamed out of the way (also only one worker can)
+### by the next worker to find it, then claimed like any other. CBR files claimed by other workers are checked on
+### until done or their leases expire, so none are left undone if a worker stops.
+###     (lease_dir) Path of the shared directory, created if it doesn't exist.
+###     (expiry) Seconds a lease lasts without being renewed.
+class WorkLeases:
+    __slots__ = ('lease_dir', 'expiry', 'poll_interval', 'worker', 'held', 'lock', 'stop_event', 'heartbeat')
+    
+    def __init__(self, lease_dir, expiry = 300.0):
+        self.lease_dir = Path(lease_dir)
+        self.lease_dir.mkdir(parents=True, exist_ok=True)
+        self.expiry = expiry
+        self.poll_interval = min(expiry / 3, LEASE_POLL_INTERVAL) # Seconds between checks on CBR files claimed by others.
+        self.worker = f'{socket.gethostname()}-{os.getpid()}'
+        self.held = {}  # {CBR File Path : lease Path}
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.heartbeat = None
+    
+    ### Get the path of a CBR file's lease file, the done file is the same with ".done" instead of ".lease".
+    ###     (cbr_file_path) A Path to a CBR file.
+    ###     --> Returns a [Path]
+    def getLeasePath(self, cbr_file_path):
+        path_hash = hashlib.sha1(str(Path(cbr_file_path).absolute()).encode('utf-8')).hexdigest()[:16]
+        return Path(PurePath().joinpath(self.lease_dir, f'{Path(cbr_file_path).stem[:64]}.{path_hash}.lease'))
+    
+    ### Check if a CBR file has been done (by any worker).
+    ###     (cbr_file_path) A Path to a CBR file.
+    ###     --> Returns a [Boolean]
+    def isDone(self, cbr_file_path):
+        return self.getLeasePath(cbr_file_path).with_suffix('.done').exists()
+    
+    ### Claim a CBR file, unless another worker has it or it's done already.
+    ###     (cbr_file_path) A Path to a CBR file.
+    ###     --> Returns a [Boolean] True if claimed
+    def claim(self, cbr_file_path):
+        lease_path = self.getLeasePath(cbr_file_path)
+        done_path = lease_path.with_suffix('.done')
+        
+        for _ in range(2): # Once more after taking over an expired lease.
+            if done_path.exists():
+                return False
+            try:
+                lease_file = os.open(lease_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+            except FileExistsError:
+                if self.takeOver(lease_path):
+                    continue
+                return False
+            with os.fdopen(lease_file, 'w', encoding='utf-8') as lease_file:
+                json.dump({'worker' : self.worker, 'cbr' : str(cbr_file_path), 'claimed' : CurrentTime()}, lease_file)
+            
+            # Done by another worker between checking and claiming.
+            if done_path.exists():
+                lease_path.unlink(missing_ok=True)
+                return False
+            
+            with self.lock:
+                self.held[cbr_file_path] = lease_path
+            if not self.heartbeat:
+                self.heartbeat = threading.Thread(target=self.keepRenewing, name='WorkLeases', daemon=True)
+                self.heartbeat.start()
+            return True
+        
+        return False
+    
+    ### Take over a lease if it has expired, by renaming it out of the way so it can be claimed again. Another worker
+    ### can take over the same lease and claim it between checking and renaming it, so the lease renamed is checked
+    ### to be the one that expired (same file, not renewed since) and put back if it's not.
+    ###     (lease_path) Path of a lease file.
+    ###     --> Returns a [Boolean] True if the lease can be claimed now
+    def takeOver(self, lease_path):
+        try:
+            lease_stat = lease_path.stat()
+        except FileNotFoundError:
+            return True
+        lease_age = CurrentTime() - lease_stat.st_mtime
+        if lease_age < self.expiry:
+            return False
+        
+        expired_path = lease_path.with_name(f'{lease_path.name}.{self.worker}.expired')
+        try:
+            os.rename(lease_path, expired_path)
+            expired_stat = expired_path.stat()
+        except FileNotFoundError:
+            return True # Taken over (or finished) by another worker first.
+        
+        if (expired_stat.st_ino, expired_stat.st_mtime_ns) != (lease_stat.st_ino, lease_stat.st_mtime_ns):
+            # A new lease (or one just renewed), put it back.
+            try:
+                os.link(expired_path, lease_path)
+            except OSError as err:
+                printMessage(f'Failed To Put Back Lease: {lease_path.name} - {err}', SHOW_ERRORS)
+            expired_path.unlink(missing_ok=True)
+            return False
+        
+        printMessage(f'Taking over expired lease ({lease_age:.0f} seconds old): {lease_path.name}', SHOW_PROGRESS)
+        expired_path.unlink(missing_ok=True)
+        return True
+    
+    ### A claimed CBR file is done, replace it's lease with a done file so no worker processes it again.
+    ###     (cbr_file_path) A Path to a CBR file.
+    ###     --> Returns a [None]
+    def finish(self, cbr_file_path):
+        with self.lock:
+            lease_path = self.held.pop(cbr_file_path, None)
+        if lease_path:
+            lease_path.with_suffix('.done').write_text(json.dumps({'worker' : self.worker, 'cbr' : str(cbr_file_path), 'done' : CurrentTime()}), encoding='utf-8')
+            lease_path.unlink(missing_ok=True)
+        return None
+    
+    ### Give up a claimed CBR file so another worker can claim it.
+    ###     (cbr_file_path) A Path to a CBR file.
+    ###     --> Returns a [None]
+    def release(self, cbr_file_path):
+        with self.lock:
+            lease_path = self.held.pop(cbr_file_path, None)
+        if lease_path:
+            lease_path.unlink(missing_ok=True)
+        return None
+    
+    ### Renew every lease held, until closed (runs on the heartbeat thread).
+    ###     --> Returns a [None]
+    def keepRenewing(self):
+        while not self.stop_event.wait(self.expiry / 3):
+            with self.lock:
+                lease_paths = list(self.held.values())
+            for lease_path in lease_paths:
+                try:
+                    os.utime(lease_path)
+                except OSError as err:
+                    printMessage(f'Failed To Renew Lease: {err}', SHOW_ERRORS)
+        return None
+    
+    ### Stop renewing and release any leases still held.
+    ###     --> Returns a [None]
+    def close(self):
+        self.stop_event.set()
+        for cbr_file_path in list(self.held):
+            self.release(cbr_file_path)
+        return None
+
+
+### A PDF file written one page at a time, each page being a single image (1 pixel = 1 point). Every object is
+### written as soon as it's made, only where each object starts is kept in memory, so any number of pages can be
+### added while only ever holding one page. The page tree, cross-reference table and trailer are written on close.
+###     (pdf_file_path) Path of the PDF file to create or overwrite.
+class PDFWriter:
+    __slots__ = ('file', 'offsets', 'page_numbers')
+    
+    def __init__(self, pdf_file_path):
+        self.file = open(pdf_file_path, 'wb')
+        self.offsets = [0, 0, 0] # Object 1 is the catalog and 2 the page tree, both written last.
+        self.page_numbers = []
+        self.file.write(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+    
+    ### Write an object, and a stream if it has one.
+    ###     (dictionary) The object (or stream dictionary) as a String.
+    ###     (stream) Bytes of the stream or None.
+    ###     (object_number) Number of the object, the next number if None.
+    ###     --> Returns a [Int] object number
+    def writeObject(self, dictionary, stream = None, object_number = None):
+        if object_number is None:
+            object_number = len(self.offsets)
+            self.offsets.append(0)
+        self.offsets[object_number] = self.file.tell()
+        self.file.write(f'{object_number} 0 obj\n{dictionary}\n'.encode('latin-1'))
+        if stream is not None:
+            self.file.write(b'stream\n')
+            self.file.write(stream)
+            self.file.write(b'\nendstream\n')
+        self.file.write(b'endobj\n')
+        return object_number
+    
+    ### Add a page showing an image already encoded.
+    ###     (size) A Tuple (width, height) of the image.
+    ###     (image_stream) Bytes of the encoded image.
+    ###     (color_space) 'DeviceGray' or 'DeviceRGB'.
+    ###     (stream_filter) How the image is encoded, 'DCTDecode' (JPEG) or 'FlateDecode' (zlib).
+    ###     --> Returns a [None]
+    def addImagePage(self, size, image_stream, color_space, stream_filter):
+        width, height = size
+        image_number = self.writeObject(
+            f'<< /Type /XObject /Subtype /Image /Width {width} /Height {height} /ColorSpace /{color_space} '
+            f'/BitsPerComponent 8 /Filter /{stream_filter} /Length {len(image_stream)} >>', image_stream)
+        contents = f'q {width} 0 0 {height} 0 0 cm /Im0 Do Q'.encode('latin-1')
+        contents_number = self.writeObject(f'<< /Length {len(contents)} >>', contents)
+        self.page_numbers.append(self.writeObject(
+            f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {width} {height}] '
+            f'/Resources << /XObject << /Im0 {image_number} 0 R >> >> /Contents {contents_number} 0 R >>'))
+        return None
+    
+    ### Finish and close the PDF file.
+    ###     --> Returns a [Int] size of the PDF file in bytes
+    def close(self):
+        kids = ' '.join(f'{page_number} 0 R' for page_number in self.page_numbers)
+        self.writeObject(f'<< /Type /Pages /Kids [{kids}] /Count {len(self.page_numbers)} >>', object_number=2)
+        self.writeObject(f'<< /Type /Catalog /Pages 2 0 R >>', object_number=1)
+        
+        xref_offset = self.file.tell()
+        self.file.write(f'xref\n0 {len(self.offsets)}\n0000000000 65535 f \n'.encode('latin-1'))
+        self.file.write(''.join(f'{offset:010d} 00000 n \n' for offset in self.offsets[1:]).encode('latin-1'))
+        self.file.write(f'trailer\n<< /Size {len(self.offsets)} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n'.encode('latin-1'))
+        file_size = self.file.tell()
+        self.file.close()
+        return file_size
+
 
 ### Change the preset in use, retaining any log data.
 ###     (preset) A preset that holds the user options on how to extract, edit, and save images/pages from a CBR file.
@@ -340,10 +1381,18 @@ def changePreset(preset, all_the_data = {}):
     if not log_data:
         all_the_data = preset
         all_the_data[LOG_DATA] = {}
-        all_the_data[LOG_DATA][CBR_FILE_PATHS] = []
+        all_the_data[LOG_DATA][CBR_FILE_PATHS] = {}
         all_the_data[LOG_DATA][IMAGE_EXTENSIONS] = []
         all_the_data[LOG_DATA][PAGE_DATA] = {}
         all_the_data[LOG_DATA][TEMP_DIR] = None
+        all_the_data[LOG_DATA][SAVE_DIR_LISTINGS] = {}
+        all_the_data[LOG_DATA][PLANNED_SAVE_PATHS] = {}
+        all_the_data[LOG_DATA][RUN_LOG] = None
+        all_the_data[LOG_DATA][RUN_COUNTERS] = RunCounters()
+        all_the_data[LOG_DATA][ARCHIVES_IN_MEMORY] = {}
+        all_the_data[LOG_DATA][WORK_LEASES] = None
+        all_the_data[LOG_DATA][CHECKPOINT] = None
+        all_the_data[LOG_DATA][ARCHIVE_FINGERPRINTS] = {}
         
         for image_formats in SUPPORTED_IMAGE_FORMATS:
             for i in range(0, len(image_formats)):
@@ -370,7 +1419,7 @@ def findCBRFiles(path, all_the_data):
     for path in paths:
         
         if not Path(path).exists():
-            print(f'Does Not Exist: {path}')
+            printMessage(f'Does Not Exist: {path}', SHOW_ERRORS)
             continue
         
         if Path(path).is_file():
@@ -378,7 +1427,7 @@ def findCBRFiles(path, all_the_data):
             file_path = Path(path)
             
             if file_path.suffix == '.cbr':
-                print(f'CBR File Found: {file_path}')
+                printMessage(f'CBR File Found: {file_path}', SHOW_PROGRESS)
                 all_the_data = preparePageData(file_path, all_the_data)
         
         elif Path(path).is_dir():
@@ -389,7 +1438,7 @@ def findCBRFiles(path, all_the_data):
                     file_path = Path(PurePath().joinpath(root, file))
                     
                     if file_path.suffix == '.cbr':
-                        print(f'CBR File Found: {file_path}')
+                        printMessage(f'CBR File Found: {file_path}', SHOW_PROGRESS)
                         all_the_data = preparePageData(file_path, all_the_data)
                 
                 if not search_sub_dirs:
@@ -403,67 +1452,160 @@ def findCBRFiles(path, all_the_data):
 ###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
 ###     --> Returns a [Dictionary]
 def preparePageData(cbr_file_path, all_the_data):
-    cbrar = rarfile.RarFile(cbr_file_path)
-    #print(cbrar.namelist())
-    #print(cbrar.RarExtFile)
-    
     if cbr_file_path not in all_the_data[LOG_DATA][CBR_FILE_PATHS]:
-        all_the_data[LOG_DATA][CBR_FILE_PATHS].append(cbr_file_path)
+        all_the_data[LOG_DATA][CBR_FILE_PATHS][cbr_file_path] = None
+    elif all_the_data[LOG_DATA][CHECKPOINT] and all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path].processed:
+        printMessage(f'Already Done (resumed): {cbr_file_path}', SHOW_EVERYTHING)
+        return all_the_data
     else:
-        print('This CBR file has already been added.')
+        printMessage('This CBR file has already been added.', SHOW_ERRORS)
         return all_the_data
     
-    all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path] = {
-        PAGE_META_DATA : [],
-        PAGE_INDEXES : [],
-        PAGE_EDITS_MADE : {
-            CHANGE_HEIGHT : {},
-            CHANGE_WIDTH : {},
-            ROTATE_PAGES : {},
-            COMBINE_PAGES : {}
-        },
-        PAGE_EXTRACT_ERRORS : {},
-        PAGE_EDIT_ERRORS : {},
-        PAGE_SAVE_PATHS : {},
-        PAGE_SAVE_DETAILS : {}
-    }
+    timer = startStage(TIME_LIST, cbr_file_path)
+    cbrar = openArchive(all_the_data, cbr_file_path)
+    #print(cbrar.namelist())
+    #print(cbrar.RarExtFile)
+    
+    # Get meta data of archived files, and of files in archives nested in it.
+    page_paths = listArchivedPages(all_the_data, cbrar)
+    
+    page_table = PageTable(['/'.join(page_path) for page_path in page_paths])
+    page_table.nested_pages = {page_index : page_path for page_index, page_path in enumerate(page_paths) if len(page_path) > 1}
+    page_table.fingerprint = getArchiveFingerprint(all_the_data, cbr_file_path, cbrar.infolist())
+    stopStage(page_table, TIME_LIST, timer, cbr_file_path)
+    all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path] = page_table
+    
+    # Copies of a CBR file already found have the same fingerprint.
+    first_copy = all_the_data[LOG_DATA][ARCHIVE_FINGERPRINTS].setdefault(page_table.fingerprint, cbr_file_path)
+    if first_copy != cbr_file_path:
+        page_table.duplicate_of = first_copy
+        printMessage(f'Duplicate CBR File: "{cbr_file_path}" is a copy of "{first_copy}"', SHOW_PROGRESS)
+    
+    all_the_data = convertPageNumbersToIndexes(all_the_data, cbr_file_path)
+    
+    writeRunLog(all_the_data, {
+        'record' : 'archive',
+        'cbr' : str(cbr_file_path),
+        'total_pages' : len(page_table.page_names),
+        'pages_to_extract' : repr(page_table.page_indexes)
+    })
     
-    # Get meta data of archived files.
-    for rar_archived_file in cbrar.infolist():
+    return all_the_data
+
+
+### Get the pages/images archived in a CBR file (or an archive nested in it) in sorted order. Archives nested in it,
+### like one ZIP or RAR file per chapter, are read into memory (not extracted to a temporary directory) and their pages
+### are merged in where the archive's file name sorts, each archive's pages sorted on their own.
+###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
+###     (archive) An opened RarFile (or ZipFile if nested).
+###     (depth) How many archives deep this archive is nested.
+###     --> Returns a [List] of Tuples (file name of each archive nested in, ..., file name of the page)
+def listArchivedPages(all_the_data, archive, depth = 0):
+    image_extensions = all_the_data[LOG_DATA][IMAGE_EXTENSIONS]
+    
+    archived_files = []
+    for rar_archived_file in archive.infolist():
         #print(rar_archived_file.filename, rar_archived_file.file_size, rar_archived_file.compress_size, rar_archived_file.compress_type,
         #      rar_archived_file.date_time, rar_archived_file.CRC, rar_archived_file.host_os, rar_archived_file.mode, rar_archived_file.mtime,
         #      rar_archived_file.ctime, rar_archived_file.atime, rar_archived_file.file_redir)
-        if rar_archived_file.is_file():
-            file_path = Path(rar_archived_file.filename)
+        if not rar_archived_file.is_dir():
+            file_path = PurePath(rar_archived_file.filename)
             
-            # Images files only and ignore MacOSX resource fork files.
-            if file_path.suffix in all_the_data[LOG_DATA][IMAGE_EXTENSIONS] and file_path.stem[:1] != '.':
-                all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_META_DATA].append(
-                    (
-                        file_path,
-                        rar_archived_file.filename,
-                        #rar_archived_file.file_size,
-                        #rar_archived_file.compress_size,
-                        #rar_archived_file.compress_type,
-                        #rar_archived_file.date_time,
-                        #rar_archived_file.CRC,
-                        #rar_archived_file.host_os
-                    )
-                )
-        #if rar_archived_file.is_dir():
+            # Images files and nested archives only and ignore MacOSX resource fork files.
+            if file_path.stem[:1] == '.':
+                continue
+            if file_path.suffix in image_extensions:
+                archived_files.append((rar_archived_file.filename, False))
+            elif file_path.suffix.lower() in NESTED_ARCHIVE_EXTENSIONS and depth < MAX_NESTED_ARCHIVES:
+                archived_files.append((rar_archived_file.filename, True))
     
-    # Sort page/image files.
+    # Sort page/image files (and nested archives) by file name.
     sort_method, sort_order = all_the_data.get(SORT_PAGES_BY, (ALPHA,ASCENDING))
-    alpha_number = True if sort_method == ALPHA_NUMBER else False
-    numbers_only = True if sort_method == NUMBERS_ONLY else False
-    all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_META_DATA].sort(
+    sort_key = GetSortKeyFunction(sort_method, file_name_only=True)
+    archived_files.sort(
         reverse = True if sort_order else False,
-        key = lambda page: SortFiles(page, META_FILE_PATH, alpha_number, numbers_only)
+        key = lambda archived_file: sort_key(archived_file[0])
     )
     
-    all_the_data = convertPageNumbersToIndexes(all_the_data, cbr_file_path)
+    page_paths = []
+    for file_name, is_archive in archived_files:
+        if not is_archive:
+            page_paths.append((file_name,))
+            continue
+        try:
+            with openNestedArchive(archive.read(file_name)) as nested_archive:
+                page_paths.extend((file_name, *page_path) for page_path in listArchivedPages(all_the_data, nested_archive, depth + 1))
+        except (rarfile.Error, zipfile.BadZipFile, OSError, ValueError) as err:
+            printMessage(f'Failed To Open Nested Archive: {file_name} - {err}', SHOW_ERRORS)
     
-    return all_the_data
+    return page_paths
+
+
+### Open an archive nested in a CBR file from it's bytes, a ZIP or RAR file depending on how it starts.
+###     (archive_bytes) Bytes of the archive.
+###     --> Returns a [ZipFile] or [RarFile]
+def openNestedArchive(archive_bytes):
+    if archive_bytes[:4] == b'PK\x03\x04':
+        return zipfile.ZipFile(io.BytesIO(archive_bytes))
+    return rarfile.RarFile(io.BytesIO(archive_bytes))
+
+
+### Read a page from an opened CBR file, opening any archives the page is nested in. The nested archives opened are
+### kept open for the next page (pages of a nested archive are sorted together), and closed once a page isn't in them.
+###     (cbrar_file) The opened RarFile of the CBR file.
+###     (page_table) The PageTable of the CBR file.
+###     (page_index) Index of the page.
+###     (nested_archives) A Dictionary {Tuple of nested archive file names : opened archive} of the archives kept open.
+###     --> Returns [Bytes]
+def readArchivedPage(cbrar_file, page_table, page_index, nested_archives):
+    page_path = page_table.nested_pages.get(page_index)
+    if not page_path:
+        return cbrar_file.read(page_table.page_names[page_index])
+    
+    archive_path = page_path[:-1]
+    if archive_path not in nested_archives:
+        # Keep open the archives this page is nested in, close the rest.
+        for opened_path in [opened_path for opened_path in nested_archives if archive_path[:len(opened_path)] != opened_path]:
+            nested_archives.pop(opened_path).close()
+        archive = cbrar_file
+        for depth in range(len(archive_path)):
+            if archive_path[:depth+1] not in nested_archives:
+                nested_archives[archive_path[:depth+1]] = openNestedArchive(archive.read(archive_path[depth]))
+            archive = nested_archives[archive_path[:depth+1]]
+    
+    return nested_archives[archive_path].read(page_path[-1])
+
+
+### Close all nested archives kept open (see readArchivedPage).
+###     (nested_archives) A Dictionary {Tuple of nested archive file names : opened archive}.
+###     --> Returns a [None]
+def closeNestedArchives(nested_archives):
+    for archive in nested_archives.values():
+        archive.close()
+    nested_archives.clear()
+    return None
+
+
+### Get a fingerprint of a CBR file that is the same for every copy of it: it's size and a hash of the name, size and
+### CRC of every file archived in it. Only the list of archived files is read, not the files themselves.
+###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
+###     (cbr_file_path) Path to a CBR file.
+###     (archived_files) A List of the RarInfo of every file archived in the CBR file.
+###     --> Returns a [Tuple] (size, hash String)
+def getArchiveFingerprint(all_the_data, cbr_file_path, archived_files):
+    member_table_hash = hashlib.sha1()
+    for rar_archived_file in archived_files:
+        member_table_hash.update(f'{rar_archived_file.filename}\0{rar_archived_file.file_size}\0{rar_archived_file.CRC}\n'.encode('utf-8'))
+    
+    archive = all_the_data[LOG_DATA][ARCHIVES_IN_MEMORY].get(cbr_file_path)
+    if archive is None:
+        archive_size = Path(cbr_file_path).stat().st_size
+    elif type(archive) in (bytes, bytearray, memoryview):
+        archive_size = len(archive)
+    else:
+        archive_size = archive.seek(0, io.SEEK_END)
+    
+    return archive_size, member_table_hash.hexdigest()
 
 
 ### Create page indexes from page numbers in PAGES_TO_EXTRACT.
@@ -471,35 +1613,14 @@ def preparePageData(cbr_file_path, all_the_data):
 ###     (cbr_file_path) Path to a CBR file.
 ###     --> Returns a [Dictionary]
 def convertPageNumbersToIndexes(all_the_data, cbr_file_path):
+    page_table = all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path]
     pages_to_extract = all_the_data.get(PAGES_TO_EXTRACT)
-    total_pages = len(all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_META_DATA])
-    page_indexes = []
-    
-    if pages_to_extract:
-        
-        if type(pages_to_extract) == tuple: # Range of Pages
-            page_indexes = getAllPageIndexesFromRange(total_pages, pages_to_extract[0], pages_to_extract[1])
-        
-        elif type(pages_to_extract) == list: # Specific Pages
-            for page_number in pages_to_extract:
-                if type(page_number) == int and page_number != 0 and page_number <= total_pages and page_number >= -total_pages:
-                    page_index = getPageIndex(total_pages, page_number)
-                    page_indexes.append(page_index)
-                else:
-                    print(f'Specific page #{page_number} is out of bounds and will be disregarded.')
-        
-        elif type(pages_to_extract) == int: # Single Page
-            page_indexes = getAllPageIndexesFromRange(total_pages, None, pages_to_extract)
-        
-        else:
-            print(f'ERROR: "PAGES_TO_EXTRACT : {pages_to_extract}" are not proper page numbers.')
-            return None
-    
-    else: # All Pages
-        page_indexes = getAllPageIndexesFromRange(total_pages)
+    total_pages = len(page_table.page_names)
     
-    all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_INDEXES] = page_indexes
-    print(f'Page Indexes (to extract): {page_indexes}')
+    page_table.page_indexes = compilePageSelection(pages_to_extract, total_pages)
+    all_the_data[LOG_DATA][RUN_COUNTERS].archives_found += 1
+    all_the_data[LOG_DATA][RUN_COUNTERS].pages_to_extract += len(page_table.page_indexes)
+    printMessage(f'Page Indexes (to extract): {page_table.page_indexes}', SHOW_EVERYTHING)
     
     return all_the_data
 
@@ -508,125 +1629,672 @@ def convertPageNumbersToIndexes(all_the_data, cbr_file_path):
 ###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
 ###     --> Returns a [Dictionary]
 def extractEditSavePages(all_the_data):
-    cbr_file_paths = all_the_data[LOG_DATA][CBR_FILE_PATHS]
+    page_data = all_the_data[LOG_DATA][PAGE_DATA]
     
+    # Skip CBR files already done in a previous loop.
+    cbr_file_paths = [cbr_file_path for cbr_file_path in all_the_data[LOG_DATA][CBR_FILE_PATHS] if not page_data[cbr_file_path].processed]
+    
+    progress.start(all_the_data[LOG_DATA][RUN_COUNTERS])
+    
+    # Plan where every page will be saved before any extracting starts.
     for cbr_file_path in cbr_file_paths:
-        # Extract
-        all_the_data = extractPages(all_the_data, cbr_file_path)
-        # Edit
-        all_the_data = modifyPages(all_the_data, cbr_file_path)
-        # Save
-        all_the_data = savePages(all_the_data, cbr_file_path)
-        
-        # Clean up memory used and no longer needed.
-        all_the_data[IMAGE_DATA].clear()
-        if all_the_data[LOG_DATA].get(TEMP_DIR):
-            all_the_data[LOG_DATA][TEMP_DIR].cleanup()
-            all_the_data[LOG_DATA][TEMP_DIR] = None
+        all_the_data = planSavePaths(all_the_data, cbr_file_path)
+    
+    work_leases = all_the_data[LOG_DATA].get(WORK_LEASES)
+    
+    claimed_by_others = []
+    for cbr_file_path in cbr_file_paths:
+        # CBR files claimed by other workers are left to them, for now.
+        if work_leases and not work_leases.claim(cbr_file_path):
+            printMessage(f'Claimed By Another Worker: {cbr_file_path}', SHOW_EVERYTHING)
+            claimed_by_others.append(cbr_file_path)
+            continue
+        all_the_data = processArchive(all_the_data, cbr_file_path)
+    
+    # Wait for the other workers to finish their CBR files, taking over any they stop working on (lease expired).
+    while claimed_by_others:
+        Wait(work_leases.poll_interval)
+        for cbr_file_path in list(claimed_by_others):
+            if work_leases.isDone(cbr_file_path):
+                claimed_by_others.remove(cbr_file_path)
+                all_the_data = forgetArchive(all_the_data, cbr_file_path)
+            elif work_leases.claim(cbr_file_path):
+                claimed_by_others.remove(cbr_file_path)
+                all_the_data = processArchive(all_the_data, cbr_file_path)
+    
+    progress.finish()
     
     return all_the_data
 
 
-### Extract pages from a CBR file / images from a RAR archive.
+### Extract, edit and save the pages of one CBR file, already claimed if sharing the work (see WorkLeases).
 ###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
 ###     (cbr_file_path) A Path to a CBR file.
 ###     --> Returns a [Dictionary]
-def extractPages(all_the_data, cbr_file_path):
-    page_indexes = all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_INDEXES]
-    cbrar_file = rarfile.RarFile(cbr_file_path)
-    page_meta_data = all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_META_DATA]
+def processArchive(all_the_data, cbr_file_path):
+    work_leases = all_the_data[LOG_DATA].get(WORK_LEASES)
+    checkpoint = all_the_data[LOG_DATA].get(CHECKPOINT)
+    if checkpoint:
+        checkpoint.startArchive(all_the_data)
     
-    if all_the_data.get(IMAGE_DATA):
-        all_the_data[IMAGE_DATA].clear()
-    else:
-        all_the_data[IMAGE_DATA] = {}
+    try:
+        # Copies of a CBR file already done reuse it's saved pages.
+        if canReuseArchive(all_the_data, cbr_file_path):
+            all_the_data = reuseArchive(all_the_data, cbr_file_path)
+        elif all_the_data.get(CHANGE_IMAGE_FORMAT) == PDF:
+            # Extract, edit and save a few pages at a time.
+            all_the_data = savePagesAsPDF(all_the_data, cbr_file_path, extract_pages=True)
+        else:
+            # Extract
+            all_the_data = extractPages(all_the_data, cbr_file_path)
+            # Edit
+            all_the_data = modifyPages(all_the_data, cbr_file_path)
+            # Save
+            all_the_data = savePages(all_the_data, cbr_file_path)
+    except BaseException:
+        if work_leases:
+            work_leases.release(cbr_file_path)
+        raise
+    if work_leases:
+        work_leases.finish(cbr_file_path)
     
-    for page_index in page_indexes:
-        
-        try:
-            if all_the_data[LOG_DATA].get(TEMP_DIR):
-                # All files already extracted, continue on with Extraction Method Two.
-                temp_dir = all_the_data[LOG_DATA][TEMP_DIR]
-                archived_file_path = page_meta_data[page_index][META_FILE_PATH]
-                archived_img = Path(PurePath().joinpath(temp_dir.name, archived_file_path))
-            else:
-                # Extraction Method One
-                archived_img = cbrar_file.open(page_meta_data[page_index][META_FILE_NAME], mode='r', pwd=None)
-                archived_img = cbrar_file.open(page_meta_data[page_index][META_FILE_NAME], mode='r', pwd=None)
-            
-            all_the_data[IMAGE_DATA][page_index] = Image.open(archived_img)
-        
-        except (rarfile.Error, FileNotFoundError, UnidentifiedImageError, ValueError, TypeError) as err:
-            print(err)
-            
-            # Log Errors
-            if all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_EXTRACT_ERRORS].get(page_index):
-                all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_EXTRACT_ERRORS][page_index].append(err)
-            else:
-                all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_EXTRACT_ERRORS][page_index] = [err]
-        
-        if all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_EXTRACT_ERRORS].get(page_index):
-            try:
-                print(f'Failed to extract page {page_index+1} from archive, so extracting all files to a temporary directory...')
-                
-                # Attempt to extract file with another tool. This will extract all files in the CBR file temporarily.
+    # Clean up memory used and no longer needed.
+    all_the_data[IMAGE_DATA].clear()
+    if all_the_data[LOG_DATA].get(TEMP_DIR):
+        all_the_data[LOG_DATA][TEMP_DIR].cleanup()
+        all_the_data[LOG_DATA][TEMP_DIR] = None
+    
+    if checkpoint:
+        checkpoint.save(all_the_data, cbr_file_path)
+    
+    progress.update()
+    
+    return all_the_data
+
+
+### Forget everything about a CBR file so it can be added and processed again (or not at all).
+###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
+###     (cbr_file_path) A Path to a CBR file.
+###     --> Returns a [Dictionary]
+def forgetArchive(all_the_data, cbr_file_path):
+    log_data = all_the_data[LOG_DATA]
+    log_data[CBR_FILE_PATHS].pop(cbr_file_path, None)
+    log_data[ARCHIVES_IN_MEMORY].pop(cbr_file_path, None)
+    page_table = log_data[PAGE_DATA].pop(cbr_file_path, None)
+    if page_table and log_data[ARCHIVE_FINGERPRINTS].get(page_table.fingerprint) == cbr_file_path:
+        del log_data[ARCHIVE_FINGERPRINTS][page_table.fingerprint]
+    if page_table and not page_table.processed:
+        log_data[RUN_COUNTERS].archives_found -= 1
+        log_data[RUN_COUNTERS].pages_to_extract -= len(page_table.page_indexes)
+    if page_table:
+        forgetPlannedSavePaths(all_the_data, cbr_file_path, page_table)
+    return all_the_data
+
+
+### Forget where the pages of a CBR file were planned to be saved, so other CBR files can be planned there again.
+###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
+###     (cbr_file_path) A Path to a CBR file.
+###     (page_table) The PageTable of the CBR file.
+###     --> Returns a [None]
+def forgetPlannedSavePaths(all_the_data, cbr_file_path, page_table):
+    planned_save_paths = all_the_data[LOG_DATA][PLANNED_SAVE_PATHS]
+    for save_file_path in page_table.planned_paths:
+        planned_by = planned_save_paths.get(save_file_path)
+        if planned_by and planned_by[0] == cbr_file_path:
+            del planned_save_paths[save_file_path]
+    page_table.planned_paths = []
+    return None
+
+
+### Let go of CBR files already done, so watching for new CBR files (see watchDirectories) doesn't use more and more
+### memory. The run log and totals are kept. So are the first copies of CBR files that later copies can reuse (see
+### canReuseArchive), without their timings, up to WATCH_REUSABLE_ARCHIVES of the most recently done.
+###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
+###     --> Returns a [Dictionary]
+def evictFinishedArchives(all_the_data):
+    log_data = all_the_data[LOG_DATA]
+    page_data = log_data[PAGE_DATA]
+    fingerprints = log_data[ARCHIVE_FINGERPRINTS]
+    
+    for cbr_file_path in [path for path in log_data[CBR_FILE_PATHS] if path in page_data and page_data[path].processed]:
+        page_table = page_data[cbr_file_path]
+        if reuse_duplicate_archives and fingerprints.get(page_table.fingerprint) == cbr_file_path and page_table.canBeReused():
+            log_data[CBR_FILE_PATHS].pop(cbr_file_path)
+            log_data[ARCHIVES_IN_MEMORY].pop(cbr_file_path, None)
+            forgetPlannedSavePaths(all_the_data, cbr_file_path, page_table)
+            page_table.save_plan = {}
+            page_table.nested_pages = {}
+            page_table.palette = None
+            page_table.archive_times = {}
+            page_table.page_times = {}
+        else:
+            all_the_data = forgetArchive(all_the_data, cbr_file_path)
+    
+    # Only CBR files kept for reuse are left that aren't in CBR_FILE_PATHS, oldest first.
+    reusable_archives = [path for path in page_data if path not in log_data[CBR_FILE_PATHS]]
+    for cbr_file_path in reusable_archives[:max(len(reusable_archives) - WATCH_REUSABLE_ARCHIVES, 0)]:
+        all_the_data = forgetArchive(all_the_data, cbr_file_path)
+    
+    return all_the_data
+
+
+### Check if a CBR file is a copy of another CBR file (see getArchiveFingerprint) already done, that had all it's pages
+### saved without errors. Copies of CBR files with pages sliced (SLICE_TALL_PAGES) are done like any other CBR file.
+###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
+###     (cbr_file_path) A Path to a CBR file.
+###     --> Returns a [Boolean]
+def canReuseArchive(all_the_data, cbr_file_path):
+    page_data = all_the_data[LOG_DATA][PAGE_DATA]
+    first_copy = page_data[cbr_file_path].duplicate_of
+    if not reuse_duplicate_archives or first_copy not in page_data:
+        return False
+    return page_data[first_copy].canBeReused()
+
+
+### Reuse the pages saved from the first copy of a CBR file (see canReuseArchive), instead of extracting, editing and
+### saving the same pages again. Every page file (or the PDF file) saved is hard linked, or copied if it can't be
+### (different drives for example), to where this CBR file's pages are planned to be saved.
+###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
+###     (cbr_file_path) A Path to a CBR file.
+###     --> Returns a [Dictionary]
+def reuseArchive(all_the_data, cbr_file_path):
+    page_data = all_the_data[LOG_DATA][PAGE_DATA]
+    page_table = page_data[cbr_file_path]
+    first_page_table = page_data[page_table.duplicate_of]
+    counters = all_the_data[LOG_DATA][RUN_COUNTERS]
+    
+    printMessage(f'Reusing Pages Saved From: {page_table.duplicate_of}', SHOW_EVERYTHING)
+    
+    # Same files archived and same preset, so the same edits.
+    page_table.resizes = dict(first_page_table.resizes)
+    page_table.org_sizes = dict(first_page_table.org_sizes)
+    page_table.rotations = dict(first_page_table.rotations)
+    page_table.combines = dict(first_page_table.combines)
+    page_table.edit_errors = dict(first_page_table.edit_errors)
+    page_table.save_formats = dict(first_page_table.save_formats)
+    
+    linked_files = {} # {first copy's save file path : (save file path, save detail, error)}
+    for page_index, first_save_file_path in first_page_table.save_paths.items():
+        planned_save = page_table.save_plan.pop(page_index, None)
+        if not planned_save:
+            continue
+        
+        if first_save_file_path not in linked_files:
+            timer = startStage(TIME_SAVE, cbr_file_path, page_index)
+            save_file_path = planned_save[3].with_suffix(Path(first_save_file_path).suffix)
+            linked_files[first_save_file_path] = (save_file_path, *linkPageFile(all_the_data, Path(first_save_file_path), save_file_path))
+            stopStage(page_table, TIME_SAVE, timer, cbr_file_path, page_index)
+        save_file_path, save_detail, error = linked_files[first_save_file_path]
+        
+        if page_index not in page_table.save_paths:
+            counters.pages_saved += 1
+        page_table.save_paths[page_index] = str(save_file_path)
+        page_table.setSaveDetail(page_index, save_detail, error)
+    
+    page_table.save_plan = {}
+    all_the_data[IMAGE_DATA] = {}
+    
+    return finishArchive(all_the_data, cbr_file_path)
+
+
+### Hard link (or copy) a page file saved from one CBR file to where a page of another CBR file is to be saved,
+### unless the file already exists and OVERWRITE_FILES is off.
+###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
+###     (source_file_path) A Path to the page file already saved.
+###     (save_file_path) A Path to save the page file to.
+###     --> Returns a [Tuple] (NOT_SAVED/NEW_SAVE/OVERWRITTEN/SAVE_ERROR, error message or None)
+def linkPageFile(all_the_data, source_file_path, save_file_path):
+    counters = all_the_data[LOG_DATA][RUN_COUNTERS]
+    overwrite_files = all_the_data.get(OVERWRITE_FILES, False)
+    
+    printMessage(f'Linking Page: {save_file_path}', SHOW_EVERYTHING)
+    
+    existing_file_names = getDirectoryListing(all_the_data, save_file_path.parent)
+    file_name = os.path.normcase(save_file_path.name)
+    
+    if file_name in existing_file_names:
+        # Both copies saving to the same file.
+        if os.path.normcase(source_file_path) == os.path.normcase(save_file_path) or not overwrite_files:
+            return NOT_SAVED, None
+        try:
+            save_file_path.unlink(missing_ok=True) # Delete
+        except OSError as err:
+            printMessage(err, SHOW_ERRORS)
+        save_detail = OVERWRITTEN
+    else:
+        save_detail = NEW_SAVE
+    
+    try:
+        try:
+            os.link(source_file_path, save_file_path)
+        except OSError:
+            shutil.copy2(source_file_path, save_file_path)
+            counters.bytes_written += save_file_path.stat().st_size
+        existing_file_names.add(file_name)
+    except OSError as err:
+        error = f'Failed To Link Page/Image: {err}'
+        printMessage(error, SHOW_ERRORS)
+        existing_file_names.discard(file_name)
+        counters.save_errors += 1
+        return SAVE_ERROR, error
+    
+    return save_detail, None
+
+
+### Find all CBR files in the directories being watched.
+###     (watch_dirs) A List of directory Paths.
+###     (search_sub_dirs) Search sub-directories too.
+###     --> Returns a [Dictionary] {CBR file Path : (size, modified time)}
+def scanWatchDirectories(watch_dirs, search_sub_dirs = False):
+    cbr_files = {}
+    dirs_to_scan = list(watch_dirs)
+    while dirs_to_scan:
+        try:
+            with os.scandir(dirs_to_scan.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        if search_sub_dirs:
+                            dirs_to_scan.append(entry.path)
+                    elif entry.name[-4:] == '.cbr':
+                        stat = entry.stat()
+                        cbr_files[Path(entry.path)] = (stat.st_size, stat.st_mtime_ns)
+        except OSError as err:
+            printMessage(err, SHOW_ERRORS)
+    return cbr_files
+
+
+### Watch directories for new (or changed) CBR files and extract, edit, and save them as they arrive, never
+### waiting for input. A file is only processed once its size and modified time stop changing for "settle_time"
+### seconds, so files still being copied/written are left alone. Everything already loaded (imports, caches,
+### directory listings, etc.) stays loaded between files, but CBR files already done are let go of (see
+### evictFinishedArchives). Runs until stopped with Ctrl+C (or SIGTERM).
+###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
+###     (watch_dirs) A List of directory Paths to watch.
+###     (poll_interval) Seconds between checks for new files.
+###     (settle_time) Seconds a file must stay unchanged before it's processed.
+###     --> Returns a [Dictionary]
+def watchDirectories(all_the_data, watch_dirs, poll_interval = 2.0, settle_time = 5.0):
+    search_sub_dirs = all_the_data.get(SEARCH_SUB_DIRS, False)
+    watch_dirs = [Path(watch_dir) for watch_dir in watch_dirs]
+    waiting = {}  # {CBR file Path : ((size, modified time), time first seen like this)}
+    done = {}     # {CBR file Path : (size, modified time)}
+    
+    for watch_dir in watch_dirs:
+        watch_dir.mkdir(parents=True, exist_ok=True)
+        printMessage(f'Watching: {watch_dir}', SHOW_PROGRESS)
+    printMessage('Press Ctrl+C to stop.', SHOW_PROGRESS)
+    
+    try:
+        while True:
+            now = perf_counter()
+            cbr_files = scanWatchDirectories(watch_dirs, search_sub_dirs)
+            ready = []
+            
+            for cbr_file_path, file_state in cbr_files.items():
+                if done.get(cbr_file_path) == file_state:
+                    continue
+                waiting_since = waiting.get(cbr_file_path)
+                if not waiting_since or waiting_since[0] != file_state:
+                    waiting[cbr_file_path] = (file_state, now) # New or still changing
+                elif now - waiting_since[1] >= settle_time:
+                    ready.append(cbr_file_path)
+                    del waiting[cbr_file_path]
+                    done[cbr_file_path] = file_state
+            
+            # Forget files that were removed.
+            for cbr_file_path in [path for path in waiting if path not in cbr_files]:
+                del waiting[cbr_file_path]
+            for cbr_file_path in [path for path in done if path not in cbr_files]:
+                del done[cbr_file_path]
+            
+            if ready:
+                for cbr_file_path in ready:
+                    # A changed file is processed again.
+                    all_the_data = forgetArchive(all_the_data, cbr_file_path)
+                    try:
+                        all_the_data = findCBRFiles(cbr_file_path, all_the_data)
+                    except Exception as err: # One bad file shouldn't stop the watching.
+                        printMessage(f'Failed To Read CBR File: {cbr_file_path} ({type(err).__name__}: {err})', SHOW_ERRORS)
+                        all_the_data = forgetArchive(all_the_data, cbr_file_path)
+                
+                try:
+                    all_the_data = extractEditSavePages(all_the_data)
+                except Exception as err:
+                    progress.finish()
+                    printMessage(f'Failed To Process CBR Files: {type(err).__name__}: {err}', SHOW_ERRORS)
+                    for cbr_file_path in ready:
+                        page_table = all_the_data[LOG_DATA][PAGE_DATA].get(cbr_file_path)
+                        if page_table and not page_table.processed:
+                            all_the_data = forgetArchive(all_the_data, cbr_file_path)
+                
+                all_the_data = evictFinishedArchives(all_the_data)
+                printTotals(all_the_data)
+            
+            Wait(poll_interval)
+    
+    except KeyboardInterrupt:
+        progress.finish()
+        printMessage('\nStopped watching.', SHOW_PROGRESS)
+    
+    return all_the_data
+
+
+### Plan where every page of a CBR file will be saved before extracting starts. Each page's save Path is
+### worked out, every directory needed is created once, and any pages that would be saved to the same
+### file (in this or any other CBR file) are reported or given a new file name.
+###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
+###     (cbr_file_path) A Path to a CBR file.
+###     --> Returns a [Dictionary]
+def planSavePaths(all_the_data, cbr_file_path):
+    page_table = all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path]
+    page_indexes = page_table.page_indexes
+    planned_save_paths = all_the_data[LOG_DATA][PLANNED_SAVE_PATHS]
+    keep_file_paths_intact = all_the_data.get(KEEP_FILE_PATHS_INTACT, True)
+    resolve_name_conflicts = all_the_data.get(RESOLVE_NAME_CONFLICTS, False)
+    
+    save_dir_paths = getSaveDirectoryPaths(all_the_data, cbr_file_path)
+    combine_log = getPlannedCombines(all_the_data, cbr_file_path)
+    forgetPlannedSavePaths(all_the_data, cbr_file_path, page_table)
+    
+    # All pages are saved to one PDF file.
+    if all_the_data.get(CHANGE_IMAGE_FORMAT) == PDF:
+        pdf_file_path = getPDFFilePath(all_the_data, cbr_file_path)
+        planned_by = planned_save_paths.get(pdf_file_path)
+        if planned_by and planned_by[0] != cbr_file_path:
+            if resolve_name_conflicts:
+                pdf_file_path = getUnusedFilePath(pdf_file_path, planned_save_paths)
+                printMessage(f'File Name Conflict: "{cbr_file_path.name}" will be saved as "{pdf_file_path.name}" instead.', SHOW_ERRORS)
+            else:
+                printMessage(f'File Name Conflict: "{cbr_file_path.name}" and "{planned_by[0].name}" will both be saved to: {pdf_file_path}', SHOW_ERRORS)
+        planned_save_paths[pdf_file_path] = (cbr_file_path, next(iter(page_indexes), 0))
+        page_table.planned_paths.append(pdf_file_path)
+        page_table.save_plan = {page_index : (save_dir_paths[0], '', 1, pdf_file_path) for page_index in page_indexes}
+        getDirectoryListing(all_the_data, pdf_file_path.parent)
+        return all_the_data
+    
+    save_plan = {}
+    name_conflicts = 0
+    counter = 1
+    for page_index in page_indexes:
+        
+        # Pages combined into another page are saved with that page.
+        if type(combine_log.get(page_index)) == int:
+            continue
+        
+        save_dir_path = save_dir_paths[(counter-1) % len(save_dir_paths)]
+        page_number = getPageNumberString(page_index, combine_log)
+        
+        archived_file_path = page_table.getPagePath(page_index)
+        if not keep_file_paths_intact:
+            archived_file_path = Path(archived_file_path.name)
+        
+        save_file_path = createFilePathFrom(all_the_data, cbr_file_path, archived_file_path, save_dir_path, page_number, counter)
+        
+        planned_by = planned_save_paths.get(save_file_path)
+        if planned_by and planned_by != (cbr_file_path, page_index):
+            name_conflicts += 1
+            if resolve_name_conflicts:
+                save_file_path = getUnusedFilePath(save_file_path, planned_save_paths)
+                printMessage(f'File Name Conflict: Page {page_index+1} will be saved as "{save_file_path.name}" instead.', SHOW_ERRORS)
+            else:
+                printMessage(f'File Name Conflict: Page {page_index+1} and page {planned_by[1]+1} of "{planned_by[0].name}" will both be saved to: {save_file_path}', SHOW_ERRORS)
+        
+        planned_save_paths[save_file_path] = (cbr_file_path, page_index)
+        page_table.planned_paths.append(save_file_path)
+        save_plan[page_index] = (save_dir_path, page_number, counter, save_file_path)
+        counter += 1
+        
+        getDirectoryListing(all_the_data, save_file_path.parent)
+    
+    if name_conflicts and not resolve_name_conflicts:
+        printMessage(f'Warning: {name_conflicts} page(s) of "{cbr_file_path.name}" will be saved over other pages. Use RESOLVE_NAME_CONFLICTS to prevent this.', SHOW_ERRORS)
+    
+    page_table.save_plan = save_plan
+    
+    return all_the_data
+
+
+### Work out which pages will be combined (COMBINE_PAGES) without any images, to know ahead of time
+### which pages will be saved and what page numbers they will have.
+###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
+###     (cbr_file_path) A Path to a CBR file.
+###     --> Returns a [Dictionary]
+def getPlannedCombines(all_the_data, cbr_file_path):
+    combine_pages = all_the_data.get(COMBINE_PAGES)
+    page_table = all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path]
+    page_indexes = page_table.page_indexes
+    total_pages = len(page_table.page_names)
+    combine_log = {}
+    
+    if combine_pages:
+        pages_left = set(page_indexes)
+        for pages_to_combine in combine_pages:
+            
+            # Pages numbers that are strings are considered disabled, ignored.
+            if type(pages_to_combine[1]) != str and type(pages_to_combine[2]) != str:
+                page_index_one = getPageIndex(total_pages, pages_to_combine[1], False)
+                page_index_two = getPageIndex(total_pages, pages_to_combine[2], False)
+                
+                if page_index_one != page_index_two and page_index_one in pages_left and page_index_two in pages_left:
+                    logCombinedPages(combine_log, page_index_one, page_index_two, pages_to_combine[0])
+                    pages_left.discard(page_index_two)
+    
+    return combine_log
+
+
+### Extract pages from a CBR file / images from a RAR archive.
+###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
+###     (cbr_file_path) A Path to a CBR file.
+###     (page_indexes) Indexes of the pages to extract, or None for all pages selected (PAGES_TO_EXTRACT).
+###     (cbrar_file) The CBR file already open, or None to open it.
+###     --> Returns a [Dictionary]
+def extractPages(all_the_data, cbr_file_path, page_indexes = None, cbrar_file = None):
+    page_table = all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path]
+    if page_indexes is None:
+        page_indexes = page_table.page_indexes
+    counters = all_the_data[LOG_DATA][RUN_COUNTERS]
+    cbrar_file = cbrar_file or openArchive(all_the_data, cbr_file_path)
+    nested_archives = {}
+    
+    # How pages will be resized, so tall pages can be decoded at a reduced scale.
+    width_change = all_the_data.get(CHANGE_WIDTH, NO_CHANGE)
+    height_change = all_the_data.get(CHANGE_HEIGHT, NO_CHANGE)
+    if width_change or height_change:
+        size_changes = (width_change, height_change, all_the_data.get(KEEP_ASPECT_RATIO, True))
+    else:
+        size_changes = None
+    
+    if all_the_data.get(IMAGE_DATA):
+        all_the_data[IMAGE_DATA].clear()
+    else:
+        all_the_data[IMAGE_DATA] = {}
+    
+    for page_index in page_indexes:
+        
+        try:
+            timer = startStage(TIME_EXTRACT, cbr_file_path, page_index)
+            if all_the_data[LOG_DATA].get(TEMP_DIR) and page_index not in page_table.nested_pages:
+                # All files already extracted, continue on with Extraction Method Two.
+                temp_dir = all_the_data[LOG_DATA][TEMP_DIR]
+                archived_file_path = page_table.getPagePath(page_index)
+                archived_img = Path(PurePath().joinpath(temp_dir.name, archived_file_path))
+            else:
+                # Extraction Method One
+                page_bytes = readArchivedPage(cbrar_file, page_table, page_index, nested_archives)
+                counters.bytes_read += len(page_bytes)
+                archived_img = io.BytesIO(page_bytes)
+            stopStage(page_table, TIME_EXTRACT, timer, cbr_file_path, page_index)
+            
+            all_the_data[IMAGE_DATA][page_index] = decodePage(page_table, cbr_file_path, page_index, archived_img, size_changes)
+            progress.update()
+        
+        except (rarfile.Error, zipfile.BadZipFile, OSError, Image.UnidentifiedImageError, ValueError, TypeError, KeyError) as err:
+            printMessage(err, SHOW_ERRORS)
+            
+            # Log Errors
+            if page_table.extract_errors.get(page_index):
+                page_table.extract_errors[page_index].append(str(err))
+            else:
+                page_table.extract_errors[page_index] = [str(err)]
+        
+        if page_table.extract_errors.get(page_index) and cbr_file_path in all_the_data[LOG_DATA][ARCHIVES_IN_MEMORY]:
+            # The other tool can only extract CBR files, not ones in memory.
+            page_table.extract_errors[page_index].append('CBR files in memory can only be extracted with rarfile.')
+            counters.extract_errors += 1
+        
+        elif page_table.extract_errors.get(page_index) and page_index in page_table.nested_pages:
+            # The other tool doesn't extract nested archives.
+            page_table.extract_errors[page_index].append('Pages in nested archives can only be extracted with rarfile.')
+            counters.extract_errors += 1
+        
+        elif page_table.extract_errors.get(page_index):
+            try:
+                printMessage(f'Failed to extract page {page_index+1} from archive, so extracting all files to a temporary directory...', SHOW_PROGRESS)
+                
+                # Attempt to extract file with another tool. This will extract all files in the CBR file temporarily.
                 if all_the_data[LOG_DATA].get(TEMP_DIR):
                     temp_dir = all_the_data[LOG_DATA][TEMP_DIR]
                 else:
-                    temp_dir = tempfile.TemporaryDirectory(ignore_cleanup_errors=True)
-                    all_the_data[LOG_DATA][TEMP_DIR] = temp_dir
                     # Extraction Method Two
-                    patoolib.extract_archive(cbr_file_path, outdir=temp_dir.name)
-                    #patoolib.extract_archive(r'c:/file/does/not/extist.rar', outdir=temp_dir.name) # Force an error
-                    #cbrar_file.extractall(path=temp_dir.name, members=None, pwd=None) # Will still throw an error
+                    timer = startStage(TIME_EXTRACT, cbr_file_path)
+                    temp_dir = extractAllWithPatool(cbr_file_path)
+                    stopStage(page_table, TIME_EXTRACT, timer, cbr_file_path)
+                    all_the_data[LOG_DATA][TEMP_DIR] = temp_dir
                 
-                archived_file_path = page_meta_data[page_index][META_FILE_PATH]
+                archived_file_path = page_table.getPagePath(page_index)
                 extracted_file_path = Path(PurePath().joinpath(temp_dir.name, archived_file_path))
-                all_the_data[IMAGE_DATA][page_index] = Image.open(extracted_file_path)
-                
-                print(f'Successfully extracted and opened needed page {page_index+1}.')
+                all_the_data[IMAGE_DATA][page_index] = decodePage(page_table, cbr_file_path, page_index, extracted_file_path, size_changes)
+                counters.bytes_read += extracted_file_path.stat().st_size
                 
-            except (patoolib.util.PatoolError, FileNotFoundError, UnidentifiedImageError, ValueError, TypeError) as err:
-                print(err)
+                printMessage(f'Successfully extracted and opened needed page {page_index+1}.', SHOW_EVERYTHING)
+            
+            except (OSError, Image.UnidentifiedImageError, ValueError, TypeError) as err:
+                printMessage(err, SHOW_ERRORS)
                 
                 # Log Errors
-                if all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_EXTRACT_ERRORS].get(page_index):
-                    all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_EXTRACT_ERRORS][page_index].append(err)
+                if page_table.extract_errors.get(page_index):
+                    page_table.extract_errors[page_index].append(str(err))
                 else:
-                    all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_EXTRACT_ERRORS][page_index] = [err]
+                    page_table.extract_errors[page_index] = [str(err)]
+                if page_table.failedExtraction(page_index):
+                    counters.extract_errors += 1
+    
+    closeNestedArchives(nested_archives)
     
     return all_the_data
 
 
+### Extract all files in a CBR file to a temporary directory with patool (Extraction Method Two). If patool
+### isn't installed or fails, the temporary directory is removed and an OSError raised so the pages that
+### needed it are logged as extraction errors and the run carries on.
+###     (cbr_file_path) A Path to a CBR file.
+###     --> Returns a [TemporaryDirectory]
+def extractAllWithPatool(cbr_file_path):
+    temp_dir = tempfile.TemporaryDirectory(ignore_cleanup_errors=True)
+    try:
+        patoolib.extract_archive(cbr_file_path, outdir=temp_dir.name)
+        #patoolib.extract_archive(r'c:/file/does/not/extist.rar', outdir=temp_dir.name) # Force an error
+        #cbrar_file.extractall(path=temp_dir.name, members=None, pwd=None) # Will still throw an error
+    except ImportError as err:
+        temp_dir.cleanup()
+        raise OSError(f'Extraction Method Two Unavailable, patool is not installed ({err})') from err
+    except (patoolib.util.PatoolError, OSError) as err: # patoolib is imported by now
+        temp_dir.cleanup()
+        raise OSError(f'Extraction Method Two Failed: {err}') from err
+    return temp_dir
+
+
+### Open a CBR file, either the file itself or a copy of it held in memory (ARCHIVES_IN_MEMORY).
+###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
+###     (cbr_file_path) A Path to a CBR file.
+###     --> Returns a [RarFile]
+def openArchive(all_the_data, cbr_file_path):
+    archive = all_the_data[LOG_DATA][ARCHIVES_IN_MEMORY].get(cbr_file_path)
+    if archive is None:
+        return rarfile.RarFile(cbr_file_path)
+    if type(archive) in (bytes, bytearray, memoryview):
+        archive = io.BytesIO(archive)
+    else:
+        archive.seek(0)
+    return rarfile.RarFile(archive)
+
+
+### Open a page/image without decoding it, refusing it if it's larger than max_image_pixels.
+###     (image_file) A Path or file-like object of the page/image.
+###     --> Returns a [Image]
+def openImage(image_file):
+    try:
+        image = Image.open(image_file)
+    except Image.DecompressionBombError as err:
+        raise ValueError(f'Page Too Large: {err}') from err
+    
+    if max_image_pixels and image.width * image.height > max_image_pixels:
+        image.close()
+        raise ValueError(f'Page Too Large: {image.width} x {image.height} pixels is more than max_image_pixels ({max_image_pixels:,})')
+    
+    return image
+
+
+### Open and decode a page/image so all decoding is done (and timed) now and not later while editing or saving.
+### Pages larger than max_image_pixels aren't decoded. Tall JPEG pages that will be made smaller are decoded
+### at a reduced scale (1/2, 1/4 or 1/8) that's still larger than needed, using a fraction of the memory.
+###     (page_table) The PageTable of the CBR file the page is from.
+###     (cbr_file_path) A Path to the CBR file the page is from.
+###     (page_index) Index of the page.
+###     (page_file) A Path or file-like object of the page/image.
+###     (size_changes) How the page will be resized, a Tuple (width_change, height_change, keep_aspect_ratio) or None.
+###     --> Returns a [Image]
+def decodePage(page_table, cbr_file_path, page_index, page_file, size_changes = None):
+    timer = startStage(TIME_DECODE, cbr_file_path, page_index)
+    image = openImage(page_file)
+    
+    if size_changes and image.format == 'JPEG' and image.height >= TALL_PAGE_HEIGHT:
+        org_size = image.size
+        image.draft(image.mode, ModifyImageSize(org_size, size_changes[:2], size_changes[2]))
+        if image.size != org_size:
+            page_table.org_sizes[page_index] = org_size
+    
+    image.load()
+    stopStage(page_table, TIME_DECODE, timer, cbr_file_path, page_index)
+    return image
+
+
 ### Make edits to pages.
 ###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
 ###     (cbr_file_path) A Path to a CBR file.
+###     (page_indexes) Indexes of the pages extracted to edit, a group of pages edited together (see getPageGroups),
+###                    or None for all pages selected (PAGES_TO_EXTRACT).
 ###     --> Returns a [Dictionary]
-def modifyPages(all_the_data, cbr_file_path):
-    page_indexes = all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_INDEXES]
-    page_meta_data = all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_META_DATA]
+def modifyPages(all_the_data, cbr_file_path, page_indexes = None):
+    page_table = all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path]
+    selected_page_indexes = page_table.page_indexes
+    if page_indexes is None:
+        page_indexes = selected_page_indexes
+    counters = all_the_data[LOG_DATA][RUN_COUNTERS]
     
-    width_change = all_the_data.get(CHANGE_WIDTH)
-    height_change = all_the_data.get(CHANGE_HEIGHT)
+    width_change = all_the_data.get(CHANGE_WIDTH, NO_CHANGE)
+    height_change = all_the_data.get(CHANGE_HEIGHT, NO_CHANGE)
     keep_aspect_ratio = all_the_data.get(KEEP_ASPECT_RATIO, True)
     
     rotate_pages = all_the_data.get(ROTATE_PAGES)
     combine_pages = all_the_data.get(COMBINE_PAGES)
     resample = all_the_data.get(RESAMPLING_FILTER, NEAREST)
-    format_change = all_the_data.get(CHANGE_IMAGE_FORMAT)
     
     page_images = all_the_data.get(IMAGE_DATA, {})
-    total_pages = len(page_meta_data)
+    total_pages = len(page_table.page_names)
     
-    if (width_change or height_change) and format_change != ICO:
+    if width_change or height_change:
         
         for page_index, image in page_images.items():
             
-            print(f'Org Image Size: {image.width} x {image.height}')
+            printMessage(f'Org Image Size: {image.width} x {image.height}', SHOW_EVERYTHING)
             
             try:
-                resized_image = resizeImage(image, width_change, height_change, keep_aspect_ratio)
-                print(f'New Image Size: {resized_image.width} x {resized_image.height}')
+                timer = startStage(TIME_RESIZE, cbr_file_path, page_index)
+                org_size = page_table.org_sizes.get(page_index, image.size)
+                resized_image = resizeImage(image, width_change, height_change, keep_aspect_ratio, org_size=org_size)
+                stopStage(page_table, TIME_RESIZE, timer, cbr_file_path, page_index)
+                printMessage(f'New Image Size: {resized_image.width} x {resized_image.height}', SHOW_EVERYTHING)
                 error = None
             except Exception as err: ## TODO: what errors can happen? stop and 'continue' on error?
                 error = f'Image Resize Failed: {err}'
@@ -634,15 +2302,15 @@ def modifyPages(all_the_data, cbr_file_path):
                     error_code = CHANGE_WIDTH
                 else:
                     error_code = CHANGE_HEIGHT
-                print(error)
-                all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_EDIT_ERRORS][page_index] = {error_code : error}
+                printMessage(error, SHOW_ERRORS)
+                page_table.edit_errors[page_index] = {error_code : error}
+                counters.edit_errors += 1
             
             if error:
                 continue
             else:
                 page_images[page_index] = resized_image
-                all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_EDITS_MADE][CHANGE_WIDTH][page_index] = (image.width, resized_image.width)
-                all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_EDITS_MADE][CHANGE_HEIGHT][page_index] = (image.height, resized_image.height)
+                page_table.resizes[page_index] = (*org_size, resized_image.width, resized_image.height)
     
     if rotate_pages:
         
@@ -657,6 +2325,10 @@ def modifyPages(all_the_data, cbr_file_path):
                         rotate_pages_to_indexes[getPageIndex(total_pages, page)] = degrees
                     else:
                         rotate_all_degrees = degrees
+                # Any other strings are page selections. Example: {'odd' : 90, 'every 4th' : 180}
+                elif not re_page_number_term.match(page.strip()):
+                    for page_index in compilePageSelection(page, total_pages):
+                        rotate_pages_to_indexes[page_index] = degrees
         else:
             rotate_all_degrees = rotate_pages
         
@@ -670,11 +2342,10 @@ def modifyPages(all_the_data, cbr_file_path):
         for page_index, degrees in rotate_indexes.items():
             
             # Skip if page failed extraction.
-            if all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_EXTRACT_ERRORS].get(page_index):
-                if len(all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_EXTRACT_ERRORS][page_index]) > 1:
-                    continue
+            if page_table.failedExtraction(page_index):
+                continue
             
-            print(f'Rotate Page: {page_index+1} {degrees} Degress')
+            printMessage(f'Rotate Page: {page_index+1} {degrees} Degress', SHOW_EVERYTHING)
             
             error = None
             rotated_image = None
@@ -682,30 +2353,34 @@ def modifyPages(all_the_data, cbr_file_path):
             if page_index in page_indexes:
                 
                 # If a previous edit has failed/errored on this page, skip it.
-                if all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_EDIT_ERRORS].get(page_index):
+                if page_table.edit_errors.get(page_index):
                     continue
                 
                 try:
+                    timer = startStage(TIME_ROTATE, cbr_file_path, page_index)
                     rotated_image = rotatePage(
                         all_the_data[IMAGE_DATA][page_index],
                         angle = degrees,
                         resample = resample
                     )
+                    stopStage(page_table, TIME_ROTATE, timer, cbr_file_path, page_index)
                 except Exception as err:
                     error = f'Image Rotation Failed: {err}'
-                    print(error)
-                    all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_EDIT_ERRORS][page_index] = {ROTATE_PAGES : error}
+                    printMessage(error, SHOW_ERRORS)
+                    page_table.edit_errors[page_index] = {ROTATE_PAGES : error}
+                    counters.edit_errors += 1
             
             else:
                 error = f'Image Rotation Failed: Page not found in PAGES_TO_EXTRACT'
-                print(error)
-                all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_EDIT_ERRORS][page_index] = {ROTATE_PAGES : error}
+                printMessage(error, SHOW_ERRORS)
+                page_table.edit_errors[page_index] = {ROTATE_PAGES : error}
+                counters.edit_errors += 1
             
             if error:
                 continue
             elif rotated_image:
                 all_the_data[IMAGE_DATA][page_index] = rotated_image
-                all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_EDITS_MADE][ROTATE_PAGES][page_index] = degrees
+                page_table.rotations[page_index] = degrees
     
     if combine_pages:
         for pages_to_combine in combine_pages:
@@ -718,27 +2393,36 @@ def modifyPages(all_the_data, cbr_file_path):
                 page_index_one = getPageIndex(total_pages, pages_to_combine[1], False)
                 page_index_two = getPageIndex(total_pages, pages_to_combine[2], False)
                 
+                # Only edit a group of pages, each combine is done (or fails) with the group of it's first page selected.
+                if page_indexes is not selected_page_indexes:
+                    if page_index_one in selected_page_indexes:
+                        group_page_index = page_index_one
+                    elif page_index_two in selected_page_indexes:
+                        group_page_index = page_index_two
+                    else:
+                        group_page_index = next(iter(selected_page_indexes), None)
+                    if group_page_index not in page_indexes:
+                        continue
+                
                 # Only skip editing if both pages failed extraction (no error recording necessary),
                 # else if just one page failed extraction, get the obvious error incoming.
-                if (all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_EXTRACT_ERRORS].get(page_index_one) and
-                    all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_EXTRACT_ERRORS].get(page_index_two)):
-                        if (len(all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_EXTRACT_ERRORS][page_index_one]) > 1 and
-                            len(all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_EXTRACT_ERRORS][page_index_two]) > 1):
-                                continue
+                if page_table.failedExtraction(page_index_one) and page_table.failedExtraction(page_index_two):
+                    continue
                 
-                print(f'Combine: {"Horizontally" if layout_direction==HORIZONTAL else "Vertically"} Page: {page_index_one+1} and {page_index_two+1}')
+                printMessage(f'Combine: {"Horizontally" if layout_direction==HORIZONTAL else "Vertically"} Page: {page_index_one+1} and {page_index_two+1}', SHOW_EVERYTHING)
                 
                 error = None
                 combined_image = None
                 
-                if page_index_one in page_indexes and page_index_two in page_indexes:
+                if page_index_one in selected_page_indexes and page_index_two in selected_page_indexes:
                     
                     # If a previous edit has failed/errored on these pages, skip.
-                    if (all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_EDIT_ERRORS].get(page_index_one) or
-                        all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_EDIT_ERRORS].get(page_index_two)):
+                    if (page_table.edit_errors.get(page_index_one) or
+                        page_table.edit_errors.get(page_index_two)):
                             continue
                     
                     try:
+                        timer = startStage(TIME_COMBINE, cbr_file_path, page_index_one)
                         combined_image = combinePages(
                             all_the_data[IMAGE_DATA][page_index_one],
                             all_the_data[IMAGE_DATA][page_index_two],
@@ -746,6 +2430,7 @@ def modifyPages(all_the_data, cbr_file_path):
                             resample = resample,
                             resize_big_image = True
                         )
+                        stopStage(page_table, TIME_COMBINE, timer, cbr_file_path, page_index_one)
                     except KeyError as error_index:
                         page_error = int(str(error_index)) + 1
                         error = f'Image Combining Error: Page {page_error} not found'
@@ -754,140 +2439,782 @@ def modifyPages(all_the_data, cbr_file_path):
                 
                 else:
                     missing_pages = ''
-                    if page_index_one not in page_indexes:
+                    if page_index_one not in selected_page_indexes:
                         missing_pages += f'{page_index_one+1}'
-                    if page_index_one not in page_indexes and page_index_two not in page_indexes:
+                    if page_index_one not in selected_page_indexes and page_index_two not in selected_page_indexes:
                         missing_pages += ' and '
-                    if page_index_two not in page_indexes:
+                    if page_index_two not in selected_page_indexes:
                         missing_pages += f'{page_index_two+1}'
                     error = f'Image Combining Failed: Page {missing_pages} not found in PAGES_TO_EXTRACT'
                 
                 if error:
-                    print(error)
-                    all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_EDIT_ERRORS][page_index_one] = {COMBINE_PAGES : error}
-                    all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_EDIT_ERRORS][page_index_two] = {COMBINE_PAGES : error}
+                    printMessage(error, SHOW_ERRORS)
+                    page_table.edit_errors[page_index_one] = {COMBINE_PAGES : error}
+                    page_table.edit_errors[page_index_two] = {COMBINE_PAGES : page_index_one}
+                    counters.edit_errors += 1 # One failed combine, not two.
                     continue
                 
                 elif combined_image:
                     all_the_data[IMAGE_DATA][page_index_one] = combined_image
                     
-                    #all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_EDITS_MADE][COMBINE_PAGES][page_index_one] = page_index_two
-                    
                     # Log each combined page and how they were combined and if they have been combined with other pages already combined.
-                    combine_log = all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_EDITS_MADE][COMBINE_PAGES]
-                    combine_first_page_log = combine_log.get(page_index_one)
-                    combine_second_page_log = combine_log.get(page_index_two)
-                    
-                    if combine_first_page_log:
-                        if combine_second_page_log:
-                            combine_first_page_log.append( ({page_index_two : combine_second_page_log.copy()}, layout_direction) )
-                            #combine_log[page_index_two] = page_index_one
-                            #combine_log.pop(page_index_two)
-                        else:
-                            combine_first_page_log.append((page_index_two, layout_direction))
-                    else:
-                        if combine_second_page_log:
-                            combine_log[page_index_one] = [({page_index_two : combine_second_page_log.copy()}, layout_direction)]
-                            #combine_log[page_index_two] = page_index_one
-                            #combine_log.pop(page_index_two)
-                        else:
-                            combine_log[page_index_one] = [(page_index_two, layout_direction)]
-                    
-                    combine_log[page_index_two] = page_index_one
+                    combine_log = page_table.combines
+                    logCombinedPages(combine_log, page_index_one, page_index_two, layout_direction)
                     
                     # Second image should no longer exists now so remove it from the image and log data.
                     all_the_data[IMAGE_DATA].pop(page_index_two)
-                    #all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_EDIT_ERRORS].pop(page_index_two)
-                    #all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_SAVE_PATHS].pop(page_index_two)
     
-    return all_the_data
+    return all_the_data
+
+
+### Start saving all the pages already extracted and edited as image files.
+###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
+###     (cbr_file_path) A Path to a CBR file.
+###     --> Returns a [Dictionary]
+def savePages(all_the_data, cbr_file_path):
+    page_table = all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path]
+    counters = all_the_data[LOG_DATA][RUN_COUNTERS]
+    save_plan = page_table.save_plan
+    combine_log = page_table.combines
+    keep_file_paths_intact = all_the_data.get(KEEP_FILE_PATHS_INTACT, True)
+    slice_height = all_the_data.get(SLICE_TALL_PAGES)
+    format_change = all_the_data.get(CHANGE_IMAGE_FORMAT)
+    auto_format = format_change == AUTO
+    shared_palette = (all_the_data.get(IMAGE_SAVING_PARAMS) or {}).get(SHARED_PALETTE)
+    page_images = all_the_data.get(IMAGE_DATA)
+    
+    if format_change == PDF:
+        return savePagesAsPDF(all_the_data, cbr_file_path)
+    
+    save_dir_paths = getSaveDirectoryPaths(all_the_data, cbr_file_path)
+    
+    counter = 1
+    for page_index, image in page_images.items():
+        #print(f'{page_index} : {image}')
+        
+        # Get all page numbers if pages combined
+        page_number = getPageNumberString(page_index, combine_log)
+        planned_save = save_plan.pop(page_index, None)
+        
+        # Pick the format to save each page as from what it looks like, keeping the page if already encoded to pick it.
+        # Pages saved with a palette may all share the same palette.
+        file_ext = None
+        page_bytes = None
+        if auto_format or shared_palette:
+            timer = startStage(TIME_SAVE, cbr_file_path, page_index)
+            if auto_format:
+                image, file_ext, page_table.save_formats[page_index], page_bytes = chooseAutoFormat(all_the_data, image, page_table)
+            else:
+                image = applySharedPalette(all_the_data, page_table, image, format_change[1] if format_change else page_table.getPagePath(page_index).suffix)
+            stopStage(page_table, TIME_SAVE, timer, cbr_file_path, page_index)
+        
+        # Tall pages may be saved as multiple slices, each saved like a page of it's own.
+        page_slices = getPageSlices(image, slice_height)
+        save_results = []
+        for slice_index, slice_box in enumerate(page_slices):
+            slice_number = slice_index + 1 if slice_box else 0
+            
+            # Directory path to save files in, each page uses the next directory in the list.
+            save_dir_path = save_dir_paths[(counter-1) % len(save_dir_paths)]
+            
+            # Use the planned save path unless edits didn't turn out as planned (a page failed to extract or combine, or was sliced).
+            if planned_save and not slice_number and planned_save[:3] == (save_dir_path, page_number, counter):
+                save_file_path = planned_save[3]
+            else:
+                archived_file_path = page_table.getPagePath(page_index)
+                if not keep_file_paths_intact:
+                    archived_file_path = Path(archived_file_path.name)
+                save_file_path = createFilePathFrom(all_the_data, cbr_file_path, archived_file_path, save_dir_path, page_number, counter, slice_number)
+            if file_ext:
+                save_file_path = replanSavePath(all_the_data, cbr_file_path, page_index, save_file_path, file_ext)
+            counter += 1
+            
+            if not slice_index:
+                if page_index not in page_table.save_paths:
+                    counters.pages_saved += 1
+                page_table.save_paths[page_index] = str(save_file_path)
+                page_table.slices.pop(page_index, None)
+            if slice_box:
+                page_table.slices.setdefault(page_index, []).append(str(save_file_path))
+            
+            if slice_box:
+                save_results.append(savePageImage(all_the_data, page_table, cbr_file_path, page_index, image.crop(slice_box), save_file_path))
+            else:
+                save_results.append(savePageImage(all_the_data, page_table, cbr_file_path, page_index, image, save_file_path, page_bytes))
+        
+        # A page sliced is only as saved as it's least saved slice (first error, overwritten, saved, then not saved).
+        save_detail, error = max(save_results, key=lambda save_result: SAVE_DETAIL_ORDER.index(save_result[0]))
+        page_table.setSaveDetail(page_index, save_detail, error)
+        
+        finishPage(all_the_data, page_table, cbr_file_path, page_index)
+    
+    return finishArchive(all_the_data, cbr_file_path)
+
+
+### Save all the pages into one PDF file (CHANGE_IMAGE_FORMAT : PDF), adding each page as it's encoded. JPEG pages that
+### weren't edited are added as they are, read again from the CBR file, not re-encoded. Pages can be extracted and
+### edited here too, a group of pages at a time (see getPageGroups), each group let go of once added, so only the
+### pages edited together are ever in memory instead of every page of the CBR file.
+###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
+###     (cbr_file_path) A Path to a CBR file.
+###     (extract_pages) Extract and edit the pages here, instead of saving pages already extracted and edited.
+###     --> Returns a [Dictionary]
+def savePagesAsPDF(all_the_data, cbr_file_path, extract_pages = False):
+    page_table = all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path]
+    counters = all_the_data[LOG_DATA][RUN_COUNTERS]
+    overwrite_files = all_the_data.get(OVERWRITE_FILES, False)
+    
+    if page_table.save_plan:
+        pdf_file_path = next(iter(page_table.save_plan.values()))[3]
+        page_table.save_plan = {}
+    else:
+        pdf_file_path = getPDFFilePath(all_the_data, cbr_file_path)
+    
+    printMessage(f'Saving Pages To: {pdf_file_path}', SHOW_EVERYTHING)
+    
+    existing_file_names = getDirectoryListing(all_the_data, pdf_file_path.parent)
+    file_name = os.path.normcase(pdf_file_path.name)
+    
+    pdf_writer = None
+    error = None
+    if not overwrite_files and file_name in existing_file_names:
+        save_detail = NOT_SAVED
+    else:
+        save_detail = OVERWRITTEN if file_name in existing_file_names else NEW_SAVE
+    
+    cbrar_file = openArchive(all_the_data, cbr_file_path) if extract_pages else None
+    nested_archives = {}
+    for page_group in (getPageGroups(all_the_data, cbr_file_path) if extract_pages else [None]):
+        if page_group:
+            all_the_data = extractPages(all_the_data, cbr_file_path, page_group, cbrar_file)
+            all_the_data = modifyPages(all_the_data, cbr_file_path, page_group)
+        page_images = all_the_data.get(IMAGE_DATA) or {}
+        temp_dir = all_the_data[LOG_DATA].get(TEMP_DIR)
+        
+        # The PDF file is started once there's a page to add to it.
+        if page_images and save_detail != NOT_SAVED and not pdf_writer and not error:
+            try:
+                pdf_writer = PDFWriter(pdf_file_path)
+            except OSError as err:
+                error = f'Failed To Save PDF File: {err}'
+                printMessage(error, SHOW_ERRORS)
+                save_detail = SAVE_ERROR
+        
+        for page_index, image in page_images.items():
+            if page_index not in page_table.save_paths:
+                counters.pages_saved += 1
+            page_table.save_paths[page_index] = str(pdf_file_path)
+            
+            if pdf_writer:
+                try:
+                    timer = startStage(TIME_SAVE, cbr_file_path, page_index)
+                    if image.format == 'JPEG' and image.mode in ('L', 'RGB') and page_index not in page_table.org_sizes:
+                        # Unedited JPEG page, the original file is already a valid PDF image stream.
+                        if temp_dir and page_index not in page_table.nested_pages:
+                            image_stream = Path(PurePath().joinpath(temp_dir.name, page_table.getPagePath(page_index))).read_bytes()
+                        else:
+                            cbrar_file = cbrar_file or openArchive(all_the_data, cbr_file_path)
+                            image_stream = readArchivedPage(cbrar_file, page_table, page_index, nested_archives)
+                        pdf_writer.addImagePage(image.size, image_stream, 'DeviceGray' if image.mode == 'L' else 'DeviceRGB', 'DCTDecode')
+                    else:
+                        from_jpeg = page_table.getPagePath(page_index).suffix.lower() in JPG
+                        pdf_writer.addImagePage(*getPDFImageStream(all_the_data, page_table, image, from_jpeg))
+                    stopStage(page_table, TIME_SAVE, timer, cbr_file_path, page_index)
+                    page_table.setSaveDetail(page_index, save_detail)
+                except (rarfile.Error, zipfile.BadZipFile, OSError, ValueError, KeyError) as err:
+                    page_error = f'Failed To Add Page To PDF File: {err}'
+                    printMessage(page_error, SHOW_ERRORS)
+                    page_table.setSaveDetail(page_index, SAVE_ERROR, page_error)
+                    counters.save_errors += 1
+            else:
+                page_table.setSaveDetail(page_index, save_detail, error)
+                if error:
+                    counters.save_errors += 1
+            
+            finishPage(all_the_data, page_table, cbr_file_path, page_index)
+        
+        if page_group:
+            # Finish the pages not saved before letting go of the group.
+            for page_index in page_group:
+                if page_index not in page_images:
+                    finishPage(all_the_data, page_table, cbr_file_path, page_index)
+            page_images.clear()
+    
+    closeNestedArchives(nested_archives)
+    if pdf_writer:
+        try:
+            counters.bytes_written += pdf_writer.close()
+            existing_file_names.add(file_name)
+        except OSError as err:
+            printMessage(f'Failed To Save PDF File: {err}', SHOW_ERRORS)
+            existing_file_names.discard(file_name)
+    
+    return finishArchive(all_the_data, cbr_file_path, not extract_pages)
+
+
+### Get the pages of a CBR file in groups that are edited together, each page saved with the pages to be combined into
+### it (COMBINE_PAGES), in the order they will be saved.
+###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
+###     (cbr_file_path) A Path to a CBR file.
+###     --> Returns a [List] of Lists of page indexes
+def getPageGroups(all_the_data, cbr_file_path):
+    page_table = all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path]
+    combine_log = getPlannedCombines(all_the_data, cbr_file_path)
+    
+    page_groups = {} # {page_index saved : [page indexes]}
+    for page_index in page_table.page_indexes:
+        saved_page_index = page_index
+        while type(combine_log.get(saved_page_index)) == int:
+            saved_page_index = combine_log[saved_page_index]
+        page_groups.setdefault(saved_page_index, []).append(page_index)
+    
+    return [page_groups[page_index] for page_index in page_table.page_indexes if page_index in page_groups]
+
+
+### Encode a page to add to a PDF file. Pages from JPEG files are encoded as JPEG again (see IMAGE_SAVING_PARAMS),
+### any other pages are compressed losslessly. Transparent parts of a page are made white.
+###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
+###     (page_table) The PageTable of the CBR file the page is from.
+###     (image) The page/image.
+###     (from_jpeg) True if the page was a JPEG file.
+###     --> Returns a [Tuple] (size, image stream Bytes, color space, stream filter), see PDFWriter.addImagePage
+def getPDFImageStream(all_the_data, page_table, image, from_jpeg):
+    if image.mode == '1':
+        image = image.convert('L')
+    elif image.mode in ('LA', 'RGBA', 'PA') or 'transparency' in image.info:
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, 'white')
+        background.paste(image, mask=image.getchannel('A'))
+        image = background
+    elif image.mode not in ('L', 'RGB'):
+        image = image.convert('RGB')
+    color_space = 'DeviceGray' if image.mode == 'L' else 'DeviceRGB'
+    
+    if from_jpeg:
+        return image.size, encodePage(all_the_data, image, JPG[1], page_table), color_space, 'DCTDecode'
+    
+    return image.size, zlib.compress(image.tobytes()), color_space, 'FlateDecode'
+
+
+### All the pages of a CBR file are done, finish any pages not saved (failed extraction or combined into other pages)
+### and record the CBR file as processed.
+###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
+###     (cbr_file_path) A Path to a CBR file.
+###     (finish_pages) Finish the pages not saved, off if they already are.
+###     --> Returns a [Dictionary]
+def finishArchive(all_the_data, cbr_file_path, finish_pages = True):
+    page_table = all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path]
+    page_images = all_the_data.get(IMAGE_DATA)
+    
+    for page_index in (page_table.page_indexes if finish_pages else ()):
+        if page_index not in page_images:
+            finishPage(all_the_data, page_table, cbr_file_path, page_index)
+    
+    page_table.processed = True
+    page_table.palette = None # Only needed while saving.
+    all_the_data[LOG_DATA][RUN_COUNTERS].archives_done += 1
+    
+    writeRunLog(all_the_data, {
+        'record' : 'archive_done',
+        'cbr' : str(cbr_file_path),
+        'times' : {TIMED_STAGES[stage] : [round(wall, 6), round(cpu, 6)] for stage, (wall, cpu) in page_table.archive_times.items()}
+    })
+    
+    return all_the_data
+
+
+### Save a page (or a slice of a page) as an image file, unless the file already exists and OVERWRITE_FILES is off.
+###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
+###     (page_table) The PageTable of the CBR file the page is from.
+###     (cbr_file_path) A Path to a CBR file.
+###     (page_index) Index of the page.
+###     (image) The page/image to save.
+###     (save_file_path) A Path to save the image file to.
+###     (page_bytes) The page already encoded (see chooseAutoFormat) to save as is, or None to encode it now.
+###     --> Returns a [Tuple] (NOT_SAVED/NEW_SAVE/OVERWRITTEN/SAVE_ERROR, error message or None)
+def savePageImage(all_the_data, page_table, cbr_file_path, page_index, image, save_file_path, page_bytes = None):
+    counters = all_the_data[LOG_DATA][RUN_COUNTERS]
+    overwrite_files = all_the_data.get(OVERWRITE_FILES, False)
+    
+    printMessage(f'Saving Page: {save_file_path}', SHOW_EVERYTHING)
+    
+    existing_file_names = getDirectoryListing(all_the_data, save_file_path.parent)
+    file_name = os.path.normcase(save_file_path.name)
+    
+    if overwrite_files and file_name in existing_file_names:
+        try:
+            save_file_path.unlink(missing_ok=True) # Delete
+        except OSError as err:
+            printMessage(err, SHOW_ERRORS)
+        save_detail = OVERWRITTEN
+    elif not overwrite_files and file_name in existing_file_names:
+        return NOT_SAVED, None
+    else:
+        save_detail = NEW_SAVE
+    
+    try:
+        timer = startStage(TIME_SAVE, cbr_file_path, page_index)
+        if page_bytes is not None:
+            save_file_path.write_bytes(page_bytes)
+        elif getTargetFileSize(all_the_data, image):
+            save_file_path.write_bytes(encodePage(all_the_data, image, save_file_path.suffix, page_table))
+        else:
+            params = getMultiSizeParams(image, save_file_path.suffix, getExtraSaveImageParams(all_the_data, save_file_path.suffix))
+            image.save(save_file_path, **params)
+        stopStage(page_table, TIME_SAVE, timer, cbr_file_path, page_index)
+        counters.bytes_written += save_file_path.stat().st_size
+        existing_file_names.add(file_name)
+    except (OSError, ValueError) as err:
+        error = f'Failed To Save Page/Image: {err}'
+        printMessage(error, SHOW_ERRORS)
+        existing_file_names.discard(file_name)
+        counters.save_errors += 1
+        return SAVE_ERROR, error
+    
+    return save_detail, None
+
+
+### Get the parts of a page to save as slices if taller than the slice height (SLICE_TALL_PAGES).
+###     (image) The page/image.
+###     (slice_height) Height in pixels of each slice, the last slice may be shorter. None or 0 to not slice.
+###     --> Returns a [List] of boxes (left, top, right, bottom) or [None] if the page isn't sliced
+def getPageSlices(image, slice_height):
+    if not slice_height or image.height <= slice_height:
+        return [None]
+    return [(0, top, image.width, min(top + slice_height, image.height)) for top in range(0, image.height, slice_height)]
+
+
+### Choose the format to save a page as (CHANGE_IMAGE_FORMAT : AUTO) from a shrunken copy of it. Pages mostly made of
+### a few flat colors (line-art, text) are saved as palettized PNGs, with as few colors as cover them, and any other
+### pages (photographic) as JPEGs or WebPs (AUTO_PHOTO_FORMATS), whichever is smaller, in grayscale if the page has
+### no color. Pages not clearly one or the other are encoded every way and saved as whichever is smallest. Pages
+### encoded to choose a format are given already encoded so they aren't encoded again. Transparent pages are always
+### saved as PNGs.
+###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
+###     (image) The page/image.
+###     (page_table) The PageTable of the CBR file the page is from, to use it's shared palette (SHARED_PALETTE).
+###     --> Returns a [Tuple] (image to save, file extension, description of the format chosen, encoded Bytes or None)
+def chooseAutoFormat(all_the_data, image, page_table = None):
+    if 'A' in image.getbands() or 'transparency' in image.info:
+        return image, PNG[1], 'PNG (Transparent)', None
+    
+    # Shrink the page and drop the lowest bits of each color so noise doesn't count as more colors.
+    scale = min(1, AUTO_SAMPLE_SIZE / max(image.size))
+    sample = image.convert('RGB').resize((max(1, round(image.width * scale)), max(1, round(image.height * scale))), Image.Resampling.NEAREST)
+    sample = sample.point(lambda value: value & 0xF8)
+    sample_bytes = sample.tobytes()
+    grayscale = sample_bytes[0::3] == sample_bytes[1::3] == sample_bytes[2::3]
+    
+    color_counts = sorted((count for count, _ in sample.getcolors(sample.width * sample.height)), reverse=True)
+    total_pixels = sample.width * sample.height
+    key_colors = AUTO_KEY_COLORS // 4 if grayscale else AUTO_KEY_COLORS
+    key_coverage = sum(color_counts[:key_colors]) / total_pixels
+    
+    photo_image = image.convert('L' if grayscale else 'RGB')
+    image_formats = Image.registered_extensions()
+    photo_choices = [
+        (photo_image, photo_format[1], f'{image_formats[photo_format[1]]} ({"Grayscale" if grayscale else "Color"}, Photographic)')
+        for photo_format in AUTO_PHOTO_FORMATS if image_formats.get(photo_format[1]) in Image.SAVE
+    ] or [(photo_image, JPG[1], f'JPEG ({"Grayscale" if grayscale else "Color"}, Photographic)')]
+    if key_coverage < AUTO_PHOTO_COVERAGE:
+        if len(photo_choices) == 1:
+            return (*photo_choices[0], None)
+        return chooseSmallestFormat(all_the_data, photo_choices, page_table)
+    
+    # Fewest colors that cover the page well enough.
+    for palette_colors in (2, 4, 16, 256):
+        if sum(color_counts[:palette_colors]) / total_pixels >= AUTO_PALETTE_COVERAGE:
+            break
+    
+    if page_table and (all_the_data.get(IMAGE_SAVING_PARAMS) or {}).get(SHARED_PALETTE):
+        flat_image = applySharedPalette(all_the_data, page_table, image, PNG[1])
+        flat_choice = (flat_image, PNG[1], 'PNG (Shared Palette, Line-Art)')
+    else:
+        flat_image = image.convert('RGB').quantize(palette_colors, method=Image.Quantize.FASTOCTREE)
+        flat_choice = (flat_image, PNG[1], f'PNG ({palette_colors} Colors, Line-Art)')
+    if key_coverage >= AUTO_LINE_ART_COVERAGE:
+        return (*flat_choice, None)
+    
+    return chooseSmallestFormat(all_the_data, [flat_choice, *photo_choices], page_table)
+
+
+### Encode a page every way it may be saved and choose the smallest (CHANGE_IMAGE_FORMAT : AUTO). The first is
+### chosen if there's a tie.
+###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
+###     (choices) A List of Tuples (image to save, file extension, description of the format).
+###     (page_table) The PageTable of the CBR file the page is from.
+###     --> Returns a [Tuple] (image to save, file extension, description of the format chosen, encoded Bytes)
+def chooseSmallestFormat(all_the_data, choices, page_table = None):
+    encoded_choices = [(*choice, encodePage(all_the_data, choice[0], choice[1], page_table)) for choice in choices]
+    return min(encoded_choices, key=lambda encoded_choice: len(encoded_choice[3]))
+
+
+### Map a page to the palette shared by all pages of it's CBR file (SHARED_PALETTE) if it's to be saved as a GIF or PNG.
+### Each pixel is simply given the nearest color in the palette (no dithering), much faster than making a new palette.
+###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
+###     (page_table) The PageTable of the CBR file the page is from.
+###     (image) The page/image.
+###     (file_ext) File extension of the format the page will be saved as.
+###     --> Returns a [Image] with the shared palette, or the same image if not to be saved with a palette or transparent
+def applySharedPalette(all_the_data, page_table, image, file_ext):
+    if (not (all_the_data.get(IMAGE_SAVING_PARAMS) or {}).get(SHARED_PALETTE) or
+        (file_ext.lower() not in GIF and file_ext.lower() not in PNG) or
+        'A' in image.getbands() or 'transparency' in image.info):
+            return image
+    return image.convert('RGB').quantize(palette=getSharedPalette(all_the_data, page_table, image), dither=Image.Dither.NONE)
+
+
+### Get the palette shared by all pages of a CBR file (SHARED_PALETTE). It's made the first time it's needed from pages
+### spread evenly across the CBR file (PALETTE_SAMPLE_PAGES), each shrunk and stacked into one image quantized once.
+###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
+###     (page_table) The PageTable of the CBR file.
+###     (image) The page/image being saved, always sampled.
+###     --> Returns a [Image] with only a palette worth using
+def getSharedPalette(all_the_data, page_table, image):
+    if page_table.palette is None:
+        colors = all_the_data[IMAGE_SAVING_PARAMS][SHARED_PALETTE]
+        colors = 256 if colors is True else max(2, min(int(colors), 256))
+        
+        other_images = [page_image for page_image in (all_the_data.get(IMAGE_DATA) or {}).values() if page_image is not image]
+        step = max(1, len(other_images) // (PALETTE_SAMPLE_PAGES - 1))
+        sample_images = [image] + other_images[::step][:PALETTE_SAMPLE_PAGES - 1]
+        
+        samples = Image.new('RGB', (PALETTE_SAMPLE_SIZE, PALETTE_SAMPLE_SIZE * len(sample_images)))
+        for sample_index, sample_image in enumerate(sample_images):
+            sample = sample_image.convert('RGB').resize((PALETTE_SAMPLE_SIZE, PALETTE_SAMPLE_SIZE), Image.Resampling.BILINEAR, reducing_gap=2.0)
+            samples.paste(sample, (0, PALETTE_SAMPLE_SIZE * sample_index))
+        page_table.palette = samples.quantize(colors, method=Image.Quantize.MEDIANCUT)
+    
+    return page_table.palette
+
+
+### A page is finished (saved, not saved, combined into another page or failed), record it and update the progress.
+###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
+###     (page_table) The PageTable of the CBR file the page is from.
+###     (cbr_file_path) A Path to a CBR file.
+###     (page_index) Index of a page.
+###     --> Returns a [Dictionary] run log record of the page
+def finishPage(all_the_data, page_table, cbr_file_path, page_index):
+    all_the_data[LOG_DATA][RUN_COUNTERS].pages_done += 1
+    record = getPageRecord(page_table, cbr_file_path, page_index)
+    writeRunLog(all_the_data, record)
+    progress.update()
+    return record
+
+
+### Extract, edit and encode the pages of a CBR file held in memory, without reading or writing any files.
+### The same options (preset) are used as for pages saved to files and each page is only encoded when
+### it's asked for. Pages that failed to encode are given with None instead of bytes (see "save_error").
+### Each slice of a page sliced (SLICE_TALL_PAGES) is given separately. Example: page number '5_2' with "slice" 2
+### Example: for page_number, page_bytes, metadata in iterEncodedPages(cbr_bytes, preset_options[0]): ...
+###     (archive) The CBR file as Bytes or a file-like object opened in binary mode.
+###     (preset) A preset (see preset_options) or the selected preset if None.
+###     (archive_name) File name of the CBR file, used in file names (INSERT_FILE_NAME) and logs.
+###     (run_log) A RunLog to write the records of this CBR file to, kept in memory if None.
+###     --> Yields a [Tuple] (page number String, Bytes, metadata Dictionary)
+def iterEncodedPages(archive, preset = None, archive_name = 'archive.cbr', run_log = None):
+    if preset is None:
+        preset = preset_options[selected_preset]
+    all_the_data = changePreset({option : value for option, value in preset.items() if option not in (LOG_DATA, IMAGE_DATA)}, {})
+    all_the_data[LOG_DATA][RUN_LOG] = run_log or RunLog()
+    counters = all_the_data[LOG_DATA][RUN_COUNTERS]
+    keep_file_paths_intact = all_the_data.get(KEEP_FILE_PATHS_INTACT, True)
+    slice_height = all_the_data.get(SLICE_TALL_PAGES)
+    format_change = all_the_data.get(CHANGE_IMAGE_FORMAT)
+    auto_format = format_change == AUTO
+    
+    cbr_file_path = Path(archive_name)
+    all_the_data[LOG_DATA][ARCHIVES_IN_MEMORY][cbr_file_path] = archive
+    all_the_data = preparePageData(cbr_file_path, all_the_data)
+    all_the_data = extractPages(all_the_data, cbr_file_path)
+    all_the_data = modifyPages(all_the_data, cbr_file_path)
+    
+    page_table = all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path]
+    page_images = all_the_data[IMAGE_DATA]
+    
+    counter = 1
+    for page_index in list(page_images):
+        image = page_images.pop(page_index)
+        page_number = getPageNumberString(page_index, page_table.combines)
+        
+        archived_file_path = page_table.getPagePath(page_index)
+        if not keep_file_paths_intact:
+            archived_file_path = Path(archived_file_path.name)
+        counters.pages_saved += 1
+        
+        file_ext = None
+        auto_bytes = None
+        if auto_format:
+            image, file_ext, page_table.save_formats[page_index], auto_bytes = chooseAutoFormat(all_the_data, image, page_table)
+        else:
+            image = applySharedPalette(all_the_data, page_table, image, format_change[1] if format_change else archived_file_path.suffix)
+        
+        # Tall pages may be encoded as multiple slices, each given like a page of it's own.
+        encoded_slices = []
+        for slice_box in getPageSlices(image, slice_height):
+            slice_number = len(encoded_slices) + 1 if slice_box else 0
+            file_path = createFilePathFrom(all_the_data, cbr_file_path, archived_file_path, '', page_number, counter, slice_number)
+            if file_ext:
+                file_path = file_path.with_suffix(file_ext)
+            counter += 1
+            slice_image = image.crop(slice_box) if slice_box else image
+            
+            try:
+                timer = startStage(TIME_SAVE, cbr_file_path, page_index)
+                if auto_bytes is not None and not slice_box:
+                    page_bytes = auto_bytes
+                else:
+                    page_bytes = encodePage(all_the_data, slice_image, file_path.suffix, page_table)
+                stopStage(page_table, TIME_SAVE, timer, cbr_file_path, page_index)
+                counters.bytes_written += len(page_bytes)
+                error = None
+            except (OSError, ValueError, KeyError) as err:
+                page_bytes = None
+                error = f'Failed To Encode Page/Image: {err}'
+                printMessage(error, SHOW_ERRORS)
+                counters.save_errors += 1
+            
+            encoded_slices.append((slice_number, file_path.as_posix(), page_bytes, slice_image.size, error))
+        
+        page_table.save_paths[page_index] = encoded_slices[0][1]
+        if len(encoded_slices) > 1:
+            page_table.slices[page_index] = [encoded_slice[1] for encoded_slice in encoded_slices]
+        errors = [encoded_slice[4] for encoded_slice in encoded_slices if encoded_slice[4]]
+        if errors:
+            page_table.setSaveDetail(page_index, SAVE_ERROR, errors[0])
+        else:
+            page_table.setSaveDetail(page_index, ENCODED)
+        record = finishPage(all_the_data, page_table, cbr_file_path, page_index)
+        
+        for slice_number, file_path, page_bytes, size, error in encoded_slices:
+            metadata = dict(record, save_path=file_path, width=size[0], height=size[1], mode=image.mode)
+            if slice_number:
+                metadata['slice'] = slice_number
+                yield f'{page_number}{SLICE_SEPARATOR}{slice_number}', page_bytes, metadata
+            else:
+                yield page_number, page_bytes, metadata
+    
+    # Pages that failed extraction or were combined into other pages are finished now too.
+    for page_index in page_table.page_indexes:
+        if page_index not in page_table.save_paths:
+            finishPage(all_the_data, page_table, cbr_file_path, page_index)
+    
+    page_table.processed = True
+    counters.archives_done += 1
+    closeRunLog(all_the_data)
+
+
+### Encode a page/image in memory the same way it would be saved to a file.
+###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
+###     (image) The page/image to encode.
+###     (file_ext) File extension of the image format to encode to. Example: '.jpg'
+###     (page_table) The PageTable of the CBR file the page is from, to start fitting a target file size where the last page did.
+###     --> Returns a [Bytes]
+def encodePage(all_the_data, image, file_ext, page_table = None):
+    image_format = Image.registered_extensions().get(file_ext.lower())
+    if not image_format:
+        raise ValueError(f'Unknown image format: "{file_ext}"')
+    params = getMultiSizeParams(image, file_ext, getExtraSaveImageParams(all_the_data, file_ext))
+    
+    target_size = getTargetFileSize(all_the_data, image)
+    if target_size and image_format in TARGET_SIZE_SETTINGS:
+        return encodeToFileSize(image, image_format, params, target_size, page_table)
+    
+    buffer = io.BytesIO()
+    image.save(buffer, format=image_format, **params)
+    return buffer.getvalue()
 
 
-### Start saving all the pages already extracted and edited as image files.
-###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
-###     (cbr_file_path) A Path to a CBR file.
+### Add every size of a page to the image saving parameters of formats saved in multiple sizes (ICO, ICNS), so
+### they are made from one resolution pyramid (see buildImagePyramid) instead of each from the full page.
+###     (image) The page/image to save.
+###     (file_ext) File extension of the image format to save as.
+###     (params) Image saving parameters (see getExtraSaveImageParams).
 ###     --> Returns a [Dictionary]
-def savePages(all_the_data, cbr_file_path):
-    page_meta_data = all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_META_DATA]
-    overwrite_files = all_the_data.get(OVERWRITE_FILES, False)
-    keep_file_paths_intact = all_the_data.get(KEEP_FILE_PATHS_INTACT, True)
-    page_images = all_the_data.get(IMAGE_DATA)
+def getMultiSizeParams(image, file_ext, params):
+    file_ext = file_ext.lower()
     
-    next_dir = 0
-    counter = 1
-    for page_index, image in page_images.items():
-        #print(f'{page_index} : {image}')
-        
-        ## TODO: Check if file has been saved already or errored
-        ##       def savePage() for single page saves, retry saves for individual file overwriting
-        ##       if file re-edited, mark not saved
-        
-        archived_file_path = page_meta_data[page_index][META_FILE_PATH]
-        if not keep_file_paths_intact:
-            archived_file_path = Path(archived_file_path.name)
-        
-        # Get directory path to save files in and create any directories that don't already exist
-        default_save_dir = ROOT_DIR
-        save_dir_paths = all_the_data.get(SAVE_DIR_PATH, default_save_dir)
-        if save_dir_paths == '':
-            save_dir_paths = ROOT_DIR
-        save_dir_paths = MakeList(save_dir_paths)
+    if file_ext in ICO:
+        # Like Pillow, sizes larger than the page or 256 are left out. Pages smaller than every size are saved at their own size.
+        max_width, max_height = min(image.width, 256), min(image.height, 256)
+        sizes = [size for size in params.get('sizes', ICO_SIZES) if size[0] <= max_width and size[1] <= max_height]
+        if not sizes:
+            sizes = [(max_width, max_height)]
+        frames = buildImagePyramid(image, sizes)
+        return {**params, 'sizes' : [frame.size for frame in frames], 'append_images' : frames}
+    
+    if file_ext in ICN:
+        return {**params, 'append_images' : buildImagePyramid(image, ICNS_SIZES, False)}
+    
+    return params
+
+
+### Make every size of an image saved in multiple sizes, largest first, each made from the nearest larger size
+### already made instead of from the full image. The image is first halved (a fast box filter) until it's less
+### than twice the size needed, then resized the rest of the way with a high quality filter.
+###     (image) The page/image.
+###     (sizes) A List of sizes, Tuples (width, height).
+###     (keep_aspect_ratio) Fit each size within (width, height) if True, else stretch to exactly (width, height).
+###     --> Returns a [List] of Images
+def buildImagePyramid(image, sizes, keep_aspect_ratio = True):
+    if image.mode not in ('L', 'LA', 'RGB', 'RGBA'):
+        image = image.convert('RGBA')
+    
+    frames = []
+    level = image
+    for size in sorted(set(sizes), key=lambda size: size[0] * size[1], reverse=True):
+        while level.width >= size[0] * 2 and level.height >= size[1] * 2:
+            level = level.reduce(2)
         
-        save_dir_path = save_dir_paths[next_dir]
-        if next_dir < len(save_dir_paths)-1:
-            next_dir += 1
+        if keep_aspect_ratio:
+            frame = level.copy()
+            frame.thumbnail(size, Image.Resampling.LANCZOS, reducing_gap=None)
         else:
-            next_dir = 0
+            frame = level.resize(size, Image.Resampling.LANCZOS)
+        frames.append(frame)
         
-        if save_dir_path:
-            save_to_directory_path = Path(save_dir_path)
-            if not Path.exists(save_to_directory_path):
-                save_to_directory_path = MakeDirectories(default_save_dir, save_dir_path)
+        # Smaller sizes are made from this one, unless it was made larger.
+        if frame.width <= level.width and frame.height <= level.height:
+            level = frame
+    
+    return frames
+
+
+### Get the largest size in bytes a page may be saved as (MAX_FILE_SIZE, MAX_BYTES_PER_MEGAPIXEL), at least 1 byte
+### so a target is never taken as no target.
+###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
+###     (image) The page/image to save.
+###     --> Returns a [Int] or None if there is no target file size
+def getTargetFileSize(all_the_data, image):
+    extra_image_saving_params = all_the_data.get(IMAGE_SAVING_PARAMS) or {}
+    max_file_size = extra_image_saving_params.get(MAX_FILE_SIZE)
+    max_bytes_per_megapixel = extra_image_saving_params.get(MAX_BYTES_PER_MEGAPIXEL)
+    
+    target_sizes = []
+    if max_file_size:
+        target_sizes.append(max(1, int(max_file_size)))
+    if max_bytes_per_megapixel:
+        target_sizes.append(max(1, int(max_bytes_per_megapixel * image.width * image.height / 1_000_000)))
+    
+    return min(target_sizes) if target_sizes else None
+
+
+### Encode an image with the highest quality (or most colors) that fits a target file size. The settings tried
+### (TARGET_SIZE_SETTINGS) are searched starting from the setting the last page of the CBR file used, then in growing
+### steps until the best setting is passed and a binary search between, so similar pages only take one or two tries.
+### If no setting fits, the smallest file is used.
+###     (image) The page/image to encode.
+###     (image_format) Image format to encode to, one in TARGET_SIZE_SETTINGS.
+###     (params) Image saving parameters (see getExtraSaveImageParams), QUALITY is the best setting tried.
+###     (target_size) Largest file size in bytes.
+###     (page_table) The PageTable of the CBR file the page is from, or None to start from the best setting.
+###     --> Returns a [Bytes]
+def encodeToFileSize(image, image_format, params, target_size, page_table = None):
+    param, settings = TARGET_SIZE_SETTINGS[image_format]
+    best_setting = params.get(param)
+    if type(best_setting) == int:
+        settings = [setting for setting in settings if setting <= best_setting] if param == 'quality' else [setting for setting in settings if setting >= best_setting]
+        settings = settings or [best_setting]
+    encoded = {}
+    
+    def fits(setting_index):
+        if setting_index not in encoded:
+            buffer = io.BytesIO()
+            if param == 'colors':
+                reduceColors(image, settings[setting_index]).save(buffer, format=image_format, **params)
+            else:
+                image.save(buffer, format=image_format, **{**params, param : settings[setting_index]})
+            encoded[setting_index] = buffer.getvalue()
+        return len(encoded[setting_index]) <= target_size
+    
+    # The first setting that fits is somewhere between low and high (or high is the last setting if none fit).
+    low, high = 0, len(settings) - 1
+    setting_index = min(page_table.encode_settings.get(image_format, 0) if page_table else 0, high)
+    step = 1
+    if fits(setting_index):
+        high = setting_index
+        while low < high:
+            setting_index = max(low, high - step)
+            if not fits(setting_index):
+                low = setting_index + 1
+                break
+            high = setting_index
+            step *= 2
+    else:
+        low = setting_index + 1
+        while low < high:
+            setting_index = min(high, low + step - 1)
+            if fits(setting_index):
+                high = setting_index
+                break
+            low = setting_index + 1
+            step *= 2
+        low = min(low, high)
+    
+    while low < high:
+        setting_index = (low + high) // 2
+        if fits(setting_index):
+            high = setting_index
         else:
-            save_to_directory_path = MakeDirectories(default_save_dir, cbr_file.stem)
-        
-        # Get all page numbers if pages combined
-        combined_page_log = all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_EDITS_MADE][COMBINE_PAGES].get(page_index)
-        if type(combined_page_log) == list:
-            page_number = getCombinedPageNumbers({ page_index : combined_page_log })
+            low = setting_index + 1
+    
+    if not fits(high):
+        printMessage(f'- Warning: Page could not be made smaller than {target_size:,} bytes, {len(encoded[high]):,} bytes instead.', SHOW_ERRORS)
+    if page_table:
+        page_table.encode_settings[image_format] = high
+    
+    return encoded[high]
+
+
+### Reduce the colors of a page to a palette, keeping any transparency.
+###     (image) The page/image.
+###     (colors) Number of colors (2-256) or None to keep all colors.
+###     --> Returns a [Image]
+def reduceColors(image, colors):
+    if colors is None:
+        return image
+    if 'A' in image.getbands() or 'transparency' in image.info:
+        return image.convert('RGBA').quantize(colors, method=Image.Quantize.FASTOCTREE)
+    return image.convert('RGB').quantize(colors, method=Image.Quantize.FASTOCTREE)
+
+
+### Log two pages combined and how they were combined and if they have been combined with other pages already combined.
+###     (combine_log) A Dictionary log of all pages combined.
+###     (page_index_one) Index of the first page, the page the second page is combined into.
+###     (page_index_two) Index of the second page.
+###     (layout_direction) Layout the pages were combined in, HORIZONTAL or VERTICAL.
+###     --> Returns a [Dictionary]
+def logCombinedPages(combine_log, page_index_one, page_index_two, layout_direction):
+    combine_first_page_log = combine_log.get(page_index_one)
+    combine_second_page_log = combine_log.get(page_index_two)
+    
+    if combine_first_page_log:
+        if combine_second_page_log:
+            combine_first_page_log.append( ({page_index_two : combine_second_page_log.copy()}, layout_direction) )
         else:
-            page_number = f'{page_index+1}'
-        #print(f'page_number: {page_number}')
-        
-        save_file_path = createFilePathFrom(all_the_data, cbr_file_path, archived_file_path, save_to_directory_path, page_number, counter)
-        counter += 1
-        
-        all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_SAVE_PATHS][page_index] = save_file_path
-        
-        print(f'Saving Page: {save_file_path}')
-        
-        if overwrite_files and save_file_path.exists():
-            try:
-                save_file_path.unlink(missing_ok=True) # Delete
-            except OSError as err:
-                print(err)
-            #all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_SAVE_PATHS][page_index] = [save_file_path, OVERWRITTEN]
-            all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_SAVE_DETAILS][page_index] = OVERWRITTEN
-        elif not overwrite_files and save_file_path.exists():
-            #all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_SAVE_PATHS][page_index] = [save_file_path, NOT_SAVED]
-            all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_SAVE_DETAILS][page_index] = NOT_SAVED
+            combine_first_page_log.append((page_index_two, layout_direction))
+    else:
+        if combine_second_page_log:
+            combine_log[page_index_one] = [({page_index_two : combine_second_page_log.copy()}, layout_direction)]
         else:
-            #all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_SAVE_PATHS][page_index] = [save_file_path, NEW_SAVE]
-            all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_SAVE_DETAILS][page_index] = NEW_SAVE
-        
-        try:
-            params = getExtraSaveImageParams(all_the_data, save_file_path.suffix)
-            image.save(save_file_path, **params)
-            error = None
-        except (OSError, ValueError) as err:
-            error = f'Failed To Save Page/Image: {err}'
-            print(error)
-            #all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_SAVE_PATHS][page_index][1] = SAVE_ERROR
-            all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_SAVE_DETAILS][page_index] = error
-        
-        #all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_SAVE_DETAILS][page_index] = error
+            combine_log[page_index_one] = [(page_index_two, layout_direction)]
     
-    return all_the_data
+    combine_log[page_index_two] = page_index_one
+    
+    return combine_log
+
+
+### Get the page number of a page to be saved. If other pages were combined into it, all page numbers are included.
+###     (page_index) Index of a page.
+###     (combine_log) A Dictionary log of all pages combined.
+###     --> Returns a [String]
+def getPageNumberString(page_index, combine_log):
+    combined_page_log = combine_log.get(page_index)
+    if type(combined_page_log) == list:
+        page_number = getCombinedPageNumbers({ page_index : combined_page_log })
+    else:
+        page_number = f'{page_index+1}'
+    return page_number
 
 
 ### Get all page numberss combined as a string.
@@ -906,19 +3233,23 @@ def getCombinedPageNumbers(combined_page_log):
     return page_number
 
 
-### Create a full file Path from an extracted page/image file. Format change are made here as well as
-### creating new directories along new Path.
+### Create a full file Path from an extracted page/image file. Format change are made here, but the
+### directories along the new Path are only created when first listed (see getDirectoryListing).
 ###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
 ###     (cbr_file_path) A Path to a CBR file.
 ###     (archived_file_path) The local file path within the archive file.
 ###     (root_save_path) The full root Path to where the file is to be saved.
 ###     (page_number) Page Number.
 ###     (counter) Incrementing number counter.
+###     (slice_number) Number of the slice if the page is sliced (SLICE_TALL_PAGES), else 0.
 ###     --> Returns a [Path]
-def createFilePathFrom(all_the_data, cbr_file_path, archived_file_path, root_save_path, page_number, counter = 0):
+def createFilePathFrom(all_the_data, cbr_file_path, archived_file_path, root_save_path, page_number, counter = 0, slice_number = 0):
     format_change = all_the_data.get(CHANGE_IMAGE_FORMAT)
     modify_file_names = all_the_data.get(MODIFY_FILE_NAMES)
     
+    if slice_number:
+        page_number = f'{page_number}{SLICE_SEPARATOR}{slice_number}'
+    
     if modify_file_names:
         file_name = ''
         for text in modify_file_names:
@@ -936,25 +3267,132 @@ def createFilePathFrom(all_the_data, cbr_file_path, archived_file_path, root_sav
     else:
         file_name = archived_file_path.stem
     
+    # Each slice needs a file name of it's own even without a page number or counter in the file name.
+    if slice_number and not (modify_file_names and (INSERT_PAGE_NUMBER in modify_file_names or INSERT_COUNTER in modify_file_names)):
+        file_name += f'{SLICE_SEPARATOR}{slice_number}'
+    
     if format_change:
         file_ext = format_change[1]
     else:
         file_ext = archived_file_path.suffix
     
-    # Create file path and make sub-directories if necessary.
-    root_save_path = MakeDirectories(root_save_path, archived_file_path.parents)
-    save_file_path = Path(PurePath().joinpath(root_save_path, f'{file_name}{file_ext}'))
+    # Create file path, including any sub-directories.
+    save_file_path = Path(PurePath().joinpath(root_save_path, archived_file_path.parent, f'{file_name}{file_ext}'))
     
     return save_file_path
 
 
+### Get the Path of the PDF file all pages of a CBR file are saved to (CHANGE_IMAGE_FORMAT : PDF), in the first directory
+### pages are to be saved in and named like a page would be, with the CBR file name as the page name. If that leaves
+### no name (MODIFY_FILE_NAMES only inserting page numbers), the CBR file name is used.
+###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
+###     (cbr_file_path) A Path to a CBR file.
+###     --> Returns a [Path]
+def getPDFFilePath(all_the_data, cbr_file_path):
+    save_dir_path = getSaveDirectoryPaths(all_the_data, cbr_file_path)[0]
+    pdf_file_path = createFilePathFrom(all_the_data, cbr_file_path, Path(cbr_file_path.name), save_dir_path, '', 1)
+    if not pdf_file_path.name[:-len(PDF[1])].strip(' ._-'):
+        pdf_file_path = pdf_file_path.with_name(f'{cbr_file_path.stem}{PDF[1]}')
+    return pdf_file_path
+
+
+### Get the full Paths of every directory pages are to be saved in (SAVE_DIR_PATH), in order. Relative
+### paths that don't already exist are placed in this script's root directory.
+###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
+###     (cbr_file_path) A Path to a CBR file.
+###     --> Returns a [List]
+def getSaveDirectoryPaths(all_the_data, cbr_file_path):
+    save_dir_paths = []
+    
+    for save_dir_path in MakeList(all_the_data.get(SAVE_DIR_PATH)) or [None]:
+        if save_dir_path == '':
+            save_dir_path = ROOT_DIR
+        
+        if not save_dir_path:
+            save_to_directory_path = Path(PurePath().joinpath(ROOT_DIR, cbr_file_path.stem))
+        elif Path(save_dir_path).is_absolute() or Path(save_dir_path).exists():
+            save_to_directory_path = Path(save_dir_path)
+        else:
+            # Relative paths may be written with Windows or Unix separators.
+            sub_dirs = [sub_dir for sub_dir in re.split(r'[\\/]+', str(save_dir_path)) if sub_dir not in ('', '.')]
+            save_to_directory_path = Path(PurePath().joinpath(ROOT_DIR, *sub_dirs))
+        
+        save_dir_paths.append(save_to_directory_path)
+    
+    return save_dir_paths
+
+
+### Get the names of all files already in a directory pages are to be saved in. The directory, and any
+### parent directories, are created the first time it's listed and the listing is kept so every page
+### saved after doesn't have to check the file system again.
+###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
+###     (directory_path) A Path to a directory.
+###     --> Returns a [Set]
+def getDirectoryListing(all_the_data, directory_path):
+    directory_listings = all_the_data[LOG_DATA][SAVE_DIR_LISTINGS]
+    file_names = directory_listings.get(directory_path)
+    
+    if file_names is None:
+        try:
+            directory_path.mkdir(mode=0o777, parents=True, exist_ok=True)
+        except OSError as err:
+            printMessage(err, SHOW_ERRORS)
+        file_names = ListFileNames(directory_path)
+        directory_listings[directory_path] = file_names
+    
+    return file_names
+
+
+### Change the file extension of a page's save path (CHANGE_IMAGE_FORMAT : AUTO) once it's format is chosen, checking
+### the new path for conflicts with other pages planned (see planSavePaths) like the planned path was.
+###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
+###     (cbr_file_path) A Path to a CBR file.
+###     (page_index) Index of the page.
+###     (save_file_path) The Path the page was planned to be saved to.
+###     (file_ext) File extension of the format chosen.
+###     --> Returns a [Path]
+def replanSavePath(all_the_data, cbr_file_path, page_index, save_file_path, file_ext):
+    new_save_file_path = save_file_path.with_suffix(file_ext)
+    if new_save_file_path == save_file_path:
+        return save_file_path
+    page_table = all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path]
+    planned_save_paths = all_the_data[LOG_DATA][PLANNED_SAVE_PATHS]
+    
+    planned_by = planned_save_paths.get(new_save_file_path)
+    if planned_by and planned_by != (cbr_file_path, page_index):
+        if all_the_data.get(RESOLVE_NAME_CONFLICTS, False):
+            new_save_file_path = getUnusedFilePath(new_save_file_path, planned_save_paths)
+            printMessage(f'File Name Conflict: Page {page_index+1} will be saved as "{new_save_file_path.name}" instead.', SHOW_ERRORS)
+        else:
+            printMessage(f'File Name Conflict: Page {page_index+1} and page {planned_by[1]+1} of "{planned_by[0].name}" will both be saved to: {new_save_file_path}', SHOW_ERRORS)
+    
+    if planned_save_paths.get(save_file_path) == (cbr_file_path, page_index):
+        del planned_save_paths[save_file_path]
+    planned_save_paths[new_save_file_path] = (cbr_file_path, page_index)
+    page_table.planned_paths.append(new_save_file_path)
+    return new_save_file_path
+
+
+### Get a file Path that no other page has planned to be saved to, by adding an incrementing number to the file name.
+###     (save_file_path) A Path to a file that's already planned.
+###     (planned_save_paths) A Dictionary of all save Paths already planned.
+###     --> Returns a [Path]
+def getUnusedFilePath(save_file_path, planned_save_paths):
+    number = 2
+    new_save_file_path = save_file_path
+    while new_save_file_path in planned_save_paths:
+        new_save_file_path = save_file_path.with_name(f'{save_file_path.stem} ({number}){save_file_path.suffix}')
+        number += 1
+    return new_save_file_path
+
+
 ### Get any extra image saving parameters to use before finally saving an image file.
 ###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
 ###     (format) Format or extension of image file to be saved.
 ###     --> Returns a [Dictionary]
 def getExtraSaveImageParams(all_the_data, format):
     save_params = {}
-    extra_image_saving_params = all_the_data.get(IMAGE_SAVING_PARAMS, {})
+    extra_image_saving_params = all_the_data.get(IMAGE_SAVING_PARAMS) or {}
     compress_min, compress_max = 1, 9
     param_presets = ['keep', 'web_low', 'web_medium', 'web_high', 'web_very_high',
                      'web_maximum', 'low', 'medium', 'high', 'maximum']
@@ -973,7 +3411,7 @@ def getExtraSaveImageParams(all_the_data, format):
             elif type(value) == int:
                 save_params['quality'] = value
             else: # Defaults
-                print(f'- Warning: Unknown "Quality" value used: "{value}", default value used instead.')
+                printMessage(f'- Warning: Unknown "Quality" value used: "{value}", default value used instead.', SHOW_ERRORS)
                 if format in WEB:
                     save_params['quality'] = 80
                 else:
@@ -984,7 +3422,7 @@ def getExtraSaveImageParams(all_the_data, format):
                 save_params['qtables'] = value
             elif format in JPG: # Default
                 save_params['qtables'] = param_presets[0]
-                print(f'- Warning: Unknown JPEG "Quantization Table" preset value used: "{value}"')
+                printMessage(f'- Warning: Unknown JPEG "Quantization Table" preset value used: "{value}"', SHOW_ERRORS)
             #else: # ignore entirely
         
         elif param == SUBSAMPLING:
@@ -994,7 +3432,7 @@ def getExtraSaveImageParams(all_the_data, format):
                     save_params['subsampling'] = value
             elif format in JPG: # Default
                 save_params['subsampling'] = param_presets[0]
-                print(f'- Warning: Unknown JPEG "Subsampling" value used: "{value}"')
+                printMessage(f'- Warning: Unknown JPEG "Subsampling" value used: "{value}"', SHOW_ERRORS)
             # else ignore entirely
         
         elif param == OPTIMIZE:
@@ -1014,14 +3452,14 @@ def getExtraSaveImageParams(all_the_data, format):
                 if type(value) == list and type(value[0]) == tuple and type(value[0][0]) == int:
                     save_params['sizes'] = value
                 else: # Default: [(16,16), (24,24), (32,32), (48,48), (64,64), (128,128), (256,256)]
-                    print(f'- Warning: Unknown ICO List "Sizes" used: "{value}", default sizes used instead.')
+                    printMessage(f'- Warning: Unknown ICO List "Sizes" used: "{value}", default sizes used instead.', SHOW_ERRORS)
         
         elif param == COMPRESSION:
             if format in BMP:
                 if value in [1,2]:
                     save_params['compression'] = value
                 else: # Default
-                    print(f'- Warning: Unknown BMP "Compression" value used: "{value}", default value used instead.')
+                    printMessage(f'- Warning: Unknown BMP "Compression" value used: "{value}", default value used instead.', SHOW_ERRORS)
                     save_params['compression'] = 1
             elif format in PNG:
                 if type(value) == int and value < compress_min:
@@ -1031,12 +3469,122 @@ def getExtraSaveImageParams(all_the_data, format):
                 elif type(value) == int:
                     save_params['compress_level'] = value
                 else: # Default
-                    print(f'- Warning: Unknown PNG "Compression" value used: "{value}", default value used instead.')
+                    printMessage(f'- Warning: Unknown PNG "Compression" value used: "{value}", default value used instead.', SHOW_ERRORS)
                     save_params['compress_level'] = 6
     
     return save_params
 
 
+### Compile the pages to select, in any of the ways pages can be selected, into a PageSelection. This is
+### done once per CBR file so every stage after can check if a page was selected in constant time.
+###     (pages) Pages to select, a Range of Pages = (1,-1), Specific Pages = [1,3,6,-1], One Page = 3,
+###             or a String of selection terms separated by commas (see getPageSelectionTerm).
+###     (total_pages) Total number of pages in a CBR.
+###     --> Returns a [PageSelection]
+def compilePageSelection(pages, total_pages):
+    page_selection = PageSelection(total_pages)
+    
+    if not total_pages:
+        return page_selection
+    
+    if pages:
+        
+        if type(pages) == tuple: # Range of Pages
+            page_selection.add(getAllPageIndexesFromRange(total_pages, pages[0], pages[1]))
+        
+        elif type(pages) == list: # Specific Pages
+            for page_number in pages:
+                if type(page_number) == int and page_number != 0 and page_number <= total_pages and page_number >= -total_pages:
+                    page_selection.add([getPageIndex(total_pages, page_number)])
+                else:
+                    printMessage(f'Specific page #{page_number} is out of bounds and will be disregarded.', SHOW_ERRORS)
+        
+        elif type(pages) == int: # Single Page
+            page_selection.add(getAllPageIndexesFromRange(total_pages, None, pages))
+        
+        elif type(pages) == str: # Selection Terms
+            pages_to_remove = []
+            for term in pages.split(','):
+                term = term.strip().lower()
+                if not term:
+                    continue
+                if term[:1] == '!':
+                    pages_to_remove.append(getPageSelectionTerm(term[1:].strip(), total_pages))
+                else:
+                    page_selection.add(getPageSelectionTerm(term, total_pages))
+            for page_indexes in pages_to_remove:
+                page_selection.remove(page_indexes)
+        
+        else:
+            printMessage(f'ERROR: "{pages}" are not proper page numbers.', SHOW_ERRORS)
+    
+    else: # All Pages
+        page_selection.add(range(total_pages))
+    
+    return page_selection
+
+
+re_page_number_term = re.compile(r'^-?\d+$')
+re_page_range_term = re.compile(r'^(\d+)\s*-\s*(\d+)$')
+re_page_slice_term = re.compile(r'^(-?\d*)\s*:\s*(-?\d*)$')
+re_every_nth_page_term = re.compile(r'^every\s+(\d+)(?:st|nd|rd|th)?(?:\s+from\s+(-?\d+))?$')
+
+### Get the page indexes of one page selection term.
+###   Terms:  '7' or '-1'         One page, negative numbers count backwards from the last page.
+###           '1-5'               Range of pages.
+###           '-3:-1', '10:', ':5' Range of pages where either number can be negative or left blank (first/last page).
+###           'odd', 'even'       Every odd or even page.
+###           'every 4th'         Every fourth page (4,8,12...). Use 'every 4th from 1' to start on another page (1,5,9...).
+###           'all', 'first', 'last'
+###           '!term'             Any term starting with "!" removes those pages from the selection. Example: 'all, !1, !-1'
+###     (term) A page selection term (lower case, no surrounding spaces).
+###     (total_pages) Total number of pages in a CBR.
+###     --> Returns a [Range] or [List]
+def getPageSelectionTerm(term, total_pages):
+    
+    if re_page_number_term.match(term):
+        page_number = int(term)
+        if page_number != 0 and -total_pages <= page_number <= total_pages:
+            return [getPageIndex(total_pages, page_number)]
+        printMessage(f'Specific page #{page_number} is out of bounds and will be disregarded.', SHOW_ERRORS)
+        return []
+    
+    page_range = re_page_range_term.match(term) or re_page_slice_term.match(term)
+    if page_range:
+        page_start = int(page_range.group(1)) if page_range.group(1) not in ('', '-') else 1
+        page_end = int(page_range.group(2)) if page_range.group(2) not in ('', '-') else -1
+        # Page 0 is the first page, a start of 0 would otherwise be taken as no start (just the end page).
+        page_start = page_start or 1
+        return getAllPageIndexesFromRange(total_pages, page_start, page_end)
+    
+    every_nth_page = re_every_nth_page_term.match(term)
+    if every_nth_page:
+        step = max(int(every_nth_page.group(1)), 1)
+        if every_nth_page.group(2):
+            page_number = int(every_nth_page.group(2))
+            if not -total_pages <= page_number <= total_pages:
+                printMessage(f'First page #{page_number} is out of bounds and "{term}" will be disregarded.', SHOW_ERRORS)
+                return []
+            first_page_index = getPageIndex(total_pages, page_number)
+        else:
+            first_page_index = step - 1
+        return range(max(first_page_index, 0), total_pages, step)
+    
+    if term == 'odd':
+        return range(0, total_pages, 2)
+    elif term == 'even':
+        return range(1, total_pages, 2)
+    elif term == 'all':
+        return range(total_pages)
+    elif term == 'first':
+        return range(min(1, total_pages))
+    elif term == 'last':
+        return range(max(total_pages-1, 0), total_pages)
+    
+    printMessage(f'ERROR: Page selection "{term}" is not a proper page selection and will be disregarded.', SHOW_ERRORS)
+    return []
+
+
 ### Return a List of all page numbers from a range of numbers or just one number. If any numbers falls
 ### outside of the total range of pages (total_pages) they will be forced in bounds. If both page_start
 ### and page_end are left blank then all pages will be returned.
@@ -1105,15 +3653,30 @@ def getPageIndex(total_pages, page_number, keep_inbounds = True):
 ###     (height_change) A Tuple with specific data on how to modify the height of an image.
 ###     (keep_aspect_ratio) Keep aspect ratio only if one size, width or height, has changed.
 ###     (resample) Resampling filter to use while modifying an Image.
+###     (org_size) The original size (width, height) of the page if it was decoded at a reduced scale.
 ###     --> Returns a [Image]
-def resizeImage(image, width_change, height_change, keep_aspect_ratio = True, resample = NEAREST):
+def resizeImage(image, width_change, height_change, keep_aspect_ratio = True, resample = NEAREST, org_size = None):
     if resample == BILINEAR:  resample = Image.Resampling.BILINEAR
     elif resample == BICUBIC: resample = Image.Resampling.BICUBIC
     else:                     resample = Image.Resampling.NEAREST
     
     if width_change or height_change:
-        new_width, new_height = ModifyImageSize((image.width, image.height), (width_change, height_change), keep_aspect_ratio)
-        image = image.resize((new_width, new_height), resample=resample, box=None, reducing_gap=None)
+        new_width, new_height = ModifyImageSize(org_size or (image.width, image.height), (width_change, height_change), keep_aspect_ratio)
+        
+        if image.height < TALL_PAGE_HEIGHT or image.mode in ('1', 'P'):
+            image = image.resize((new_width, new_height), resample=resample, box=None, reducing_gap=None)
+        
+        else:
+            # Tall pages are resized in bands of rows (the same result as all at once) so only one band
+            # is being resized in memory at a time, instead of all the rows of an already huge page.
+            resized_image = Image.new(image.mode, (new_width, new_height))
+            resized_image.info = image.info.copy()
+            scale = image.height / new_height
+            for top in range(0, new_height, BAND_HEIGHT):
+                bottom = min(top + BAND_HEIGHT, new_height)
+                band = image.resize((new_width, bottom - top), resample=resample, box=(0, top * scale, image.width, bottom * scale))
+                resized_image.paste(band, (0, top))
+            image = resized_image
     
     return image
 
@@ -1178,6 +3741,133 @@ def rotatePage(image, angle = 0, resample = NEAREST):
     return image
 
 
+### Open the run log (see RunLog) that records everything done in this run as it happens.
+###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
+###     (run_log_path) Path of the JSON lines log file.
+###     --> Returns a [RunLog]
+def openRunLog(all_the_data, run_log_path = None, append = False):
+    if all_the_data[LOG_DATA].get(RUN_LOG):
+        all_the_data[LOG_DATA][RUN_LOG].close()
+    
+    if not run_log_path:
+        run_log_path = Path(PurePath().joinpath(ROOT_DIR, f'{Path(__file__).stem}__log.jsonl'))
+    
+    run_log = RunLog(run_log_path, append)
+    all_the_data[LOG_DATA][RUN_LOG] = run_log
+    run_log.write({
+        'record' : 'run',
+        'started' : datetime.now().isoformat(timespec='seconds'),
+        'description' : all_the_data.get(DESCRIPTION, '')
+    })
+    
+    return run_log
+
+
+### Write a record to the run log, opening the run log first if needed. Nothing is written if log file creation is turned off.
+###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
+###     (record) A Dictionary.
+###     --> Returns a [None]
+def writeRunLog(all_the_data, record):
+    if not create_log_file:
+        return None
+    run_log = all_the_data[LOG_DATA].get(RUN_LOG)
+    if not run_log:
+        run_log = openRunLog(all_the_data)
+    run_log.write(record)
+    return None
+
+
+### Finish and close the run log.
+###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
+###     --> Returns a [Path] to the run log or None if there is no run log
+def closeRunLog(all_the_data):
+    run_log = all_the_data[LOG_DATA].get(RUN_LOG)
+    if not run_log:
+        return None
+    run_log.write({
+        'record' : 'end',
+        'ended' : datetime.now().isoformat(timespec='seconds'),
+        'description' : all_the_data.get(DESCRIPTION, ''),
+        'counters' : all_the_data[LOG_DATA][RUN_COUNTERS].asDict()
+    })
+    run_log.close()
+    all_the_data[LOG_DATA][RUN_LOG] = None
+    return run_log.path
+
+
+### Create the run log record of a finished page.
+###     (page_table) The PageTable of the CBR file the page is from.
+###     (cbr_file_path) A Path to a CBR file.
+###     (page_index) Index of a page.
+###     --> Returns a [Dictionary]
+def getPageRecord(page_table, cbr_file_path, page_index):
+    record = {
+        'record' : 'page',
+        'cbr' : str(cbr_file_path),
+        'page' : page_index+1,
+        'file' : page_table.page_names[page_index]
+    }
+    
+    # Note: There are 2 extraction methods, both must fail to be considered an "error".
+    if page_table.failedExtraction(page_index):
+        record['extract_errors'] = page_table.extract_errors[page_index]
+    
+    elif page_index in page_table.save_paths:
+        record['save_path'] = page_table.save_paths[page_index]
+        record['saved'] = SAVE_DETAIL_NAMES.get(page_table.save_details[page_index])
+        if page_index in page_table.save_errors:
+            record['save_error'] = page_table.save_errors[page_index]
+    
+    elif type(page_table.combines.get(page_index)) == int:
+        # Save path is the one of the final page combined with.
+        final_page_combined = page_table.combines[page_index]
+        while type(page_table.combines.get(final_page_combined)) == int:
+            final_page_combined = page_table.combines[final_page_combined]
+        record['combined_into'] = final_page_combined+1
+        record['save_path'] = page_table.save_paths.get(final_page_combined)
+    
+    if page_index in page_table.save_formats:
+        record['format'] = page_table.save_formats[page_index]
+    if page_index in page_table.slices:
+        record['slices'] = page_table.slices[page_index]
+    if page_index in page_table.resizes:
+        record['resize'] = page_table.resizes[page_index]
+    if page_index in page_table.rotations:
+        record['rotate'] = page_table.rotations[page_index]
+    
+    pages_combined = page_table.combines.get(page_index)
+    if type(pages_combined) == int:
+        record['combine'] = f'[ Page {pages_combined+1} & {page_index+1} ]'
+    elif pages_combined:
+        record['combine'] = getAllPagesCombined(pages_combined, f'[ Page {page_index+1} & ')
+    
+    edit_errors = page_table.edit_errors.get(page_index)
+    if edit_errors:
+        record['edit_errors'] = {EDIT_NAMES[error_code] : error for error_code, error in edit_errors.items()}
+        if type(edit_errors.get(COMBINE_PAGES)) == int:
+            # Failed combine, the error is counted on the other page.
+            combine_error_page = edit_errors[COMBINE_PAGES]
+            record['edit_errors']['combine'] = page_table.edit_errors.get(combine_error_page, {}).get(COMBINE_PAGES)
+            record['combine_error_page'] = combine_error_page+1
+    
+    if page_index in page_table.page_times:
+        record['times'] = {TIMED_STAGES[stage] : [round(wall, 6), round(cpu, 6)] for stage, (wall, cpu) in page_table.page_times[page_index].items()}
+    
+    return record
+
+
+### Read the records of a run log one at a time. A record only partly written (this script stopped mid-write) is skipped.
+###     (run_log_path) Path of a JSON lines log file.
+###     --> Yields a [Dictionary]
+def readRunLog(run_log_path):
+    with open(run_log_path, 'r', encoding='utf-8') as run_log_file:
+        for line in run_log_file:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
 ### Create log file for all CBR page/images created.
 ###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
 ###     (log_file_path) Path of a log file.
@@ -1185,15 +3875,42 @@ def rotatePage(image, angle = 0, resample = NEAREST):
 def createLogFile(all_the_data, log_file_path = None):
     log_file_created = False
     log_data = all_the_data.get(LOG_DATA)
-    save_msg = {NOT_SAVED:'Not Saved', NEW_SAVE : 'New Save', OVERWRITTEN : 'Overwritten'}
     
     if log_data:
-        page_files_extracted, page_extract_errors, page_files_saved, page_edit_errors, page_save_errors = getLogNumbers(all_the_data)
+        page_files_saved, page_edit_errors = getLogNumbers(all_the_data)[2:4]
     else:
         print('\nNo CBR page log data found.')
         return False
     
     # Print general details of CBR page created
+    print('\n'+'\n'.join(getLogHeader(log_data[RUN_COUNTERS].asDict())))
+    
+    run_log_path = closeRunLog(all_the_data)
+    
+    # Only create a log file when pages are saved or errors happened.
+    if page_files_saved + page_edit_errors == 0:
+        return False
+    
+    if create_log_file and run_log_path:
+        
+        if not log_file_path:
+            log_file_name = f'{Path(__file__).stem}__log.txt'
+            log_file_path = Path(PurePath().joinpath(ROOT_DIR, log_file_name))
+        
+        log_file_created = createTextReport(run_log_path, log_file_path)
+    
+    else:
+        print('Log file creation turned off.')
+    
+    return log_file_created
+
+
+### Create the general details at the top of a log file.
+###     (counters) A Dictionary of run counters (see RunCounters).
+###     --> Returns a [List] of Strings
+def getLogHeader(counters):
+    page_files_extracted, page_extract_errors = counters['pages_to_extract'], counters['extract_errors']
+    page_files_saved, page_edit_errors, page_save_errors = counters['pages_saved'], counters['edit_errors'], counters['save_errors']
     text_lines = []
     text_lines.append('=================================')
     text_lines.append('= Auto Page Extract, Edit, Save =')
@@ -1206,134 +3923,178 @@ def createLogFile(all_the_data, log_file_path = None):
     if page_save_errors:
         text_lines.append(f'- Total Pages Not Saved Due To Errors: {page_save_errors}')
     if page_edit_errors:
-        text_lines.append(f'- Total Pages That Failed Editing*: {page_edit_errors}')
+        text_lines.append(f'- Total Page Edits That Failed*: {page_edit_errors}')
         text_lines.append('*If an error happens while editing a page, it still keeps it\'s previous edits and can still be saved.')
+    text_lines.append(f'- Total Read: {getSizeString(counters["bytes_read"])}  Written: {getSizeString(counters["bytes_written"])}')
+    return text_lines
+
+
+### Get a number of bytes as a short readable String. Example: 1536 --> '1.5 KB'
+###     (size) Number of bytes.
+###     --> Returns a [String]
+def getSizeString(size):
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            break
+        size /= 1024
+    return f'{size:.0f} {unit}' if unit == 'B' else f'{size:.1f} {unit}'
+
+
+### Create a human-readable log file from a run log. The run log is read twice, first to total everything up
+### and find the slowest pages, then to write each page's details straight to the log file.
+###     (run_log_path) Path of a JSON lines log file.
+###     (log_file_path) Path of the log file to create.
+###     --> Returns a [Path] to the log file created or False
+def createTextReport(run_log_path, log_file_path):
+    counted = RunCounters().asDict()
+    counters = None
+    stage_totals = {stage_name : [0.0, 0.0] for stage_name in TIMED_STAGES.values()}
+    archive_totals = {}
+    slowest_pages = []
+    desc = ''
     
-    print_text_lines = text_lines.copy()
-    print('\n'+'\n'.join(print_text_lines))
+    # First Pass: Totals
+    try:
+        for record in readRunLog(run_log_path):
+            record_type = record.get('record')
+            if record_type in ('run', 'end'):
+                desc = record.get('description') or desc
+                counters = record.get('counters', counters)
+            
+            elif record_type == 'page':
+                # Only used if the run log has no "end" record (this script stopped mid-run).
+                counted['pages_to_extract'] += 1
+                counted['extract_errors'] += 'extract_errors' in record
+                counted['pages_saved'] += 'saved' in record
+                counted['save_errors'] += 'save_error' in record
+                counted['edit_errors'] += len(record.get('edit_errors', {})) - ('combine_error_page' in record)
+                if 'times' in record:
+                    page_wall = sum(times[0] for times in record['times'].values())
+                    page_cpu = sum(times[1] for times in record['times'].values())
+                    slowest_stage = max(record['times'].items(), key=lambda stage: stage[1][0])[0]
+                    page = (page_wall, page_cpu, record['page'], slowest_stage, record['cbr'])
+                    if len(slowest_pages) < SLOWEST_PAGES_LOGGED:
+                        heapq.heappush(slowest_pages, page)
+                    else:
+                        heapq.heappushpop(slowest_pages, page)
+            
+            elif record_type == 'archive_done':
+                archive_wall = archive_cpu = 0.0
+                for stage_name, (wall, cpu) in record.get('times', {}).items():
+                    stage_totals.setdefault(stage_name, [0.0, 0.0])
+                    stage_totals[stage_name][0] += wall
+                    stage_totals[stage_name][1] += cpu
+                    archive_wall += wall
+                    archive_cpu += cpu
+                archive_totals[record['cbr']] = (archive_wall, archive_cpu)
     
-    # Only create a log file when pages are saved or errors happened.
-    if page_files_saved + page_edit_errors == 0:
+    except OSError as error:
+        print(f'\nCouldn\'t read run log due to {type(error).__name__}: {type(error).__doc__}')
+        print(f'{error}\n')
         return False
     
-    if create_log_file:
-        
-        if not log_file_path:
-            log_file_name = f'{Path(__file__).stem}__log.txt'
-            log_file_path = Path(PurePath().joinpath(ROOT_DIR, log_file_name))
-        
-        desc = all_the_data.get(DESCRIPTION)
-        if desc and desc != '':
-            text_lines.append('\nDescription of the preset used to extract, edit, and save page files:')
-            text_lines.append(f'  {desc}')
-        
-        base_arrow = '----> '
-        
-        for cbr_file_path, page_data in log_data[PAGE_DATA].items():
-            #text_lines.append('\nCBR File Path')
-            #text_lines.append(f'  {cbr_file_path}')
-            text_lines.append(f'\nCBR File --> {cbr_file_path}')
+    # Second Pass: Write Log File
+    try:
+        with open(log_file_path, 'w', encoding='utf-8', errors='strict') as log_file:
             
-            page_extract_errors = page_data.get(PAGE_EXTRACT_ERRORS, {})
-            page_save_paths = page_data.get(PAGE_SAVE_PATHS, {})
-            page_edit_errors = page_data.get(PAGE_EDIT_ERRORS, {})
-            page_save_details = page_data.get(PAGE_SAVE_DETAILS, {})
-            page_edits_made = page_data.get(PAGE_EDITS_MADE, {})
+            def writeLines(text_lines):
+                log_file.write('\n'.join(text_lines) + '\n')
             
-            pages_resized_width = page_edits_made.get(CHANGE_WIDTH, {})
-            pages_resized_height = page_edits_made.get(CHANGE_HEIGHT, {})
-            pages_rotated = page_edits_made.get(ROTATE_PAGES, {})
-            pages_combined = page_edits_made.get(COMBINE_PAGES, {})
+            writeLines(getLogHeader(counters or counted))
             
-            for page_index in page_data[PAGE_INDEXES]:
-                
-                #arrow = base_arrow[len(str(page_index)):]
-                page_str = f'{page_index+1}'
-                arrow = base_arrow[len(page_str):]
-                indentation = '          '
-                indentation += '    '[:len(str(page_index))]
-                #indentation += '---'
-                edit_errors = page_edit_errors.get(page_index, {})
-                
-                # Check For Extract Page Errors
-                # Note: There are 2 extraction methods, both must fail to be considered an "error".
-                pee = page_extract_errors.get(page_index, [])
-                if len(pee) > 1:
-                    text_lines.append(f'    Page {page_str} {arrow}[EXTRACTION ERRORS] {" | ".join([str(e) for e in pee])}')
-                    continue
-                
-                # Page Number and File Path
-                if type(page_save_details.get(page_index, 0)) != int:
-                    # Error, Not Saved
-                    text_lines.append(f'    Page {page_str} {arrow}[ERROR] {page_save_details[page_index]}')
-                
-                else:
-                    # Saved
-                    if page_index in page_save_paths:
-                        page_save_details_str = save_msg[page_save_details[page_index]]
-                        text_lines.append(f'    Page {page_str} {arrow}[{page_save_details_str}] {page_save_paths[page_index]}')
-                    else:
-                        final_page_combined = page_index
-                        final_page_combined_str = ''
-                        if page_index in pages_combined:
-                            final_page_combined_index = pages_combined[page_index]
-                            while type(final_page_combined_index) == int:
-                                final_page_combined = final_page_combined_index
-                                final_page_combined_index = pages_combined[final_page_combined_index]
-                            final_page_combined_str = f'(Page {final_page_combined+1}) '
-                        
-                        # Save Path points to final page combined with.
-                        final_page = page_save_paths.get(final_page_combined, 'File Path Missing')
-                        text_lines.append(f'    Page {page_str} {arrow}{final_page_combined_str}{final_page}')
-                
-                # Page Resize
-                if CHANGE_WIDTH not in edit_errors or CHANGE_HEIGHT not in edit_errors:
-                    if page_index in pages_resized_width or page_index in pages_resized_height:
-                        org_size = f'{pages_resized_width[page_index][0]} x {pages_resized_height[page_index][0]}'
-                        new_size = f'{pages_resized_width[page_index][1]} x {pages_resized_height[page_index][1]}'
-                        text_lines.append(f'{indentation}{arrow}   Page Size Changed From: [ {org_size} -to- {new_size} ]')
-                else:
-                    error_data = edit_errors.get(CHANGE_WIDTH)
-                    error_data = error_data if error_data else edit_errors.get(CHANGE_HEIGHT)
-                    text_lines.append(f'{indentation}{arrow}   ERROR: {error_data}')
-                
-                # Page Rotation
-                if ROTATE_PAGES not in edit_errors:
-                    if page_index in pages_rotated:
-                        degrees = pages_rotated[page_index]
-                        text_lines.append(f'{indentation}{arrow}   Page Rotated: [ {degrees} Degrees ]')
-                else:
-                    text_lines.append(f'{indentation}{arrow}   ERROR: {edit_errors[ROTATE_PAGES]}')
+            if desc:
+                writeLines(['\nDescription of the preset used to extract, edit, and save page files:', f'  {desc}'])
+            
+            writeLines(getTimeSummary(stage_totals, sorted(slowest_pages, reverse=True)))
+            
+            base_arrow = '----> '
+            cbr_file_path = None
+            for record in readRunLog(run_log_path):
                 
-                # Page Combines
-                if COMBINE_PAGES not in edit_errors:
-                    if page_index in pages_combined:
-                        other_page_index = pages_combined[page_index]
-                        if type(other_page_index) == int:
-                            pages_combined_str = f'[ Page {other_page_index+1} & {page_str} ]'
-                        else:
-                            pages_combined_str = f'[ Page {page_str} & '
-                            all_pages_combined_with_this_page_index = pages_combined.get(page_index, [])
-                            pages_combined_str = getAllPagesCombined(all_pages_combined_with_this_page_index, pages_combined_str)
-                        
-                        text_lines.append(f'{indentation}{arrow}   Pages Combined: {pages_combined_str}')
-                else:
-                    text_lines.append(f'{indentation}{arrow}   ERROR: {edit_errors[COMBINE_PAGES]}')
+                if record.get('record') == 'page':
+                    
+                    # Pages are logged one CBR file at a time.
+                    if record['cbr'] != cbr_file_path:
+                        cbr_file_path = record['cbr']
+                        text_lines = [f'\nCBR File --> {cbr_file_path}']
+                        if cbr_file_path in archive_totals:
+                            archive_wall, archive_cpu = archive_totals[cbr_file_path]
+                            text_lines.append(f'  Time Spent: {archive_wall:.3f}s (CPU {archive_cpu:.3f}s)')
+                        writeLines(text_lines)
+                    
+                    page_str = f'{record["page"]}'
+                    arrow = base_arrow[len(page_str):]
+                    indentation = '          ' + '    '[:len(str(record['page']-1))]
+                    writeLines(getPageReportLines(record, page_str, arrow, indentation))
         
-        # Write Log File
-        try:
-            log_file_path.write_text('\n'.join(text_lines), encoding='utf-8', errors='strict')
-            log_file_created = log_file_path # return log file path
-        except (OSError, UnicodeError, ValueError) as error:
-            print(f'\nCouldn\'t save log file due to {type(error).__name__}: {type(error).__doc__}')
-            print(f'{error}\n')
+        log_file_created = log_file_path # return log file path
     
-    else:
-        print('Log file creation turned off.')
+    except (OSError, UnicodeError, ValueError) as error:
+        print(f'\nCouldn\'t save log file due to {type(error).__name__}: {type(error).__doc__}')
+        print(f'{error}\n')
+        log_file_created = False
     
     return log_file_created
 
 
+### Create the lines of a log file for one page.
+###     (record) A "page" record from a run log.
+###     (page_str) Page number as a String.
+###     (arrow) Arrow pointing from the page number to the details.
+###     (indentation) Indentation of the lines under the page number.
+###     --> Returns a [List] of Strings
+def getPageReportLines(record, page_str, arrow, indentation):
+    text_lines = []
+    edit_errors = record.get('edit_errors', {})
+    
+    # Check For Extract Page Errors
+    if 'extract_errors' in record:
+        text_lines.append(f'    Page {page_str} {arrow}[EXTRACTION ERRORS] {" | ".join(record["extract_errors"])}')
+        return text_lines
+    
+    # Page Number and File Path
+    if 'save_error' in record:
+        # Error, Not Saved
+        text_lines.append(f'    Page {page_str} {arrow}[ERROR] {record["save_error"]}')
+    elif record.get('saved'):
+        # Saved
+        text_lines.append(f'    Page {page_str} {arrow}[{record["saved"]}] {record["save_path"]}')
+    else:
+        # Save Path points to final page combined with.
+        final_page_combined_str = f'(Page {record["combined_into"]}) ' if 'combined_into' in record else ''
+        text_lines.append(f'    Page {page_str} {arrow}{final_page_combined_str}{record.get("save_path") or "File Path Missing"}')
+    
+    # Page Resize
+    resize_error = edit_errors.get('width') or edit_errors.get('height')
+    if resize_error:
+        text_lines.append(f'{indentation}{arrow}   ERROR: {resize_error}')
+    elif 'resize' in record:
+        org_width, org_height, new_width, new_height = record['resize']
+        text_lines.append(f'{indentation}{arrow}   Page Size Changed From: [ {org_width} x {org_height} -to- {new_width} x {new_height} ]')
+    
+    # Page Rotation
+    if 'rotate' in edit_errors:
+        text_lines.append(f'{indentation}{arrow}   ERROR: {edit_errors["rotate"]}')
+    elif 'rotate' in record:
+        text_lines.append(f'{indentation}{arrow}   Page Rotated: [ {record["rotate"]} Degrees ]')
+    
+    # Page Combines
+    if 'combine' in edit_errors:
+        text_lines.append(f'{indentation}{arrow}   ERROR: {edit_errors["combine"]}')
+    elif 'combine' in record:
+        text_lines.append(f'{indentation}{arrow}   Pages Combined: {record["combine"]}')
+    
+    # Format Chosen
+    if 'format' in record:
+        text_lines.append(f'{indentation}{arrow}   Format Chosen: {record["format"]}')
+    
+    # Page Slices
+    if 'slices' in record:
+        text_lines.append(f'{indentation}{arrow}   Page Sliced Into {len(record["slices"])} Images: {record["slices"][0]} ... {record["slices"][-1]}')
+    
+    return text_lines
+
+
 ### Create string showing all pages combined for use in log file.
 ###     (all_pages_combined_list) List of pages combined and the layout direction.
 ###     (pages_combined_str) String added to log file that shows all pages combined.
@@ -1351,33 +4112,73 @@ def getAllPagesCombined(all_pages_combined_list, pages_combined_str):
     return pages_combined_str
 
 
+### Create the lines of the log file that show the total time spent in each stage and the slowest pages.
+###     (stage_totals) A Dictionary {stage name : [wall_seconds, cpu_seconds]}
+###     (slowest_pages) A List of the slowest pages [(wall_seconds, cpu_seconds, page number, slowest stage name, cbr file path), ...]
+###     --> Returns a [List] of Strings
+def getTimeSummary(stage_totals, slowest_pages):
+    text_lines = []
+    total_wall = sum(times[0] for times in stage_totals.values())
+    total_cpu = sum(times[1] for times in stage_totals.values())
+    
+    text_lines.append('\nTime Spent In Each Stage (Wall Clock / CPU):')
+    for stage_name, (wall, cpu) in stage_totals.items():
+        if wall or cpu:
+            percent = f'{wall / total_wall:.1%}' if total_wall else '-'
+            text_lines.append(f'  {stage_name + ":":<17} {wall:>9.3f}s / {cpu:>9.3f}s  ({percent})')
+    text_lines.append(f'  {"Total:":<17} {total_wall:>9.3f}s / {total_cpu:>9.3f}s')
+    
+    if slowest_pages:
+        text_lines.append(f'\nSlowest Pages (Wall Clock / CPU):')
+        for wall, cpu, page_number, slowest_stage, cbr_file_path in slowest_pages:
+            text_lines.append(f'  {wall:>9.3f}s / {cpu:>9.3f}s  Page {page_number} ({slowest_stage} Mostly) --> {cbr_file_path}')
+    
+    return text_lines
+
+
 ### Get the overall log numbers on how many pages have been extracted, edited, and saved as well as any errors.
 ###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
 ###     --> Returns a [Integer] x 5
 def getLogNumbers(all_the_data):
-    page_files_extracted = 0
-    page_extract_errors = 0
-    page_files_saved = 0
-    page_edit_errors = 0
-    page_save_errors = 0
-    for cbr_file_path in cbr_file_paths:
-        page_files_extracted += len(all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_INDEXES])
-        page_files_saved += len(all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_SAVE_PATHS])
-        for details in all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_SAVE_DETAILS].values():
-            page_save_errors += 1 if type(details) != int else 0
-        for error in all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_EDIT_ERRORS].values():
-            page_edit_errors += 1 if error else 0 ## TODO: each COMBINE_PAGES error gets added twice. fix?
-        for error in all_the_data[LOG_DATA][PAGE_DATA][cbr_file_path][PAGE_EXTRACT_ERRORS].values():
-            page_extract_errors += 1 if len(error) > 1 else 0
+    counters = all_the_data[LOG_DATA][RUN_COUNTERS]
+    return counters.pages_to_extract, counters.extract_errors, counters.pages_saved, counters.edit_errors, counters.save_errors
+
+
+### Print the overall totals of pages extracted, edited, and saved as well as any errors.
+###     (all_the_data) A Dictionary of all the details on how to handle CBR files and logs of everthing done so far.
+###     --> Returns a [None]
+def printTotals(all_the_data):
+    counters = all_the_data[LOG_DATA][RUN_COUNTERS]
+    page_files_extracted, page_extract_errors, page_files_saved, page_edit_errors, page_save_errors = getLogNumbers(all_the_data)
     
-    return page_files_extracted, page_extract_errors, page_files_saved, page_edit_errors, page_save_errors
+    print(f'\nTotal Pages Extracted: {page_files_extracted}')
+    print(f'Total Pages Failed To Extract: {page_extract_errors}')
+    print(f'Total Pages Saved: {page_files_saved-page_save_errors}')
+    print(f'Total Pages Not Saved Due To Errors: {page_save_errors}')
+    print(f'Total Page Edits That Failed*: {page_edit_errors}')
+    print('*If an error happens while editing a page, it still keeps it\'s previous edits and can still be saved.')
+    print(f'Total Read: {getSizeString(counters.bytes_read)}  Written: {getSizeString(counters.bytes_written)}')
+    return None
+
+
+### Stop the script gracefully (like Ctrl+C) when asked to terminate, so logs are still created.
+###     --> Returns a [None]
+def stopOnTerminate(signal_number, frame):
+    raise KeyboardInterrupt
 
 
-### Open a log file for viewing.
+### Open a log file for viewing with the default app of the operating system (or show where it is if there isn't one).
 ###     (log_file_path) Path to a log file.
 ###     --> Returns a [None]
 def openLogFile(log_file_path):
-    OpenFile(log_file_path)
+    if sys.platform == 'win32':
+        os.startfile(log_file_path)
+        return None
+    opener = 'open' if sys.platform == 'darwin' else 'xdg-open'
+    if shutil.which(opener):
+        subprocess.Popen([opener, str(log_file_path)], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    else:
+        print(f'Log File: {log_file_path}')
     return None
 
 
@@ -1392,37 +4193,65 @@ if __name__ == '__main__':
     MIN_VERSION_STR = '.'.join([str(n) for n in MIN_VERSION])
     assert sys.version_info >= MIN_VERSION, f'This Script Requires Python v{MIN_VERSION_STR} or Newer'
     
-    paths = sys.argv[1:]
-    if not paths:
+    parser = argparse.ArgumentParser(description='Extract any or all pages of a CBR file, edit them and save them as images.')
+    parser.add_argument('paths', nargs='*', help='CBR files or directories with CBR files.')
+    parser.add_argument('--watch', nargs='+', metavar='DIR', default=watch_directories, help='Watch directories for new CBR files (never waits for input).')
+    parser.add_argument('--poll', type=float, default=watch_poll_interval, help='Seconds between checks for new files when watching.')
+    parser.add_argument('--settle', type=float, default=watch_settle_time, help='Seconds a file must stay unchanged before it\'s processed when watching.')
+    parser.add_argument('--lease-dir', default=lease_directory, help='Directory shared with other workers to claim CBR files in (never waits for input).')
+    parser.add_argument('--lease-expiry', type=float, default=lease_expiry, help='Seconds before a lease not renewed is taken over by another worker.')
+    parser.add_argument('--resume', action='store_true', help='Resume a run that stopped early, skipping CBR files already done (see save_checkpoints).')
+    parser.add_argument('--checkpoint', metavar='PATH', help='Save checkpoints to resume from to this file (see save_checkpoints).')
+    arguments = parser.parse_args()
+    
+    paths = arguments.paths
+    if not paths and not arguments.watch:
         paths = [ROOT_DIR]
     
     all_the_data = changePreset(preset_options[selected_preset])
+    work_leases = WorkLeases(arguments.lease_dir, arguments.lease_expiry) if arguments.lease_dir else None
+    all_the_data[LOG_DATA][WORK_LEASES] = work_leases
+    checkpoint = None
+    if save_checkpoints or arguments.checkpoint or arguments.resume:
+        checkpoint = Checkpoint(arguments.checkpoint or PurePath().joinpath(ROOT_DIR, f'{Path(__file__).stem}__checkpoint.bin'))
+    all_the_data[LOG_DATA][CHECKPOINT] = checkpoint
+    if arguments.resume:
+        try:
+            all_the_data = checkpoint.load(all_the_data)
+        except ValueError as err:
+            sys.exit(f'Can\'t Resume: {err}\nRun again without --resume to start over.')
+    
+    if profile_stages:
+        profiler = registerStageHook(ProfilerHook())
+    if track_allocations:
+        allocations = registerStageHook(AllocationHook())
+    
+    if arguments.watch:
+        signal.signal(signal.SIGTERM, stopOnTerminate)
+        for path in paths:
+            all_the_data = findCBRFiles(path, all_the_data)
+        all_the_data = extractEditSavePages(all_the_data)
+        all_the_data = watchDirectories(all_the_data, arguments.watch, arguments.poll, arguments.settle)
     
-    loop = True
+    loop = not arguments.watch
     while loop:
         
         for path in paths:
             all_the_data = findCBRFiles(path, all_the_data)
         
-        cbr_file_paths = all_the_data[LOG_DATA][CBR_FILE_PATHS]
-        cbr_count = len(cbr_file_paths)
+        counters = all_the_data[LOG_DATA][RUN_COUNTERS]
+        cbr_count = counters.archives_found - counters.archives_done
         if cbr_count:
-            input(f'CBR files found: {cbr_count}, start extracting?')
+            if not work_leases:
+                input(f'CBR files found: {cbr_count}, start extracting?')
             all_the_data = extractEditSavePages(all_the_data)
         else:
             print('\nNo CBR files found.')
         
-        page_files_extracted, page_extract_errors, page_files_saved, page_edit_errors, page_save_errors = getLogNumbers(all_the_data)
-        
-        print(f'\nTotal Pages Extracted: {page_files_extracted}')
-        print(f'Total Pages Failed To Extract: {page_extract_errors}')
-        print(f'Total Pages Saved: {page_files_saved-page_save_errors}')
-        print(f'Total Pages Not Saved Due To Errors: {page_save_errors}')
-        print(f'Total Pages That Failed Editing*: {page_edit_errors}')
-        print('*If an error happens while editing a page, it still keeps it\'s previous edits and can still be saved.')
+        printTotals(all_the_data)
         
-        try_again = loop_script
-        loop = loop_script
+        try_again = loop_script and not work_leases
+        loop = try_again
         while try_again:
             drop = input('\nDrop another CBR file or directory here or leave blank and press [Enter] to create a log file now: ')
             drop = drop.replace('"', '')
@@ -1436,9 +4265,22 @@ if __name__ == '__main__':
             else:
                 print(f'This is not an existing file or directory path: "{drop}"')
     
+    if work_leases:
+        work_leases.close()
+    if checkpoint:
+        checkpoint.remove()
+    
     log_file_created = createLogFile(all_the_data)
     if log_file_created:
         print('--> Check log for more details.')
-        openLogFile(log_file_created)
+        if not arguments.watch and not work_leases:
+            openLogFile(log_file_created)
     else:
         print('No log file necessary.')
+    
+    if profile_stages:
+        stats_path = profiler.saveStats(Path(PurePath().joinpath(ROOT_DIR, f'{Path(__file__).stem}__profile.txt')))
+        print(f'Stage profile saved to: {stats_path}')
+    if track_allocations:
+        stats_path = allocations.saveStats(Path(PurePath().joinpath(ROOT_DIR, f'{Path(__file__).stem}__allocations.txt')))
+        print(f'Stage memory allocations saved to: {stats_path}')
@@ -0,0 +1,545 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+'''
+Pipeline Benchmark for Auto Page Extract, Edit, Save
+
+    Measure how fast each stage of auto_page_extract_edit_save.py runs using synthetic comics created
+    offline (no real CBR files or UnRAR needed). Synthetic pages are drawn with Pillow, packed into CBZ
+    (zip) files, and read through a local stand-in for "rarfile.RarFile" so only this project's own
+    code and Pillow are being timed.
+
+How To Use:
+    python benchmark_pipeline.py
+        Time every stage (preparePageData, planSavePaths, extractPages, modifyPages, savePages and
+        createLogFile) and presets 0-4 end to end. Results are saved as JSON in "benchmark_results".
+    
+    python benchmark_pipeline.py --archives 4 --pages 40 --size 1600x2400 --color-modes RGB,L --png-ratio 0.5
+        Change the synthetic comics created.
+    
+    python benchmark_pipeline.py --cold-starts 10
+        Change how many times a cold start is timed: starting a new Python process, importing
+        auto_page_extract_edit_save and running one small job (a few pages encoded in memory). 0 skips it.
+    
+    python benchmark_pipeline.py --compare old_results.json new_results.json
+        Compare two saved results, showing how much faster or slower each stage got.
+
+Requirements:
+    Pillow - pip install Pillow
+'''
+
+from contextlib import contextmanager, redirect_stdout
+from datetime import datetime
+from pathlib import Path, PurePath
+import argparse
+import io
+import json
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+
+ROOT_DIR = Path(__file__).parent
+sys.path.insert(0, str(ROOT_DIR))
+
+import auto_page_extract_edit_save as apes
+from common_functions import LazyImport
+
+# Not imported until synthetic comics are drawn, so timing a cold start isn't slowed down by this script.
+Image = LazyImport('PIL.Image')
+ImageDraw = LazyImport('PIL.ImageDraw')
+
+DEFAULT_RESULTS_DIR = Path(PurePath().joinpath(ROOT_DIR, 'benchmark_results'))
+
+# Stages timed separately, in the order they run.
+STAGES = ['preparePageData', 'planSavePaths', 'extractPages', 'modifyPages', 'savePages', 'createLogFile']
+
+# Default synthetic comic options.
+default_options = {
+    'archives'    : 3,            # Number of synthetic comics.
+    'pages'       : 24,           # Pages in each comic.
+    'size'        : (1200, 1800), # Page size (width, height).
+    'color_modes' : ['RGB', 'L'], # Color modes of pages, each comic cycles through them.
+    'png_ratio'   : 0.25,         # Ratio of pages saved as PNG instead of JPEG.
+    'repeat'      : 3,            # Times to run each stage, the median time is recorded.
+    'seed'        : 1137,         # Random seed so the same comics are created every time.
+}
+
+# Stage options used when timing each stage separately.
+stage_preset = {
+    apes.DESCRIPTION       : 'Benchmark: all pages, downscale to 1080p, rotate and combine a few, save as JPEG.',
+    apes.PAGES_TO_EXTRACT  : (1,-1),
+    apes.SORT_PAGES_BY     : (apes.ALPHA_NUMBER, apes.ASCENDING),
+    apes.CHANGE_HEIGHT     : (apes.DOWNSCALE, 1080),
+    apes.KEEP_ASPECT_RATIO : True,
+    apes.ROTATE_PAGES      : {2 : 90, -2 : 180},
+    apes.COMBINE_PAGES     : [(apes.HORIZONTAL, 4, 5), (apes.VERTICAL, 6, 7)],
+    apes.RESAMPLING_FILTER : apes.BICUBIC,
+    apes.CHANGE_IMAGE_FORMAT : apes.JPG,
+    apes.IMAGE_SAVING_PARAMS : {apes.QUALITY : 85},
+    apes.OVERWRITE_FILES   : True,
+    apes.KEEP_FILE_PATHS_INTACT : True,
+}
+
+# Options used when timing a cold start, a small job right after starting like a one-off job from another program.
+cold_start_preset = {
+    apes.DESCRIPTION       : 'Benchmark: cold start, downscale to 1080p and encode as JPEG in memory.',
+    apes.CHANGE_HEIGHT     : (apes.DOWNSCALE, 1080),
+    apes.CHANGE_IMAGE_FORMAT : apes.JPG,
+    apes.IMAGE_SAVING_PARAMS : {apes.QUALITY : 85},
+}
+COLD_START_PAGES = 4
+COLD_START_SIZE = (800, 1200)
+DEFAULT_COLD_STARTS = 5
+
+# Run in a new Python process: time importing auto_page_extract_edit_save and then the whole job (import included).
+# Arguments: this script's directory and the synthetic comic to use. Prints [(import wall, cpu), (job wall, cpu)].
+COLD_START_CODE = '''
+import json, sys, time
+wall_start, cpu_start = time.perf_counter(), time.process_time()
+sys.path.insert(0, sys.argv[1])
+import auto_page_extract_edit_save as apes
+import_times = (time.perf_counter() - wall_start, time.process_time() - cpu_start)
+import benchmark_pipeline
+apes.verbosity = apes.SHOW_ERRORS
+with benchmark_pipeline.useZipArchives(), open(sys.argv[2], 'rb') as cbz_file:
+    for page in apes.iterEncodedPages(cbz_file, benchmark_pipeline.cold_start_preset, 'cold_start.cbz'):
+        pass
+print(json.dumps([import_times, (time.perf_counter() - wall_start, time.process_time() - cpu_start)]))
+'''
+
+
+### A stand-in for "rarfile.RarInfo" using a zip archive's "ZipInfo".
+###     (zip_info) A ZipInfo of a file in a zip archive.
+class ZipArchivedFile:
+    __slots__ = ('filename', 'file_size', 'compress_size', 'compress_type', 'date_time', 'CRC', 'host_os', '_is_dir')
+    
+    def __init__(self, zip_info):
+        self.filename = zip_info.filename
+        self.file_size = zip_info.file_size
+        self.compress_size = zip_info.compress_size
+        self.compress_type = zip_info.compress_type
+        self.date_time = zip_info.date_time
+        self.CRC = zip_info.CRC
+        self.host_os = zip_info.create_system
+        self._is_dir = zip_info.is_dir()
+    
+    def is_file(self):
+        return not self._is_dir
+    
+    def is_dir(self):
+        return self._is_dir
+
+
+### A local stand-in for "rarfile.RarFile" that reads zip archives (CBZ files) instead. Also used by the tests,
+### as RAR files can't be made without WinRAR.
+###     (file) Path to a zip archive or a file-like object.
+class ZipRarFile:
+
+    def __init__(self, file, mode = 'r', *args, **kwargs):
+        self.zip_file = zipfile.ZipFile(file, mode='r')
+    
+    def infolist(self):
+        return [ZipArchivedFile(zip_info) for zip_info in self.zip_file.infolist()]
+    
+    def namelist(self):
+        return self.zip_file.namelist()
+    
+    def open(self, name, mode = 'r', pwd = None):
+        return self.zip_file.open(name, mode='r', pwd=pwd)
+    
+    def read(self, name, pwd = None):
+        return self.zip_file.read(name, pwd=pwd)
+    
+    def close(self):
+        self.zip_file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+### While in use, "rarfile.RarFile" (as used by auto_page_extract_edit_save) reads zip archives instead.
+###     --> Yields a [None]
+@contextmanager
+def useZipArchives():
+    rar_file_class = apes.rarfile.RarFile
+    apes.rarfile.RarFile = ZipRarFile
+    try:
+        yield None
+    finally:
+        apes.rarfile.RarFile = rar_file_class
+
+
+### Draw one synthetic page. Pages have a gradient background, some noise, and "panels" with lines
+### so they compress somewhat like real comic pages instead of flat colors.
+###     (size) Page size (width, height).
+###     (color_mode) Color mode of the page, 'RGB' or 'L'.
+###     (rng) A Random number generator.
+###     --> Returns a [Image]
+def drawSyntheticPage(size, color_mode, rng):
+    width, height = size
+    
+    gradient = Image.linear_gradient('L').resize(size)
+    noise = Image.effect_noise(size, rng.randint(8, 40))
+    page = Image.blend(gradient, noise, 0.35)
+    
+    if color_mode == 'RGB':
+        channels = [page.point(lambda value, shift = rng.randint(0, 80): (value + shift) % 256) for _ in range(3)]
+        page = Image.merge('RGB', channels)
+    
+    draw = ImageDraw.Draw(page)
+    panel_rows = rng.randint(2, 4)
+    panel_height = height // panel_rows
+    for row in range(panel_rows):
+        top = row * panel_height + 10
+        draw.rectangle((10, top, width - 10, top + panel_height - 20), outline=0, width=6)
+        for _ in range(rng.randint(5, 20)):
+            points = [(rng.randint(10, width - 10), rng.randint(top, top + panel_height - 20)) for _ in range(2)]
+            draw.line(points, fill=rng.randint(0, 255) if color_mode == 'L' else tuple(rng.randint(0, 255) for _ in range(3)), width=3)
+    
+    return page
+
+
+### Create a synthetic comic, a CBZ file with numbered JPEG and PNG pages.
+###     (cbz_file_path) Path of the CBZ file to create.
+###     (page_count) Number of pages.
+###     (size) Page size (width, height).
+###     (color_mode) Color mode of the pages, 'RGB' or 'L'.
+###     (png_ratio) Ratio of pages saved as PNG instead of JPEG.
+###     (rng) A Random number generator.
+###     --> Returns a [Dictionary] of details about the comic created
+def createSyntheticComic(cbz_file_path, page_count, size, color_mode, png_ratio, rng):
+    comic_name = Path(cbz_file_path).stem
+    bytes_packed = 0
+    png_pages = 0
+    
+    with zipfile.ZipFile(cbz_file_path, 'w', compression=zipfile.ZIP_STORED) as cbz_file:
+        for page_number in range(1, page_count+1):
+            page = drawSyntheticPage(size, color_mode, rng)
+            page_bytes = io.BytesIO()
+            if rng.random() < png_ratio:
+                page.save(page_bytes, 'PNG')
+                ext = '.png'
+                png_pages += 1
+            else:
+                page.save(page_bytes, 'JPEG', quality=90)
+                ext = '.jpg'
+            cbz_file.writestr(f'{comic_name}/Page {page_number}{ext}', page_bytes.getvalue())
+            bytes_packed += page_bytes.tell()
+        cbz_file.writestr(f'{comic_name}/ComicInfo.xml', '<ComicInfo></ComicInfo>')
+    
+    return {
+        'path' : str(cbz_file_path),
+        'pages' : page_count,
+        'png_pages' : png_pages,
+        'size' : list(size),
+        'color_mode' : color_mode,
+        'bytes' : bytes_packed
+    }
+
+
+### Create all synthetic comics.
+###     (work_dir) Directory to create the comics in.
+###     (options) Synthetic comic options (see default_options).
+###     --> Returns a [List] of comic details
+def createSyntheticComics(work_dir, options):
+    rng = random.Random(options['seed'])
+    comics = []
+    for number in range(1, options['archives']+1):
+        color_mode = options['color_modes'][(number-1) % len(options['color_modes'])]
+        cbz_file_path = Path(PurePath().joinpath(work_dir, f'Synthetic Comic {number:03d}.cbz'))
+        comics.append(createSyntheticComic(cbz_file_path, options['pages'], options['size'], color_mode, options['png_ratio'], rng))
+    return comics
+
+
+### Create a fresh copy of a preset that saves everything (including the run log) into a directory and overwrites any files.
+###     (preset) A preset.
+###     (save_dir) Directory to save pages in.
+###     --> Returns a [Dictionary]
+def prepareBenchmarkPreset(preset, save_dir):
+    preset = {option : value for option, value in preset.items() if option != apes.LOG_DATA}
+    preset[apes.SAVE_DIR_PATH] = str(save_dir)
+    preset[apes.OVERWRITE_FILES] = True
+    all_the_data = apes.changePreset(preset, {})
+    Path(save_dir).parent.mkdir(parents=True, exist_ok=True)
+    apes.openRunLog(all_the_data, Path(f'{save_dir}__log.jsonl'))
+    return all_the_data
+
+
+### Time a function call in wall time and CPU time.
+###     (function) Function to call.
+###     (args) Arguments for the function.
+###     --> Returns a [Tuple] (return value, wall seconds, cpu seconds)
+def timeCall(function, *args):
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    return_value = function(*args)
+    return return_value, time.perf_counter() - wall_start, time.process_time() - cpu_start
+
+
+### Run all stages on every synthetic comic, timing each stage separately.
+###     (comics) A List of comic details.
+###     (work_dir) Directory to save pages and logs in.
+###     --> Returns a [Dictionary] {stage : (wall seconds, cpu seconds)}
+def runStages(comics, work_dir):
+    stage_times = {stage : [0.0, 0.0] for stage in STAGES}
+    all_the_data = prepareBenchmarkPreset(stage_preset, Path(PurePath().joinpath(work_dir, 'stages')))
+    cbr_file_paths = [Path(comic['path']) for comic in comics]
+    
+    def addTime(stage, wall, cpu):
+        stage_times[stage][0] += wall
+        stage_times[stage][1] += cpu
+    
+    for cbr_file_path in cbr_file_paths:
+        all_the_data, wall, cpu = timeCall(apes.preparePageData, cbr_file_path, all_the_data)
+        addTime('preparePageData', wall, cpu)
+    
+    for cbr_file_path in cbr_file_paths:
+        all_the_data, wall, cpu = timeCall(apes.planSavePaths, all_the_data, cbr_file_path)
+        addTime('planSavePaths', wall, cpu)
+    
+    for cbr_file_path in cbr_file_paths:
+        for stage, function in (('extractPages', apes.extractPages), ('modifyPages', apes.modifyPages), ('savePages', apes.savePages)):
+            all_the_data, wall, cpu = timeCall(function, all_the_data, cbr_file_path)
+            addTime(stage, wall, cpu)
+        all_the_data[apes.IMAGE_DATA].clear()
+        if all_the_data[apes.LOG_DATA].get(apes.TEMP_DIR):
+            all_the_data[apes.LOG_DATA][apes.TEMP_DIR].cleanup()
+            all_the_data[apes.LOG_DATA][apes.TEMP_DIR] = None
+    
+    log_file_path = Path(PurePath().joinpath(work_dir, 'stages__log.txt'))
+    _, wall, cpu = timeCall(apes.createLogFile, all_the_data, log_file_path)
+    addTime('createLogFile', wall, cpu)
+    
+    return {stage : tuple(times) for stage, times in stage_times.items()}
+
+
+### Run a preset end to end (find, extract, edit, save and log) on every synthetic comic.
+###     (preset) A preset.
+###     (comics) A List of comic details.
+###     (work_dir) Directory to save pages and logs in.
+###     (name) Name of the preset.
+###     --> Returns a [Tuple] (wall seconds, cpu seconds, error message or None)
+def runPreset(preset, comics, work_dir, name):
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    error = None
+    try:
+        all_the_data = prepareBenchmarkPreset(preset, Path(PurePath().joinpath(work_dir, name)))
+        for comic in comics:
+            all_the_data = apes.preparePageData(Path(comic['path']), all_the_data)
+        all_the_data = apes.extractEditSavePages(all_the_data)
+        apes.createLogFile(all_the_data, Path(PurePath().joinpath(work_dir, f'{name}__log.txt')))
+    except Exception as err:
+        error = f'{type(err).__name__}: {err}'
+    return time.perf_counter() - wall_start, time.process_time() - cpu_start, error
+
+
+### Time cold starts, each in a new Python process: importing auto_page_extract_edit_save and a small one CBR file job.
+###     (work_dir) Directory to create the synthetic comic in.
+###     (runs) Number of cold starts.
+###     (seed) Random seed.
+###     --> Returns a [Dictionary] {'import' : summary, 'one_archive_job' : summary}
+def runColdStarts(work_dir, runs, seed):
+    cbz_file_path = Path(PurePath().joinpath(work_dir, 'Cold Start.cbz'))
+    createSyntheticComic(cbz_file_path, COLD_START_PAGES, COLD_START_SIZE, 'RGB', 0.25, random.Random(seed))
+    import_runs = []
+    job_runs = []
+    
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', COLD_START_CODE, str(ROOT_DIR), str(cbz_file_path)],
+            capture_output=True, text=True, check=True
+        ).stdout
+        import_times, job_times = json.loads(output.strip().splitlines()[-1])
+        import_runs.append(tuple(import_times))
+        job_runs.append(tuple(job_times))
+    
+    return {
+        'import' : summarizeTimings(import_runs, 0),
+        'one_archive_job' : summarizeTimings(job_runs, COLD_START_PAGES)
+    }
+
+
+### Summarize repeated (wall, cpu) timings using the median of each.
+###     (timings) A List of (wall seconds, cpu seconds).
+###     (pages) Number of pages processed in each run, to get the time per page.
+###     --> Returns a [Dictionary]
+def summarizeTimings(timings, pages):
+    wall = statistics.median([timing[0] for timing in timings])
+    cpu = statistics.median([timing[1] for timing in timings])
+    return {
+        'wall_s' : round(wall, 6),
+        'cpu_s' : round(cpu, 6),
+        'wall_ms_per_page' : round(wall * 1000 / pages, 4) if pages else None,
+        'runs_wall_s' : [round(timing[0], 6) for timing in timings]
+    }
+
+
+### Run the whole benchmark.
+###     (options) Synthetic comic options (see default_options).
+###     (keep_files) Keep the synthetic comics and saved pages instead of deleting them.
+###     (cold_starts) Number of cold starts to time (see runColdStarts).
+###     --> Returns a [Dictionary] of results
+def runBenchmark(options, keep_files = False, cold_starts = DEFAULT_COLD_STARTS):
+    work_dir = Path(tempfile.mkdtemp(prefix='apes_benchmark_'))
+    
+    print('Creating synthetic comics...')
+    comics = createSyntheticComics(work_dir, options)
+    total_pages = sum(comic['pages'] for comic in comics)
+    
+    results = {
+        'created' : datetime.now().isoformat(timespec='seconds'),
+        'python' : sys.version.split()[0],
+        'pillow' : Image.__version__,
+        'platform' : platform.platform(),
+        'options' : {option : list(value) if type(value) == tuple else value for option, value in options.items()},
+        'comics' : comics,
+        'stages' : {},
+        'presets' : {},
+        'cold_start' : {}
+    }
+    
+    if cold_starts:
+        print('Timing cold starts...')
+        results['cold_start'] = runColdStarts(work_dir, cold_starts, options['seed'])
+    
+    with useZipArchives(), redirect_stdout(io.StringIO()) as quiet:
+        
+        stage_runs = {stage : [] for stage in STAGES}
+        for run in range(options['repeat']):
+            quiet.seek(0)
+            quiet.truncate()
+            for stage, timing in runStages(comics, Path(PurePath().joinpath(work_dir, f'run{run}'))).items():
+                stage_runs[stage].append(timing)
+        for stage in STAGES:
+            results['stages'][stage] = summarizeTimings(stage_runs[stage], total_pages)
+        
+        for preset_number, preset in enumerate(apes.preset_options[:5]):
+            name = f'preset{preset_number}'
+            preset_runs = []
+            errors = []
+            for run in range(options['repeat']):
+                quiet.seek(0)
+                quiet.truncate()
+                wall, cpu, error = runPreset(preset, comics, Path(PurePath().joinpath(work_dir, f'run{run}')), name)
+                preset_runs.append((wall, cpu))
+                if error:
+                    errors.append(error)
+            results['presets'][name] = summarizeTimings(preset_runs, total_pages)
+            results['presets'][name]['description'] = preset.get(apes.DESCRIPTION, '')
+            if errors:
+                results['presets'][name]['errors'] = sorted(set(errors))
+    
+    if keep_files:
+        print(f'Synthetic comics and saved pages kept in: {work_dir}')
+    else:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    
+    return results
+
+
+### Print results as a table.
+###     (results) A Dictionary of results.
+###     --> Returns a [None]
+def printResults(results):
+    print(f'\n{"Stage / Preset":<20} {"Wall (s)":>10} {"CPU (s)":>10} {"ms/page":>10}')
+    for group in ('stages', 'presets', 'cold_start'):
+        for name, timing in results.get(group, {}).items():
+            ms_per_page = f'{timing["wall_ms_per_page"]:>10.3f}' if timing['wall_ms_per_page'] is not None else f'{"-":>10}'
+            print(f'{name:<20} {timing["wall_s"]:>10.4f} {timing["cpu_s"]:>10.4f} {ms_per_page}')
+            for error in timing.get('errors', []):
+                print(f'    ERROR: {error}')
+    return None
+
+
+### Compare two saved results, showing how much each stage and preset sped up or slowed down.
+###     (old_results_path) Path to the older JSON results.
+###     (new_results_path) Path to the newer JSON results.
+###     (threshold) Slow down ratio considered a regression. Example: 0.10 = 10% slower.
+###     --> Returns a [Integer] number of regressions found
+def compareResults(old_results_path, new_results_path, threshold = 0.10):
+    old_results = json.loads(Path(old_results_path).read_text(encoding='utf-8'))
+    new_results = json.loads(Path(new_results_path).read_text(encoding='utf-8'))
+    regressions = 0
+    
+    if old_results.get('options') != new_results.get('options'):
+        print('Warning: These results used different synthetic comic options and may not be comparable.')
+    
+    print(f'\n{"Stage / Preset":<20} {"Old (s)":>10} {"New (s)":>10} {"Change":>9}')
+    for group in ('stages', 'presets', 'cold_start'):
+        for name, new_timing in new_results.get(group, {}).items():
+            old_timing = old_results.get(group, {}).get(name)
+            if not old_timing or not old_timing['wall_s']:
+                print(f'{name:<20} {"-":>10} {new_timing["wall_s"]:>10.4f}')
+                continue
+            change = new_timing['wall_s'] / old_timing['wall_s'] - 1
+            flag = ''
+            if change > threshold:
+                flag = '  <-- SLOWER'
+                regressions += 1
+            print(f'{name:<20} {old_timing["wall_s"]:>10.4f} {new_timing["wall_s"]:>10.4f} {change:>+9.1%}{flag}')
+    
+    return regressions
+
+
+### Get the benchmark options from the command line.
+###     (argv) Command line arguments.
+###     --> Returns a [Namespace]
+def parseArguments(argv):
+    parser = argparse.ArgumentParser(description='Benchmark each stage of Auto Page Extract, Edit, Save using synthetic comics.')
+    parser.add_argument('--archives', type=int, default=default_options['archives'], help='Number of synthetic comics.')
+    parser.add_argument('--pages', type=int, default=default_options['pages'], help='Pages in each comic.')
+    parser.add_argument('--size', default='x'.join(str(n) for n in default_options['size']), help='Page size, WIDTHxHEIGHT.')
+    parser.add_argument('--color-modes', default=','.join(default_options['color_modes']), help='Comma separated color modes: RGB, L.')
+    parser.add_argument('--png-ratio', type=float, default=default_options['png_ratio'], help='Ratio of PNG pages (0-1), the rest are JPEG.')
+    parser.add_argument('--repeat', type=int, default=default_options['repeat'], help='Runs of each stage, the median is recorded.')
+    parser.add_argument('--seed', type=int, default=default_options['seed'], help='Random seed.')
+    parser.add_argument('--output', help='Path of the JSON results file.')
+    parser.add_argument('--keep', action='store_true', help='Keep the synthetic comics and saved pages.')
+    parser.add_argument('--cold-starts', type=int, default=DEFAULT_COLD_STARTS, help='Cold starts to time (new process, import, one small job), 0 to skip.')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help='Compare two JSON results files.')
+    parser.add_argument('--threshold', type=float, default=0.10, help='Slow down ratio considered a regression when comparing.')
+    return parser.parse_args(argv)
+
+
+### Script Starts Here
+if __name__ == '__main__':
+    arguments = parseArguments(sys.argv[1:])
+    
+    if arguments.compare:
+        regressions = compareResults(arguments.compare[0], arguments.compare[1], arguments.threshold)
+        sys.exit(1 if regressions else 0)
+    
+    options = {
+        'archives' : arguments.archives,
+        'pages' : arguments.pages,
+        'size' : tuple(int(n) for n in arguments.size.lower().split('x')),
+        'color_modes' : [mode.strip().upper() for mode in arguments.color_modes.split(',') if mode.strip()],
+        'png_ratio' : arguments.png_ratio,
+        'repeat' : max(arguments.repeat, 1),
+        'seed' : arguments.seed
+    }
+    
+    results = runBenchmark(options, arguments.keep, max(arguments.cold_starts, 0))
+    printResults(results)
+    
+    if arguments.output:
+        results_path = Path(arguments.output)
+    else:
+        DEFAULT_RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        results_path = Path(PurePath().joinpath(DEFAULT_RESULTS_DIR, f'benchmark_{datetime.now():%Y%m%d_%H%M%S}.json'))
+    results_path.write_text(json.dumps(results, indent=2), encoding='utf-8')
+    print(f'\nResults saved to: {results_path}')
@@ -5,12 +5,77 @@
 Common Helper Functions by JDHatten
 '''
 
+import importlib
+import os
 import pathlib
 import re
+import time
 
 re_number_pattern = re.compile('\d*\.?\d*', re.IGNORECASE)
 
 
+### A module that isn't imported until it's first used, so modules only needed by some code paths don't
+### slow down starting a script. Setting an attribute sets it on the module (importing it first).
+### Example: rarfile = LazyImport('rarfile')  ...  rarfile.RarFile(file_path)
+###     (module_name) Full name of the module to import. Example: 'PIL.Image'
+###     (on_import) A function called with the module once it's imported, to set it up.
+class LazyImport:
+    
+    def __init__(self, module_name, on_import = None):
+        object.__setattr__(self, '_module_name', module_name)
+        object.__setattr__(self, '_on_import', on_import)
+        object.__setattr__(self, '_module', None)
+    
+    ### Import the module if not already imported.
+    ###     --> Returns a [Module]
+    def _import(self):
+        if self._module is None:
+            module = importlib.import_module(self._module_name)
+            if self._on_import:
+                self._on_import(module)
+            object.__setattr__(self, '_module', module)
+        return self._module
+    
+    def __getattr__(self, name):
+        return getattr(self._import(), name)
+    
+    def __setattr__(self, name, value):
+        setattr(self._import(), name, value)
+    
+    def __repr__(self):
+        return f'<LazyImport {self._module_name}>'
+
+
+### Get the names of all files directly inside a directory using one directory listing. Names are
+### normalized to the case rules of the operating system so they can be compared to other normalized
+### names. Example: os.path.normcase('Page.JPG') in ListFileNames(directory)
+###     (directory) A path to a directory.
+###     --> Returns a [Set]
+def ListFileNames(directory):
+    file_names = set()
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if not entry.is_dir():
+                    file_names.add(os.path.normcase(entry.name))
+    except (FileNotFoundError, NotADirectoryError):
+        pass
+    return file_names
+
+
+### Start timing something, both the wall clock time and the CPU time used by this process.
+###     --> Returns a [Tuple] (wall clock start, CPU start)
+def StartTimer():
+    return time.perf_counter(), time.process_time()
+
+
+### Stop timing something started with StartTimer.
+###     (timer) A Tuple returned by StartTimer.
+###     --> Returns a [Tuple] (wall clock seconds, CPU seconds)
+def StopTimer(timer):
+    return time.perf_counter() - timer[0], time.process_time() - timer[1]
+
+
 ### Create directories starting from an existing root path. Return False if root does not exist.
 ###     (root) A root path that already exists.
 ###     (directories) A directory string or a list of directories to create.
@@ -79,7 +144,7 @@ def ModifyImageSize(org_image_shape, image_size_modifications, keep_aspect_ratio
             if type(image_size_modifications[WIDTH][NUMBER]) == str:
                 percent_number = re_number_pattern.search(image_size_modifications[WIDTH][NUMBER])
                 if percent_number:
-                    multipler = float(percent_number).group().strip() / 100
+                    multipler = float(percent_number.group().strip()) / 100
                     new_width = org_image_shape[WIDTH] * multipler
                 else:
                     print(f'Error: Can\'t decipher what kind of number this is: {image_size_modifications[WIDTH]}')
@@ -93,15 +158,15 @@ def ModifyImageSize(org_image_shape, image_size_modifications, keep_aspect_ratio
         
         if image_size_modifications[WIDTH][MODIFIER] == UPSCALE:
             if org_image_shape[WIDTH] < image_size_modifications[WIDTH][NUMBER]:
-                new_height = image_size_modifications[WIDTH][NUMBER]
+                new_width = image_size_modifications[WIDTH][NUMBER]
             else:
-                new_height = org_image_shape[WIDTH]
+                new_width = org_image_shape[WIDTH]
         
         if image_size_modifications[WIDTH][MODIFIER] == DOWNSCALE:
             if org_image_shape[WIDTH] > image_size_modifications[WIDTH][NUMBER]:
-                new_height = image_size_modifications[WIDTH][NUMBER]
+                new_width = image_size_modifications[WIDTH][NUMBER]
             else:
-                new_height = org_image_shape[WIDTH]
+                new_width = org_image_shape[WIDTH]
     
     elif image_size_modifications[WIDTH] != NO_CHANGE:
         new_width = image_size_modifications[WIDTH]
@@ -168,13 +233,74 @@ def ModifyImageSize(org_image_shape, image_size_modifications, keep_aspect_ratio
     return new_width, new_height
 
 
+# Sort Key Methods
+SORT_ALPHA = 0         # Sort alphabetically where digits are sorted individually (100 < 99).
+SORT_ALPHA_NUMBER = 1  # Sort alphabetically with digits represented as whole numbers (100 > 99).
+SORT_NUMBERS_ONLY = 2  # Sort with numbers only, letters are ignored.
+
+re_digits_pattern = re.compile(r'(\d+)')
+re_non_digits_pattern = re.compile(r'\D+')
+
+
+### Make a key to sort text (file names) by.
+###     (text) A String to make a sort key from.
+###     (sort_method) SORT_ALPHA, SORT_ALPHA_NUMBER, or SORT_NUMBERS_ONLY.
+###     (file_name_only) If text is a file path, make the key from the file name only.
+###     --> Returns a [String] or [Tuple]
+def MakeSortKey(text, sort_method = SORT_ALPHA, file_name_only = False):
+    
+    if file_name_only:
+        text = text[max(text.rfind('/'), text.rfind('\\')) + 1:]
+    
+    # Sort strings with numbers as a whole and not individual digits, numbers can be any length.
+    # Example: 'Page 12a.jpg' --> ('Page ', 12, 'a.jpg') so every even index is a String and every odd an Integer.
+    if sort_method == SORT_ALPHA_NUMBER:
+        parts = re_digits_pattern.split(text)
+        parts[1::2] = map(int, parts[1::2])
+        return tuple(parts)
+    
+    # Sort strings using only it's didgits/numbers. Strings without any sort last.
+    elif sort_method == SORT_NUMBERS_ONLY:
+        only_digits = re_non_digits_pattern.sub('', text)
+        if only_digits:
+            return (0, int(only_digits))
+        return (1, 0)
+    
+    return text
+
+
+# Shared by all threads without a lock: a key only depends on it's text, so the worst a race can do is make
+# the same key twice or drop keys when a full cache is cleared.
+sort_key_caches = {}
+SORT_KEY_CACHE_SIZE = 1<<18
+
+### Get a function that returns a sort key (see MakeSortKey) for any text given to it. Keys made are cached
+### for each sort method, so sorting the same file names again (or the same file names in other archives)
+### only looks up keys already made. Example: file_names.sort(key=GetSortKeyFunction(SORT_ALPHA_NUMBER))
+###     (sort_method) SORT_ALPHA, SORT_ALPHA_NUMBER, or SORT_NUMBERS_ONLY.
+###     (file_name_only) If text is a file path, make the key from the file name only.
+###     --> Returns a [Function]
+def GetSortKeyFunction(sort_method = SORT_ALPHA, file_name_only = False):
+    sort_keys = sort_key_caches.setdefault((sort_method, file_name_only), {})
+    
+    def getSortKey(text):
+        sort_key = sort_keys.get(text)
+        if sort_key is None:
+            if len(sort_keys) >= SORT_KEY_CACHE_SIZE:
+                sort_keys.clear()
+            sort_key = sort_keys[text] = MakeSortKey(text, sort_method, file_name_only)
+        return sort_key
+    
+    return getSortKey
+
+
 ### Custom sorting function using file meta data.
 ###     (file) A Tuple with the full file path and various meta data.
 ###     (index) The index of which meta data to sort by.
 ###     (use_whole_numbers_in_str) When sorting strings with digits, use the whole number
 ###                                instead of individual digits.
 ###     (sort_only_digits_as_int) Sort strings using only the digits/numbers as integers.
-###     --> Returns a [String] or [Integer]
+###     --> Returns a [String], [Integer] or [Tuple]
 def SortFiles(file, index, use_whole_numbers_in_str = True, sort_only_digits_as_int = False):
     
     #meta_data = file[index] if file[index] else -9999999999999
@@ -190,26 +316,10 @@ def SortFiles(file, index, use_whole_numbers_in_str = True, sort_only_digits_as_
     
     ## TODO: Handle floating point numbers in strings?
     
-    # Sort strings using only it's didgits/numbers.
-    if sort_only_digits_as_int and type(meta_data) == str:
-        only_digits = ''.join([n for n in meta_data if n.isdigit()])
-        meta_data = int(only_digits) if only_digits != '' else 9999999999999
-    
-    # Sort strings with numbers as a whole and not individual digits.
-    elif use_whole_numbers_in_str and type(meta_data) == str:
-        new_string = []
-        number_split = []
-        zeros = '000000000000'
-        for x in meta_data:
-            if x.isdigit():
-                number_split.append(x)
-            else:
-                if number_split:
-                    trailing = zeros[len(number_split):]
-                    num_str = trailing + ''.join(number_split)
-                    new_string.append(num_str)
-                    number_split.clear()
-                new_string.append(x)
-        meta_data = ''.join(new_string)
+    if type(meta_data) == str:
+        if sort_only_digits_as_int:
+            meta_data = GetSortKeyFunction(SORT_NUMBERS_ONLY)(meta_data)
+        elif use_whole_numbers_in_str:
+            meta_data = GetSortKeyFunction(SORT_ALPHA_NUMBER)(meta_data)
     
     return meta_data
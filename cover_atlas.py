@@ -0,0 +1,229 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+'''
+Cover Atlas for Auto Page Extract, Edit, Save
+
+    Make browse grids of the covers (first pages) of a whole library of CBR files. Instead of one tiny
+    image file for every CBR file, cover thumbnails are placed in fixed-grid atlas images, and a JSON
+    index records where each CBR file's cover is in which atlas. Only the first page (sorted the same way
+    as SORT_PAGES_BY) is read from each CBR file, JPEG covers are decoded at a reduced scale, and CBR
+    files are read and decoded on a pool of worker threads.
+
+How To Use:
+    python cover_atlas.py PATH [PATH ...] [--out DIR] [--tile 200x300] [--grid 16x16] [--workers N] [--sub-dirs]
+        PATH can be CBR files or directories with CBR files.
+
+Index (cover_atlas_index.json):
+    {
+        "tile_size" : [200, 300],
+        "grid"      : [16, 16],
+        "atlases"   : [ "cover_atlas_00001.jpg", ... ],
+        "covers"    : { "/path/to/file.cbr" : { "atlas" : "cover_atlas_00001.jpg", "x" : 0, "y" : 12,
+                                                "width" : 200, "height" : 276, "page" : "file/001.jpg" }, ... },
+        "errors"    : { "/path/to/bad.cbr" : "error message", ... }
+    }
+    Covers are fit into their tile and centered, "x", "y", "width" and "height" are of the cover itself.
+'''
+
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+from pathlib import Path, PurePath
+import argparse
+import io
+import json
+import os
+import sys
+
+ROOT_DIR = Path(__file__).parent
+sys.path.insert(0, str(ROOT_DIR))
+
+import auto_page_extract_edit_save as apes
+from common_functions import GetSortKeyFunction
+
+DEFAULT_ATLAS_DIR = Path(PurePath().joinpath(ROOT_DIR, 'cover_atlases'))
+DEFAULT_TILE_SIZE = (200, 300)
+DEFAULT_GRID = (16, 16)
+DEFAULT_WORKERS = os.cpu_count() or 2
+ATLAS_BACKGROUND = (0, 0, 0)
+ATLAS_FORMATS = {'jpg' : apes.JPG, 'png' : apes.PNG, 'webp' : apes.WEB}
+ATLAS_QUALITY = 85
+INDEX_FILE_NAME = 'cover_atlas_index.json'
+
+IMAGE_EXTENSIONS = {file_ext for image_format in apes.SUPPORTED_IMAGE_FORMATS for file_ext in image_format[1:]}
+
+
+### Find all CBR files in files and directories given, in sorted order.
+###     (paths) A List of Paths to CBR files or directories.
+###     (search_sub_dirs) Also search the sub-directories of directories if True.
+###     --> Returns a [List] of Paths
+def findCBRFiles(paths, search_sub_dirs = False):
+    cbr_file_paths = set()
+    for path in map(Path, paths):
+        if path.is_dir():
+            cbr_file_paths.update(apes.scanWatchDirectories([path], search_sub_dirs))
+        elif path.suffix == '.cbr':
+            cbr_file_paths.add(path)
+        else:
+            print(f'Not A CBR File Or Directory: {path}')
+    return sorted(cbr_file_paths)
+
+
+### Read the file of the first page in an archive, which may be in an archive nested in it (like one ZIP or RAR file
+### per chapter) sorted first. Nested archives are read into memory, never extracted.
+###     (archive) An opened RarFile (or ZipFile if nested).
+###     (sort_pages_by) A Tuple (sort method, sort order), see SORT_PAGES_BY.
+###     (depth) How many archives deep this archive is nested.
+###     --> Returns a [Tuple] (file name of the cover, Bytes)
+def readCoverFile(archive, sort_pages_by, depth = 0):
+    sort_method, sort_order = sort_pages_by
+    
+    page_names = []
+    archive_names = set()
+    for archived_file in archive.infolist():
+        file_path = PurePath(archived_file.filename)
+        if archived_file.is_dir() or file_path.stem[:1] == '.':
+            continue
+        if file_path.suffix in IMAGE_EXTENSIONS:
+            page_names.append(archived_file.filename)
+        elif file_path.suffix.lower() in apes.NESTED_ARCHIVE_EXTENSIONS and depth < apes.MAX_NESTED_ARCHIVES:
+            page_names.append(archived_file.filename)
+            archive_names.add(archived_file.filename)
+    if not page_names:
+        raise ValueError('No Pages Found')
+    
+    # Only the first page is needed, no need to sort every page.
+    sort_key = GetSortKeyFunction(sort_method, file_name_only=True)
+    cover_name = max(page_names, key=sort_key) if sort_order else min(page_names, key=sort_key)
+    if cover_name in archive_names:
+        with apes.openNestedArchive(archive.read(cover_name)) as nested_archive:
+            nested_cover_name, cover_bytes = readCoverFile(nested_archive, sort_pages_by, depth + 1)
+        return f'{cover_name}/{nested_cover_name}', cover_bytes
+    
+    return cover_name, archive.read(cover_name)
+
+
+### Read the cover (first page) of a CBR file and shrink it to fit a tile. Only the cover is read from the
+### CBR file and, if a JPEG, decoded at the smallest reduced scale (1/2, 1/4 or 1/8) still larger than the tile.
+###     (cbr_file_path) A Path to a CBR file.
+###     (tile_size) A Tuple (width, height) the cover must fit in.
+###     (sort_pages_by) A Tuple (sort method, sort order), see SORT_PAGES_BY.
+###     --> Returns a [Tuple] (file name of the cover in the CBR file, cover Image)
+def readCover(cbr_file_path, tile_size = DEFAULT_TILE_SIZE, sort_pages_by = (apes.ALPHA, apes.ASCENDING)):
+    with apes.rarfile.RarFile(cbr_file_path) as cbrar:
+        cover_name, cover_bytes = readCoverFile(cbrar, sort_pages_by)
+    
+    cover = apes.openImage(io.BytesIO(cover_bytes))
+    cover.draft('RGB', tile_size)
+    cover = cover.convert('RGB')
+    cover.thumbnail(tile_size)
+    
+    return cover_name, cover
+
+
+### Read the cover of a CBR file (see readCover), with any errors returned instead of raised.
+###     (cbr_file_path) A Path to a CBR file.
+###     (tile_size) A Tuple (width, height) the cover must fit in.
+###     (sort_pages_by) A Tuple (sort method, sort order), see SORT_PAGES_BY.
+###     --> Returns a [Tuple] (file name of the cover, cover Image, None) or (None, None, error message)
+def readCoverTile(cbr_file_path, tile_size, sort_pages_by):
+    try:
+        return (*readCover(cbr_file_path, tile_size, sort_pages_by), None)
+    except (apes.rarfile.Error, apes.zipfile.BadZipFile, OSError, apes.Image.UnidentifiedImageError, ValueError, TypeError, KeyError) as err:
+        return None, None, str(err)
+
+
+### Create atlas images of the covers of CBR files and a JSON index of where each cover is. CBR files are read
+### on a pool of worker threads one atlas worth at a time, so only one atlas and it's covers are ever in memory.
+### CBR files that fail are left out of the atlases (see "errors" in the index).
+###     (cbr_file_paths) A List of Paths to CBR files, covers are placed in this order (left to right, top to bottom).
+###     (atlas_dir) A Path to the directory to save the atlases and index in.
+###     (tile_size) A Tuple (width, height) of each tile.
+###     (grid) A Tuple (columns, rows) of tiles in each atlas.
+###     (workers) Number of CBR files read at the same time.
+###     (atlas_format) Image format of the atlases, JPG, PNG or WEB.
+###     (sort_pages_by) A Tuple (sort method, sort order), see SORT_PAGES_BY. The selected preset's if None.
+###     --> Returns a [Dictionary] index
+def createCoverAtlases(cbr_file_paths, atlas_dir = DEFAULT_ATLAS_DIR, tile_size = DEFAULT_TILE_SIZE, grid = DEFAULT_GRID,
+                       workers = DEFAULT_WORKERS, atlas_format = apes.JPG, sort_pages_by = None):
+    if sort_pages_by is None:
+        sort_pages_by = apes.preset_options[apes.selected_preset].get(apes.SORT_PAGES_BY, (apes.ALPHA, apes.ASCENDING))
+    atlas_dir = Path(atlas_dir)
+    atlas_dir.mkdir(parents=True, exist_ok=True)
+    tile_width, tile_height = tile_size
+    columns, rows = grid
+    tiles_per_atlas = columns * rows
+    
+    index = {'tile_size' : list(tile_size), 'grid' : list(grid), 'atlases' : [], 'covers' : {}, 'errors' : {}}
+    atlas = None
+    atlas_path = None
+    tile_number = 0
+    
+    with ThreadPoolExecutor(max(workers, 1)) as executor:
+        for first in range(0, len(cbr_file_paths), tiles_per_atlas):
+            batch = cbr_file_paths[first:first+tiles_per_atlas]
+            covers = executor.map(readCoverTile, batch, repeat(tile_size), repeat(sort_pages_by))
+            
+            for cbr_file_path, (cover_name, cover, error) in zip(batch, covers):
+                if error:
+                    print(f'Failed To Read Cover: {cbr_file_path} - {error}')
+                    index['errors'][str(cbr_file_path)] = error
+                    continue
+                
+                if atlas is None:
+                    atlas = apes.Image.new('RGB', (columns * tile_width, rows * tile_height), ATLAS_BACKGROUND)
+                    index['atlases'].append(f'cover_atlas_{len(index["atlases"])+1:05d}{atlas_format[1]}')
+                    atlas_path = Path(PurePath().joinpath(atlas_dir, index['atlases'][-1]))
+                
+                x = (tile_number % columns) * tile_width + (tile_width - cover.width) // 2
+                y = (tile_number // columns) * tile_height + (tile_height - cover.height) // 2
+                atlas.paste(cover, (x, y))
+                index['covers'][str(cbr_file_path)] = {
+                    'atlas' : index['atlases'][-1], 'x' : x, 'y' : y, 'width' : cover.width, 'height' : cover.height, 'page' : cover_name
+                }
+                
+                tile_number += 1
+                if tile_number == tiles_per_atlas:
+                    atlas.save(atlas_path, quality=ATLAS_QUALITY)
+                    atlas = None
+                    tile_number = 0
+            
+            print(f'Covers Read: {min(first + tiles_per_atlas, len(cbr_file_paths))}/{len(cbr_file_paths)}')
+    
+    if atlas is not None:
+        atlas.save(atlas_path, quality=ATLAS_QUALITY)
+    
+    with open(Path(PurePath().joinpath(atlas_dir, INDEX_FILE_NAME)), 'w', encoding='utf-8') as index_file:
+        json.dump(index, index_file, ensure_ascii=False, indent=1)
+    
+    return index
+
+
+### Read a size given on the command line. Example: "200x300"
+###     (text) A String.
+###     --> Returns a [Tuple] (Int, Int)
+def parseSize(text):
+    try:
+        width, height = (int(number) for number in text.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'Not a size like 200x300: "{text}"')
+    if width < 1 or height < 1:
+        raise argparse.ArgumentTypeError(f'Size must be at least 1x1: "{text}"')
+    return width, height
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Make atlas images of the covers of CBR files with a JSON index of where each cover is.')
+    parser.add_argument('paths', nargs='+', help='CBR files or directories with CBR files.')
+    parser.add_argument('--out', default=str(DEFAULT_ATLAS_DIR), help='Directory to save the atlases and index in.')
+    parser.add_argument('--tile', type=parseSize, default=DEFAULT_TILE_SIZE, help='Size of each tile. Example: 200x300')
+    parser.add_argument('--grid', type=parseSize, default=DEFAULT_GRID, help='Columns and rows of tiles in each atlas. Example: 16x16')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='Number of CBR files read at the same time.')
+    parser.add_argument('--format', choices=list(ATLAS_FORMATS), default='jpg', help='Image format of the atlases.')
+    parser.add_argument('--sub-dirs', action='store_true', help='Also search sub-directories for CBR files.')
+    arguments = parser.parse_args()
+    
+    cbr_file_paths = findCBRFiles(arguments.paths, arguments.sub_dirs)
+    print(f'CBR Files Found: {len(cbr_file_paths)}')
+    index = createCoverAtlases(cbr_file_paths, arguments.out, arguments.tile, arguments.grid, arguments.workers, ATLAS_FORMATS[arguments.format])
+    print(f'Atlases Saved: {len(index["atlases"])}  Covers: {len(index["covers"])}  Errors: {len(index["errors"])}  --> {arguments.out}')
@@ -0,0 +1,374 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+'''
+Page Job Server for Auto Page Extract, Edit, Save
+
+    A long-running local server that extracts, edits and saves the pages of CBR files for other programs,
+    so they don't have to start this script (and import Pillow, rarfile and patool) once for every CBR
+    file. Jobs are sent over a Unix domain socket and run on a pool of worker threads that is kept for
+    the life of the server. Each connection is read on a thread of it's own, so clients waiting between
+    jobs never hold up a worker, and connections idle for CONNECTION_TIMEOUT seconds are closed.
+
+How To Use:
+    python page_job_server.py [--socket PATH] [--workers N]
+        Start the server. Stop it with Ctrl+C or by sending {"command" : "shutdown"}.
+    
+    python page_job_server.py --send ARCHIVE [--preset-number N] [--return-pages]
+        Send one job to a running server and print the response (for testing).
+
+Protocol:
+    Every message (both ways) is a 4 byte big-endian length followed by that many bytes of UTF-8 JSON.
+    A connection can send any number of jobs, one after another, each getting one response.
+    
+    Job:
+        {
+            "archive_path"  : "/path/to/file.cbr",  -or-  "archive_bytes" : "<base64>", "archive_name" : "file.cbr",
+            "preset"        : { "PAGES_TO_EXTRACT" : "1-5, 8", "CHANGE_HEIGHT" : ["DOWNSCALE", 1080], ... },
+                              -or-  "preset_number" : 0,
+            "return_pages"  : false
+        }
+        Preset options use the same names as the presets in auto_page_extract_edit_save.py and so do the
+        constants used as values (example: "JPG", "ALPHA_NUMBER", "INSERT_PAGE_NUMBER"). Arrays are used for
+        tuples, and page ranges are page selection strings like "1-5" (see PAGES_TO_EXTRACT).
+        With "return_pages" nothing is saved, the pages are encoded in memory and returned in the response.
+        Jobs that save to the same directory are run one at a time (in the order they get there), jobs saving to
+        different directories run at the same time.
+    
+    Response:
+        {
+            "ok"       : true,
+            "archive"  : "/path/to/file.cbr",
+            "pages"    : [ { "page" : 1, "save_path" : "...", "saved" : "Encoded", "data" : "<base64>" }, ... ],
+            "log"      : [ run log records of this job (see RunLog in auto_page_extract_edit_save.py) ],
+            "counters" : { "pages_to_extract" : 5, "bytes_written" : 123456, ... }
+        }
+        -or-  { "ok" : false, "error" : "..." }
+    
+    Other Commands:
+        {"command" : "ping"}       -->  {"ok" : true, "pong" : true}
+        {"command" : "shutdown"}   -->  {"ok" : true}  and the server stops.
+
+Requirements:
+    A system with Unix domain sockets (Linux, macOS).
+'''
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePath
+import argparse
+import base64
+import contextlib
+import json
+import os
+import re
+import socket
+import struct
+import sys
+import threading
+
+ROOT_DIR = Path(__file__).parent
+sys.path.insert(0, str(ROOT_DIR))
+
+import auto_page_extract_edit_save as apes
+
+DEFAULT_SOCKET_PATH = Path(PurePath().joinpath(ROOT_DIR, 'page_job_server.sock'))
+DEFAULT_WORKERS = max((os.cpu_count() or 2) // 2, 1)
+MAX_MESSAGE_SIZE = 1 << 30 # 1 GB
+CONNECTION_TIMEOUT = 300.0 # Seconds a connection can wait to receive (between jobs) before it's closed.
+
+# Names of preset options and constants that can be used in a job's preset.
+PRESET_OPTION_NAMES = [
+    'DESCRIPTION', 'PAGES_TO_EXTRACT', 'SORT_PAGES_BY', 'CHANGE_WIDTH', 'CHANGE_HEIGHT', 'KEEP_ASPECT_RATIO',
+    'ROTATE_PAGES', 'COMBINE_PAGES', 'RESAMPLING_FILTER', 'CHANGE_IMAGE_FORMAT', 'IMAGE_SAVING_PARAMS',
+    'SEARCH_SUB_DIRS', 'OVERWRITE_FILES', 'MODIFY_FILE_NAMES', 'SAVE_DIR_PATH', 'KEEP_FILE_PATHS_INTACT',
+    'RESOLVE_NAME_CONFLICTS', 'SLICE_TALL_PAGES'
+]
+CONSTANT_NAMES = [
+    'ALPHA', 'ALPHA_NUMBER', 'NUMBERS_ONLY', 'ASCENDING', 'DESCENDING', 'ALL_PAGES',
+    'NO_CHANGE', 'CHANGE_TO', 'MODIFY_BY_PIXELS', 'MODIFY_BY_PERCENT', 'UPSCALE', 'DOWNSCALE',
+    'HORIZONTAL', 'VERTICAL',
+    'INSERT_FILE_NAME', 'INSERT_PAGE_NAME', 'INSERT_PAGE_NUMBER', 'INSERT_COUNTER',
+    'BMP', 'GIF', 'ICN', 'ICO', 'JP2', 'JPG', 'PBM', 'PNG', 'RAS', 'TIF', 'WEB', 'AUTO', 'PDF',
+    'QUALITY', 'QUANT_TABLES', 'SUBSAMPLING', 'OPTIMIZE', 'PROGRESSIVE', 'SIZES', 'COMPRESSION', 'MAX_FILE_SIZE', 'MAX_BYTES_PER_MEGAPIXEL', 'SHARED_PALETTE',
+    'NEAREST', 'BILINEAR', 'BICUBIC'
+]
+
+re_integer = re.compile(r'^-?\d+$')
+
+# Jobs that save files take the locks of the directories they save to, so two jobs saving to the same directory
+# run one after the other and the second sees the files the first saved (instead of both saving to the same names).
+save_dir_locks = {} # {resolved save directory Path : threading.Lock}
+save_dir_locks_lock = threading.Lock()
+
+
+### Convert a JSON value to the values used in presets. Constant names become their values and
+### (dictionary) keys that are numbers become Integers.
+###     (value) Any JSON value.
+###     --> Returns any value
+def convertJSONValue(value):
+    if type(value) == str and value in CONSTANT_NAMES:
+        return getattr(apes, value)
+    if type(value) == list:
+        return [convertJSONValue(item) for item in value]
+    if type(value) == dict:
+        converted = {}
+        for key, item in value.items():
+            if key in CONSTANT_NAMES:
+                key = getattr(apes, key)
+            elif re_integer.match(key):
+                key = int(key)
+            converted[key] = convertJSONValue(item)
+        return converted
+    return value
+
+
+### Create a preset from a job's JSON preset.
+###     (options) A Dictionary {preset option name : JSON value}.
+###     --> Returns a [Dictionary]
+def presetFromJSON(options):
+    preset = {}
+    for name, value in (options or {}).items():
+        if name in PRESET_OPTION_NAMES:
+            option = getattr(apes, name)
+        elif re_integer.match(str(name)):
+            option = int(name)
+        else:
+            raise ValueError(f'Unknown preset option: "{name}"')
+        
+        value = convertJSONValue(value)
+        
+        # Arrays that must be tuples.
+        if option in (apes.SORT_PAGES_BY, apes.CHANGE_WIDTH, apes.CHANGE_HEIGHT) and type(value) == list:
+            value = tuple(value)
+        elif option == apes.COMBINE_PAGES and type(value) == list:
+            value = [tuple(pages_to_combine) for pages_to_combine in value]
+        elif option == apes.IMAGE_SAVING_PARAMS and type(value) == dict and type(value.get(apes.SIZES)) == list:
+            value[apes.SIZES] = [tuple(size) for size in value[apes.SIZES]]
+        
+        preset[option] = value
+    return preset
+
+
+### Send a message: a 4 byte big-endian length followed by UTF-8 JSON.
+###     (connection) A connected socket.
+###     (message) A Dictionary.
+###     --> Returns a [None]
+def sendMessage(connection, message):
+    data = json.dumps(message).encode('utf-8')
+    connection.sendall(struct.pack('>I', len(data)) + data)
+    return None
+
+
+### Receive exactly a number of bytes.
+###     (connection) A connected socket.
+###     (size) Number of bytes.
+###     --> Returns a [Bytes] or None if the connection was closed
+def receiveExactly(connection, size):
+    data = bytearray()
+    while len(data) < size:
+        chunk = connection.recv(min(size - len(data), 1 << 20))
+        if not chunk:
+            return None
+        data += chunk
+    return bytes(data)
+
+
+### Receive a message sent with sendMessage.
+###     (connection) A connected socket.
+###     --> Returns a [Dictionary] or None if the connection was closed
+def receiveMessage(connection):
+    header = receiveExactly(connection, 4)
+    if header is None:
+        return None
+    size = struct.unpack('>I', header)[0]
+    if size > MAX_MESSAGE_SIZE:
+        raise ValueError(f'Message too large: {size} bytes')
+    data = receiveExactly(connection, size)
+    if data is None:
+        return None
+    return json.loads(data.decode('utf-8'))
+
+
+### Get the locks of the directories a job saves to, always in the same order so jobs waiting on each other
+### can't deadlock.
+###     (save_dir_paths) A List of save directory Paths.
+###     --> Returns a [List] of threading.Lock
+def getSaveDirectoryLocks(save_dir_paths):
+    with save_dir_locks_lock:
+        return [
+            save_dir_locks.setdefault(save_dir_path, threading.Lock())
+            for save_dir_path in sorted({Path(save_dir_path).resolve() for save_dir_path in save_dir_paths})
+        ]
+
+
+### Run one job: extract, edit and save the pages of one CBR file.
+###     (job) A Dictionary (see Protocol above).
+###     --> Returns a [Dictionary] response
+def runJob(job):
+    if 'preset' in job:
+        preset = presetFromJSON(job['preset'])
+    else:
+        preset = dict(apes.preset_options[job.get('preset_number', apes.selected_preset)])
+        preset.pop(apes.LOG_DATA, None)
+    
+    if 'archive_bytes' in job:
+        archive = base64.b64decode(job['archive_bytes'])
+        cbr_file_path = Path(Path(job.get('archive_name') or 'archive.cbr').name)
+    elif 'archive_path' in job:
+        archive = None
+        cbr_file_path = Path(job['archive_path'])
+    else:
+        raise ValueError('A job needs an "archive_path" or "archive_bytes".')
+    
+    run_log = apes.RunLog() # Kept in memory and returned with the job.
+    pages = []
+    
+    if job.get('return_pages', False):
+        # Nothing is saved, pages are encoded in memory.
+        if archive is None:
+            archive = cbr_file_path.read_bytes()
+        for _, page_bytes, metadata in apes.iterEncodedPages(archive, preset, cbr_file_path.name, run_log):
+            page = {'page' : metadata['page'], 'save_path' : metadata['save_path'], 'saved' : metadata['saved']}
+            if page_bytes is not None:
+                page['data'] = base64.b64encode(page_bytes).decode('ascii')
+            pages.append(page)
+    
+    else:
+        all_the_data = apes.changePreset(preset, {})
+        all_the_data[apes.LOG_DATA][apes.RUN_LOG] = run_log
+        if archive is not None:
+            all_the_data[apes.LOG_DATA][apes.ARCHIVES_IN_MEMORY][cbr_file_path] = archive
+        job_save_dir_locks = getSaveDirectoryLocks(apes.getSaveDirectoryPaths(all_the_data, cbr_file_path))
+        with contextlib.ExitStack() as stack:
+            for save_dir_lock in job_save_dir_locks:
+                stack.enter_context(save_dir_lock)
+            all_the_data = apes.preparePageData(cbr_file_path, all_the_data)
+            all_the_data = apes.extractEditSavePages(all_the_data)
+        apes.closeRunLog(all_the_data)
+        for record in run_log.records:
+            if record['record'] == 'page' and record.get('saved'):
+                pages.append({'page' : record['page'], 'save_path' : record['save_path'], 'saved' : record['saved']})
+    
+    return {
+        'ok' : True,
+        'archive' : str(cbr_file_path),
+        'pages' : pages,
+        'log' : run_log.records,
+        'counters' : run_log.records[-1]['counters'] # The "end" record.
+    }
+
+
+### Handle all the jobs sent over one connection, on a thread of it's own. Only the jobs themselves are run on the
+### pool of worker threads.
+###     (connection) A connected socket.
+###     (pool) The ThreadPoolExecutor jobs are run on.
+###     (stop_event) Event set to stop the server.
+###     --> Returns a [None]
+def handleConnection(connection, pool, stop_event):
+    with connection:
+        connection.settimeout(CONNECTION_TIMEOUT)
+        while not stop_event.is_set():
+            try:
+                job = receiveMessage(connection)
+                if job is None:
+                    break
+                command = job.get('command')
+                if command == 'ping':
+                    response = {'ok' : True, 'pong' : True}
+                elif command == 'shutdown':
+                    response = {'ok' : True}
+                    stop_event.set()
+                else:
+                    response = pool.submit(runJob, job).result()
+            except socket.timeout:
+                break
+            except Exception as err:
+                response = {'ok' : False, 'error' : f'{type(err).__name__}: {err}'}
+            
+            try:
+                sendMessage(connection, response)
+            except OSError:
+                break
+    return None
+
+
+### Start the server and handle jobs until stopped. Jobs still waiting to run when stopped are cancelled.
+###     (socket_path) Path of the Unix domain socket.
+###     (workers) Number of worker threads (jobs run at the same time).
+###     --> Returns a [None]
+def runServer(socket_path = DEFAULT_SOCKET_PATH, workers = DEFAULT_WORKERS):
+    if not hasattr(socket, 'AF_UNIX'):
+        print('Unix domain sockets are not supported on this system.')
+        return None
+    
+    # Nothing is printed per page and no log files are left behind, everything is returned with the job.
+    apes.verbosity = apes.SHOW_ERRORS
+    apes.create_log_file = True
+    
+    socket_path = Path(socket_path)
+    if socket_path.exists():
+        socket_path.unlink()
+    
+    stop_event = threading.Event()
+    pool = ThreadPoolExecutor(max_workers=workers)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        # Only this user can connect. The socket is created without permissions for anyone else, rather than
+        # changed after it's already open for connections.
+        old_umask = os.umask(0o077)
+        try:
+            server.bind(str(socket_path))
+        finally:
+            os.umask(old_umask)
+        server.listen()
+        server.settimeout(0.5)
+        print(f'Page Job Server listening on: {socket_path}  (workers: {workers})')
+        
+        try:
+            while not stop_event.is_set():
+                try:
+                    connection, _ = server.accept()
+                except socket.timeout:
+                    continue
+                threading.Thread(target=handleConnection, args=(connection, pool, stop_event), daemon=True).start()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            stop_event.set()
+            pool.shutdown(wait=False, cancel_futures=True)
+            socket_path.unlink(missing_ok=True)
+            print('Page Job Server stopped.')
+    
+    return None
+
+
+### Send a job to a running server and wait for the response.
+###     (job) A Dictionary (see Protocol above).
+###     (socket_path) Path of the server's Unix domain socket.
+###     --> Returns a [Dictionary] response
+def sendJob(job, socket_path = DEFAULT_SOCKET_PATH):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(str(socket_path))
+        sendMessage(connection, job)
+        return receiveMessage(connection)
+
+
+### Script Starts Here
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Extract, edit and save pages of CBR files for other programs over a Unix domain socket.')
+    parser.add_argument('--socket', default=str(DEFAULT_SOCKET_PATH), help='Path of the Unix domain socket.')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='Number of jobs run at the same time.')
+    parser.add_argument('--send', metavar='ARCHIVE', help='Send one job to a running server and print the response.')
+    parser.add_argument('--preset-number', type=int, default=apes.selected_preset, help='Preset used with --send.')
+    parser.add_argument('--return-pages', action='store_true', help='Return pages instead of keeping them, used with --send.')
+    arguments = parser.parse_args()
+    
+    if arguments.send:
+        job = {'archive_path' : str(Path(arguments.send).resolve()), 'preset_number' : arguments.preset_number, 'return_pages' : arguments.return_pages}
+        response = sendJob(job, arguments.socket)
+        for page in response.get('pages', []):
+            if 'data' in page:
+                page['data'] = f'<{len(page["data"])} base64 characters>'
+        response.pop('log', None)
+        print(json.dumps(response, indent=2))
+    else:
+        runServer(arguments.socket, max(arguments.workers, 1))
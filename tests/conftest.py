@@ -0,0 +1,34 @@
+import io
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+import auto_page_extract_edit_save as apes
+from benchmark_pipeline import ZipRarFile
+
+
+### CBR files made by make_cbr can be read as if they were RAR files.
+@pytest.fixture
+def zip_cbr_files(monkeypatch):
+    monkeypatch.setattr(apes.rarfile, 'RarFile', ZipRarFile)
+    monkeypatch.setattr(apes, 'verbosity', apes.SHOW_ERRORS)
+    monkeypatch.setattr(apes, 'create_log_file', False)
+
+
+def make_page(color = (200, 100, 50), size = (60, 90), image_format = 'JPEG'):
+    page_bytes = io.BytesIO()
+    apes.Image.new('RGB', size, color).save(page_bytes, image_format)
+    return page_bytes.getvalue()
+
+
+### A ZIP file of JPEG pages named like a CBR file (see zip_cbr_files).
+def make_cbr(cbr_file_path, total_pages = 4, color = (200, 100, 50)):
+    with zipfile.ZipFile(cbr_file_path, 'w') as cbr_file:
+        for page_number in range(1, total_pages + 1):
+            cbr_file.writestr(f'Comic/{page_number:02d}.jpg', make_page((color[0], color[1], page_number * 20 % 256)))
+    return Path(cbr_file_path)
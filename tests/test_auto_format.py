@@ -0,0 +1,82 @@
+import zipfile
+
+import auto_page_extract_edit_save as apes
+from conftest import make_page
+
+
+def makeLineArtCBR(cbr_file_path, page_names):
+    with zipfile.ZipFile(cbr_file_path, 'w') as cbr_file:
+        for page_name in page_names:
+            cbr_file.writestr(page_name, make_page((255, 255, 255), image_format = 'PNG' if page_name.endswith('.png') else 'JPEG'))
+    return cbr_file_path
+
+
+def saveAuto(tmp_path, cbr_file_path, options = {}):
+    preset = {apes.CHANGE_IMAGE_FORMAT : apes.AUTO, apes.SAVE_DIR_PATH : str(tmp_path / 'out'), **options}
+    all_the_data = apes.changePreset(preset, {})
+    all_the_data = apes.findCBRFiles(cbr_file_path, all_the_data)
+    all_the_data = apes.extractEditSavePages(all_the_data)
+    return all_the_data[apes.LOG_DATA][apes.PAGE_DATA][cbr_file_path]
+
+
+def test_format_chosen_is_checked_for_name_conflicts(tmp_path, zip_cbr_files):
+    # "01.jpg" is line-art, saved as a PNG like "01.png".
+    cbr_file_path = makeLineArtCBR(tmp_path / 'Book.cbr', ['01.png', '01.jpg'])
+    page_table = saveAuto(tmp_path, cbr_file_path, {apes.RESOLVE_NAME_CONFLICTS : True})
+
+    assert sorted(apes.Path(save_path).name for save_path in page_table.save_paths.values()) == ['01 (2).png', '01.png']
+    assert len(list((tmp_path / 'out').rglob('*.png'))) == 2
+
+
+def test_page_encoded_to_choose_format_is_saved_as_is(tmp_path, zip_cbr_files, monkeypatch):
+    # Every page is between line-art and photographic, so it's encoded every way (PNG, JPEG and WebP).
+    monkeypatch.setattr(apes, 'AUTO_PHOTO_COVERAGE', 0.0)
+    monkeypatch.setattr(apes, 'AUTO_LINE_ART_COVERAGE', 1.1)
+    encoded = []
+    encode_page = apes.encodePage
+    def encodePage(all_the_data, image, file_ext, page_table = None):
+        page_bytes = encode_page(all_the_data, image, file_ext, page_table)
+        encoded.append((file_ext, page_bytes))
+        return page_bytes
+    monkeypatch.setattr(apes, 'encodePage', encodePage)
+
+    cbr_file_path = makeLineArtCBR(tmp_path / 'Book.cbr', ['01.jpg'])
+    page_table = saveAuto(tmp_path, cbr_file_path)
+
+    assert sorted(file_ext for file_ext, page_bytes in encoded) == ['.jpg', '.png', '.webp']
+    smallest = min(encoded, key = lambda encoded_page: len(encoded_page[1]))
+    save_file_path = apes.Path(page_table.save_paths[0])
+    assert save_file_path.suffix == smallest[0]
+    assert save_file_path.read_bytes() == smallest[1]
+
+
+def test_photographic_page_is_saved_as_the_smaller_of_jpeg_and_webp(tmp_path, zip_cbr_files, monkeypatch):
+    # Every page is photographic.
+    monkeypatch.setattr(apes, 'AUTO_PHOTO_COVERAGE', 1.1)
+    encoded = []
+    encode_page = apes.encodePage
+    def encodePage(all_the_data, image, file_ext, page_table = None):
+        page_bytes = encode_page(all_the_data, image, file_ext, page_table)
+        encoded.append((file_ext, page_bytes))
+        return page_bytes
+    monkeypatch.setattr(apes, 'encodePage', encodePage)
+
+    cbr_file_path = makeLineArtCBR(tmp_path / 'Book.cbr', ['01.jpg'])
+    page_table = saveAuto(tmp_path, cbr_file_path)
+
+    assert sorted(file_ext for file_ext, page_bytes in encoded) == ['.jpg', '.webp']
+    smallest = min(encoded, key = lambda encoded_page: len(encoded_page[1]))
+    save_file_path = apes.Path(page_table.save_paths[0])
+    assert 'Photographic' in page_table.save_formats[0]
+    assert save_file_path.suffix == smallest[0]
+    assert save_file_path.read_bytes() == smallest[1]
+
+
+def test_photographic_formats_pillow_cannot_save_are_skipped(tmp_path, zip_cbr_files, monkeypatch):
+    monkeypatch.setattr(apes, 'AUTO_PHOTO_FORMATS', [apes.JPG, ('Not A Format', '.notaformat')])
+    monkeypatch.setattr(apes, 'AUTO_PHOTO_COVERAGE', 1.1)
+    cbr_file_path = makeLineArtCBR(tmp_path / 'Book.cbr', ['01.jpg'])
+
+    page_table = saveAuto(tmp_path, cbr_file_path)
+
+    assert apes.Path(page_table.save_paths[0]).suffix == '.jpg'
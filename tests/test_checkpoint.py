@@ -0,0 +1,100 @@
+import pytest
+
+import auto_page_extract_edit_save as apes
+from conftest import make_cbr
+
+
+def newRun(tmp_path, checkpoint, description = 'Test'):
+    preset = {**apes.preset_options[0], apes.DESCRIPTION : description, apes.SAVE_DIR_PATH : str(tmp_path / 'out'),
+              apes.MODIFY_FILE_NAMES : [apes.INSERT_FILE_NAME, '-', apes.INSERT_PAGE_NUMBER]}
+    all_the_data = apes.changePreset(preset, {})
+    all_the_data[apes.LOG_DATA][apes.CHECKPOINT] = checkpoint
+    return all_the_data
+
+
+def makeInbox(tmp_path, total_archives = 4):
+    (tmp_path / 'in').mkdir()
+    for number in range(total_archives):
+        make_cbr(tmp_path / 'in' / f'c{number}.cbr', number + 1, (number * 40, 100, 50))
+    return tmp_path / 'in'
+
+
+def test_resume_skips_cbr_files_done(tmp_path, zip_cbr_files, monkeypatch):
+    inbox = makeInbox(tmp_path)
+    all_the_data = apes.findCBRFiles(inbox, newRun(tmp_path, apes.Checkpoint(tmp_path / 'run.checkpoint')))
+    extract_pages = apes.extractPages
+    def crashOnThirdCBRFile(all_the_data, cbr_file_path):
+        if cbr_file_path.name == 'c2.cbr':
+            raise RuntimeError('crash')
+        return extract_pages(all_the_data, cbr_file_path)
+    monkeypatch.setattr(apes, 'extractPages', crashOnThirdCBRFile)
+    with pytest.raises(RuntimeError):
+        apes.extractEditSavePages(all_the_data)
+    done = sorted(path.name for path, page_table in all_the_data[apes.LOG_DATA][apes.PAGE_DATA].items() if page_table.processed)
+    assert done and 'c2.cbr' not in done
+
+    checkpoint = apes.Checkpoint(tmp_path / 'run.checkpoint')
+    all_the_data = checkpoint.load(newRun(tmp_path, checkpoint))
+    all_the_data = apes.findCBRFiles(inbox, all_the_data)
+    page_data = all_the_data[apes.LOG_DATA][apes.PAGE_DATA]
+    assert sorted(path.name for path, page_table in page_data.items() if page_table.processed) == done
+
+    extracted = []
+    monkeypatch.setattr(apes, 'extractPages', lambda all_the_data, path: extracted.append(path.name) or extract_pages(all_the_data, path))
+    all_the_data = apes.extractEditSavePages(all_the_data)
+    assert sorted(extracted + done) == ['c0.cbr', 'c1.cbr', 'c2.cbr', 'c3.cbr']
+
+    # Same totals as a run that never stopped.
+    counters = all_the_data[apes.LOG_DATA][apes.RUN_COUNTERS]
+    assert (counters.archives_found, counters.archives_done, counters.pages_to_extract, counters.pages_done, counters.pages_saved) == (4, 4, 10, 10, 10)
+
+
+def test_one_record_added_for_each_cbr_file_done(tmp_path, zip_cbr_files):
+    checkpoint = apes.Checkpoint(tmp_path / 'run.checkpoint')
+    all_the_data = apes.findCBRFiles(makeInbox(tmp_path), newRun(tmp_path, checkpoint))
+    apes.extractEditSavePages(all_the_data)
+
+    records = checkpoint.readRecords()[0]
+    assert records[0]['version'] == apes.Checkpoint.VERSION
+    assert sorted(record['cbr_file_path'].name for record in records[1:]) == ['c0.cbr', 'c1.cbr', 'c2.cbr', 'c3.cbr']
+
+
+def test_record_cut_short_is_dropped(tmp_path, zip_cbr_files):
+    checkpoint_path = tmp_path / 'run.checkpoint'
+    all_the_data = apes.findCBRFiles(makeInbox(tmp_path), newRun(tmp_path, apes.Checkpoint(checkpoint_path)))
+    apes.extractEditSavePages(all_the_data)
+    all_the_data[apes.LOG_DATA][apes.CHECKPOINT].file.close()
+    with open(checkpoint_path, 'r+b') as checkpoint_file:
+        checkpoint_file.truncate(checkpoint_path.stat().st_size - 10)
+
+    checkpoint = apes.Checkpoint(checkpoint_path)
+    all_the_data = checkpoint.load(newRun(tmp_path, checkpoint))
+    assert len(all_the_data[apes.LOG_DATA][apes.PAGE_DATA]) == 3
+    checkpoint.file.close()
+    assert len(checkpoint.readRecords()[0]) == 4
+    assert checkpoint.readRecords()[1] == checkpoint_path.stat().st_size
+
+
+def test_resume_with_different_preset_is_refused(tmp_path, zip_cbr_files):
+    checkpoint_path = tmp_path / 'run.checkpoint'
+    all_the_data = apes.findCBRFiles(makeInbox(tmp_path, 1), newRun(tmp_path, apes.Checkpoint(checkpoint_path)))
+    apes.extractEditSavePages(all_the_data)
+
+    with pytest.raises(ValueError, match='different preset'):
+        apes.Checkpoint(checkpoint_path).load(newRun(tmp_path, None, 'Other'))
+
+    other_options = newRun(tmp_path, None)
+    other_options[apes.OVERWRITE_FILES] = not other_options.get(apes.OVERWRITE_FILES, False)
+    with pytest.raises(ValueError, match='different preset'):
+        apes.Checkpoint(checkpoint_path).load(other_options)
+
+
+def test_checkpoint_holding_other_classes_is_refused(tmp_path):
+    checkpoint = apes.Checkpoint(tmp_path / 'run.checkpoint')
+    checkpoint.file = open(checkpoint.path, 'wb')
+    checkpoint.writeRecord(checkpoint.getHeader(newRun(tmp_path, None)))
+    checkpoint.writeRecord({'cbr_file_path' : apes.datetime.now()})
+    checkpoint.file.close()
+
+    with pytest.raises(ValueError, match='Not part of a checkpoint: datetime.datetime'):
+        apes.Checkpoint(checkpoint.path).load(newRun(tmp_path, None))
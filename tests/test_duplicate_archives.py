@@ -0,0 +1,65 @@
+import os
+import shutil
+
+import auto_page_extract_edit_save as apes
+from conftest import make_cbr
+
+
+def newRun(tmp_path, options = {}):
+    preset = {apes.SAVE_DIR_PATH : str(tmp_path / 'out'), apes.MODIFY_FILE_NAMES : [apes.INSERT_FILE_NAME, '-', apes.INSERT_PAGE_NUMBER], **options}
+    return apes.changePreset(preset, {})
+
+
+def fingerprint(cbr_file_path):
+    with apes.rarfile.RarFile(cbr_file_path) as cbr_file:
+        return apes.getArchiveFingerprint(newRun(cbr_file_path.parent), cbr_file_path, cbr_file.infolist())
+
+
+def test_copies_have_the_same_fingerprint(tmp_path, zip_cbr_files):
+    first = make_cbr(tmp_path / 'first.cbr', 3)
+    copy = apes.Path(shutil.copy(first, tmp_path / 'copy.cbr'))
+    other = make_cbr(tmp_path / 'other.cbr', 3, (10, 20, 30))
+
+    assert fingerprint(first) == fingerprint(copy)
+    assert fingerprint(first)[0] == first.stat().st_size
+    assert fingerprint(first) != fingerprint(other)
+
+
+def test_copy_is_hard_linked_not_encoded_again(tmp_path, zip_cbr_files, monkeypatch):
+    first = make_cbr(tmp_path / 'first.cbr', 3)
+    copy = apes.Path(shutil.copy(first, tmp_path / 'copy.cbr'))
+    extracted = []
+    extract_pages = apes.extractPages
+    monkeypatch.setattr(apes, 'extractPages', lambda all_the_data, path: extracted.append(path) or extract_pages(all_the_data, path))
+
+    all_the_data = newRun(tmp_path)
+    for cbr_file_path in (first, copy):
+        all_the_data = apes.findCBRFiles(cbr_file_path, all_the_data)
+    page_data = all_the_data[apes.LOG_DATA][apes.PAGE_DATA]
+    assert page_data[copy].duplicate_of == first
+    assert all_the_data[apes.LOG_DATA][apes.ARCHIVE_FINGERPRINTS] == {page_data[first].fingerprint : first}
+
+    all_the_data = apes.extractEditSavePages(all_the_data)
+    assert extracted == [first]
+    for number in range(1, 4):
+        first_page = tmp_path / 'out' / 'Comic' / f'first-{number}.jpg'
+        copy_page = tmp_path / 'out' / 'Comic' / f'copy-{number}.jpg'
+        assert os.path.samefile(first_page, copy_page)
+    assert bytes(page_data[copy].save_details) == bytes([apes.NEW_SAVE] * 3)
+    assert all_the_data[apes.LOG_DATA][apes.RUN_COUNTERS].pages_saved == 6
+
+
+def test_copy_is_copied_if_it_cant_be_linked(tmp_path, zip_cbr_files, monkeypatch):
+    def link(source, destination):
+        raise OSError('Different Drives')
+    monkeypatch.setattr(apes.os, 'link', link)
+    first = make_cbr(tmp_path / 'first.cbr', 2)
+    copy = apes.Path(shutil.copy(first, tmp_path / 'copy.cbr'))
+    all_the_data = newRun(tmp_path)
+    for cbr_file_path in (first, copy):
+        all_the_data = apes.findCBRFiles(cbr_file_path, all_the_data)
+    apes.extractEditSavePages(all_the_data)
+
+    first_page, copy_page = tmp_path / 'out' / 'Comic' / 'first-1.jpg', tmp_path / 'out' / 'Comic' / 'copy-1.jpg'
+    assert not os.path.samefile(first_page, copy_page)
+    assert first_page.read_bytes() == copy_page.read_bytes()
@@ -0,0 +1,72 @@
+import io
+
+import pytest
+
+import auto_page_extract_edit_save as apes
+
+
+@pytest.fixture
+def noisy_page():
+    return apes.Image.effect_noise((300, 400), 40).convert('RGB')
+
+
+def encodedSize(image, image_format, **params):
+    buffer = io.BytesIO()
+    image.save(buffer, format=image_format, **params)
+    return len(buffer.getvalue())
+
+
+def test_jpeg_gets_highest_quality_that_fits(noisy_page):
+    target_size = encodedSize(noisy_page, 'JPEG', quality=60) + 1
+    page_bytes = apes.encodeToFileSize(noisy_page, 'JPEG', {}, target_size)
+    assert len(page_bytes) <= target_size
+    assert apes.Image.open(io.BytesIO(page_bytes)).format == 'JPEG'
+    assert encodedSize(noisy_page, 'JPEG', quality=65) > target_size
+
+
+def test_png_fits_with_fewer_colors(noisy_page):
+    target_size = encodedSize(noisy_page, 'PNG') // 2
+    page_bytes = apes.encodeToFileSize(noisy_page, 'PNG', {}, target_size)
+    assert len(page_bytes) <= target_size
+    assert apes.Image.open(io.BytesIO(page_bytes)).mode == 'P'
+
+
+def test_png_that_fits_keeps_all_colors(noisy_page):
+    page_bytes = apes.encodeToFileSize(noisy_page, 'PNG', {}, 10_000_000)
+    assert apes.Image.open(io.BytesIO(page_bytes)).mode == 'RGB'
+
+
+def test_smallest_file_when_nothing_fits(noisy_page, monkeypatch, capsys):
+    monkeypatch.setattr(apes, 'verbosity', apes.SHOW_ERRORS)
+    page_bytes = apes.encodeToFileSize(noisy_page, 'JPEG', {}, 100)
+    assert len(page_bytes) == encodedSize(noisy_page, 'JPEG', quality=5)
+    assert 'could not be made smaller' in capsys.readouterr().out
+
+
+def test_search_starts_where_last_page_fit(noisy_page, monkeypatch):
+    page_table = apes.PageTable(['01.jpg', '02.jpg'])
+    target_size = encodedSize(noisy_page, 'JPEG', quality=60) + 1
+    apes.encodeToFileSize(noisy_page, 'JPEG', {}, target_size, page_table)
+    assert apes.TARGET_SIZE_SETTINGS['JPEG'][1][page_table.encode_settings['JPEG']] == 60
+
+    # The same page again only needs the setting the last page used and the one above it.
+    qualities = []
+    save = apes.Image.Image.save
+    def saveCounted(image, fp, *args, **params):
+        qualities.append(params.get('quality'))
+        return save(image, fp, *args, **params)
+    monkeypatch.setattr(apes.Image.Image, 'save', saveCounted)
+    apes.encodeToFileSize(noisy_page, 'JPEG', {}, target_size, page_table)
+    assert sorted(qualities) == [60, 65]
+
+
+def test_tiny_page_still_has_a_target_size(noisy_page):
+    tiny_page = noisy_page.resize((10, 10))
+    all_the_data = {apes.IMAGE_SAVING_PARAMS : {apes.MAX_BYTES_PER_MEGAPIXEL : 1000}}
+    assert apes.getTargetFileSize(all_the_data, tiny_page) == 1
+    assert apes.getTargetFileSize({apes.IMAGE_SAVING_PARAMS : {apes.MAX_FILE_SIZE : 0.5}}, tiny_page) == 1
+    assert apes.getTargetFileSize({}, tiny_page) is None
+
+    # Encoded as small as it can be, not with the default settings.
+    page_bytes = apes.encodePage(all_the_data, tiny_page, '.jpg')
+    assert len(page_bytes) == encodedSize(tiny_page, 'JPEG', quality=5)
@@ -0,0 +1,28 @@
+import zipfile
+
+import auto_page_extract_edit_save as apes
+from conftest import make_page
+
+
+def makeCBRWithBadPage(cbr_file_path):
+    with zipfile.ZipFile(cbr_file_path, 'w') as cbr_file:
+        cbr_file.writestr('Comic/01.jpg', make_page())
+        cbr_file.writestr('Comic/02.jpg', b'not a page')
+        cbr_file.writestr('Comic/03.jpg', make_page())
+    return cbr_file_path
+
+
+def test_missing_patool_is_an_extraction_error(tmp_path, zip_cbr_files, monkeypatch):
+    monkeypatch.setattr(apes, 'patoolib', apes.LazyImport('patoolib_not_installed'))
+    cbr_file_path = makeCBRWithBadPage(tmp_path / 'Book.cbr')
+
+    preset = {**apes.preset_options[0], apes.SAVE_DIR_PATH : str(tmp_path / 'out')}
+    all_the_data = apes.findCBRFiles(cbr_file_path, apes.changePreset(preset, {}))
+    all_the_data = apes.extractEditSavePages(all_the_data)
+    page_table = all_the_data[apes.LOG_DATA][apes.PAGE_DATA][cbr_file_path]
+
+    assert page_table.failedExtraction(1)
+    assert 'patool is not installed' in page_table.extract_errors[1][-1]
+    assert sorted(page_table.save_paths) == [0, 2]
+    assert not all_the_data[apes.LOG_DATA].get(apes.TEMP_DIR)
+    assert all_the_data[apes.LOG_DATA][apes.RUN_COUNTERS].extract_errors == 1
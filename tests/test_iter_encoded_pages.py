@@ -0,0 +1,50 @@
+import io
+import zipfile
+
+import auto_page_extract_edit_save as apes
+from conftest import make_page
+
+
+def makeCBRBytes(pages):
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, 'w') as cbr_file:
+        for page_name, page_bytes in pages.items():
+            cbr_file.writestr(page_name, page_bytes)
+    return archive.getvalue()
+
+
+def test_pages_encoded_in_memory(tmp_path, zip_cbr_files, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cbr_bytes = makeCBRBytes({f'Comic/{number:02d}.jpg' : make_page((number * 50, 0, 0)) for number in range(1, 4)})
+    preset = {apes.CHANGE_IMAGE_FORMAT : apes.PNG, apes.MODIFY_FILE_NAMES : [apes.INSERT_PAGE_NUMBER]}
+    pages = list(apes.iterEncodedPages(io.BytesIO(cbr_bytes), preset, 'Book.cbr'))
+
+    assert [page_number for page_number, page_bytes, metadata in pages] == ['1', '2', '3']
+    page_number, page_bytes, metadata = pages[1]
+    assert apes.Image.open(io.BytesIO(page_bytes)).format == 'PNG'
+    assert (metadata['save_path'], metadata['width'], metadata['height'], metadata['saved']) == ('Comic/2.png', 60, 90, 'Encoded')
+    assert metadata['file'] == 'Comic/02.jpg'
+    assert not list(tmp_path.iterdir())
+
+
+def test_slices_given_separately(zip_cbr_files):
+    cbr_bytes = makeCBRBytes({'01.jpg' : make_page(), '02.png' : make_page(size = (60, 500), image_format = 'PNG')})
+    preset = {apes.SLICE_TALL_PAGES : 200, apes.MODIFY_FILE_NAMES : [apes.INSERT_PAGE_NUMBER]}
+    pages = list(apes.iterEncodedPages(cbr_bytes, preset))
+
+    assert [page_number for page_number, page_bytes, metadata in pages] == ['1', '2_1', '2_2', '2_3']
+    assert [metadata.get('slice') for page_number, page_bytes, metadata in pages] == [None, 1, 2, 3]
+    assert [apes.Image.open(io.BytesIO(page_bytes)).size for page_number, page_bytes, metadata in pages[1:]] == [(60, 200), (60, 200), (60, 100)]
+    assert [metadata['save_path'] for page_number, page_bytes, metadata in pages[1:]] == ['2_1.png', '2_2.png', '2_3.png']
+
+
+def test_pages_only_encoded_when_asked_for(zip_cbr_files, monkeypatch):
+    encoded = []
+    encode_page = apes.encodePage
+    monkeypatch.setattr(apes, 'encodePage', lambda *args: encoded.append(args[2]) or encode_page(*args))
+    pages = apes.iterEncodedPages(makeCBRBytes({f'{number:02d}.jpg' : make_page() for number in range(1, 4)}), {})
+
+    next(pages)
+    assert len(encoded) == 1
+    assert len(list(pages)) == 2
+    assert len(encoded) == 3
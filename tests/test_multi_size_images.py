@@ -0,0 +1,31 @@
+import io
+
+import pytest
+
+import auto_page_extract_edit_save as apes
+
+
+def saveICO(page, params = {}):
+    params = apes.getMultiSizeParams(page, '.ico', params)
+    buffer = io.BytesIO()
+    page.save(buffer, format = 'ICO', **params)
+    buffer.seek(0)
+    return apes.Image.open(buffer)
+
+
+def test_sizes_larger_than_page_are_left_out():
+    ico = saveICO(apes.Image.new('RGB', (100, 60), (10, 20, 30)))
+    # Each fit within a size, keeping the page's aspect ratio.
+    assert sorted(ico.info['sizes']) == [(16, 9), (24, 14), (32, 19), (48, 29)]
+
+
+@pytest.mark.parametrize('size, ico_size', [((10, 12), (10, 12)), ((15, 300), (13, 256))])
+def test_page_smaller_than_every_size_is_saved_at_its_own_size(size, ico_size):
+    ico = saveICO(apes.Image.new('RGB', size, (10, 20, 30)))
+    ico.load()
+    assert ico.size == ico_size
+
+
+def test_each_size_made_from_the_next_larger():
+    frames = apes.buildImagePyramid(apes.Image.new('RGB', (1000, 1000)), [(16, 16), (256, 256), (32, 32)])
+    assert [frame.size for frame in frames] == [(256, 256), (32, 32), (16, 16)]
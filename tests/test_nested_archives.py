@@ -0,0 +1,69 @@
+import io
+import zipfile
+
+import auto_page_extract_edit_save as apes
+from conftest import make_page
+
+
+def zipBytes(files):
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, 'w') as zip_file:
+        for file_name, file_bytes in files.items():
+            zip_file.writestr(file_name, file_bytes)
+    return archive.getvalue()
+
+
+def makeNestedCBR(cbr_file_path):
+    cbr_file_path.write_bytes(zipBytes({
+        '00 Cover.jpg' : make_page((255, 0, 0)),
+        'Chapter 02.zip' : zipBytes({'02.jpg' : make_page((0, 0, 20)), '01.jpg' : make_page((0, 0, 10))}),
+        'Chapter 01.cbz' : zipBytes({'Chapter 01/02.jpg' : make_page((0, 20, 0)), 'Chapter 01/01.jpg' : make_page((0, 10, 0))}),
+        'Chapter 03.zip' : zipBytes({'Part 2.zip' : zipBytes({'01.jpg' : make_page((5, 5, 5))}), '01.jpg' : make_page((6, 6, 6))}),
+        'Broken.zip' : b'PK\x03\x04 not an archive',
+    }))
+    return cbr_file_path
+
+
+def newRun(tmp_path, options = {}):
+    preset = {apes.SAVE_DIR_PATH : str(tmp_path / 'out'), apes.MODIFY_FILE_NAMES : [apes.INSERT_PAGE_NUMBER], **options}
+    return apes.changePreset(preset, {})
+
+
+def test_nested_pages_are_listed_in_sorted_order(tmp_path, zip_cbr_files):
+    cbr_file_path = makeNestedCBR(tmp_path / 'Book.cbr')
+    all_the_data = apes.findCBRFiles(cbr_file_path, newRun(tmp_path))
+    page_table = all_the_data[apes.LOG_DATA][apes.PAGE_DATA][cbr_file_path]
+
+    assert page_table.page_names == [
+        '00 Cover.jpg',
+        'Chapter 01.cbz/Chapter 01/01.jpg',
+        'Chapter 01.cbz/Chapter 01/02.jpg',
+        'Chapter 02.zip/01.jpg',
+        'Chapter 02.zip/02.jpg',
+        'Chapter 03.zip/01.jpg',
+        'Chapter 03.zip/Part 2.zip/01.jpg',
+    ]
+    assert page_table.nested_pages[6] == ('Chapter 03.zip', 'Part 2.zip', '01.jpg')
+    assert 0 not in page_table.nested_pages
+
+
+def test_nested_pages_are_read_without_temporary_files(tmp_path, zip_cbr_files, monkeypatch):
+    def temporaryDirectory(*args, **kwargs):
+        raise AssertionError('Nested archives are read in memory')
+    monkeypatch.setattr(apes.tempfile, 'TemporaryDirectory', temporaryDirectory)
+    opened = []
+    open_nested_archive = apes.openNestedArchive
+    monkeypatch.setattr(apes, 'openNestedArchive', lambda archive_bytes: opened.append(len(archive_bytes)) or open_nested_archive(archive_bytes))
+
+    cbr_file_path = makeNestedCBR(tmp_path / 'Book.cbr')
+    all_the_data = apes.findCBRFiles(cbr_file_path, newRun(tmp_path))
+    opened.clear()
+    all_the_data = apes.extractEditSavePages(all_the_data)
+    page_table = all_the_data[apes.LOG_DATA][apes.PAGE_DATA][cbr_file_path]
+
+    assert not page_table.extract_errors
+    assert len(page_table.save_paths) == 7
+    # Each nested archive is opened once, it's pages read one after another.
+    assert len(opened) == 4
+    saved_page = apes.Image.open(page_table.save_paths[3])
+    assert saved_page.convert('RGB').getpixel((0, 0))[2] < 15
@@ -0,0 +1,27 @@
+import io
+
+import pytest
+
+import auto_page_extract_edit_save as apes
+from conftest import make_page
+
+
+def test_pillow_keeps_its_decompression_bomb_check():
+    assert apes.Image.MAX_IMAGE_PIXELS == apes.max_image_pixels
+
+
+def test_page_larger_than_max_image_pixels_is_refused(monkeypatch):
+    monkeypatch.setattr(apes, 'max_image_pixels', 60 * 90 - 1)
+    with pytest.raises(ValueError, match='Page Too Large'):
+        apes.openImage(io.BytesIO(make_page(size = (60, 90))))
+
+
+def test_decompression_bomb_is_refused_as_too_large(monkeypatch):
+    monkeypatch.setattr(apes.Image, 'MAX_IMAGE_PIXELS', 1000)
+    with pytest.raises(ValueError, match='Page Too Large'):
+        apes.openImage(io.BytesIO(make_page(size = (60, 90))))
+
+
+def test_page_within_max_image_pixels_is_opened(monkeypatch):
+    monkeypatch.setattr(apes, 'max_image_pixels', 60 * 90)
+    assert apes.openImage(io.BytesIO(make_page(size = (60, 90)))).size == (60, 90)
@@ -0,0 +1,117 @@
+import socket
+import threading
+import time
+
+import pytest
+
+from conftest import make_cbr
+
+pjs = pytest.importorskip('page_job_server')
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason = 'Unix domain sockets are not supported')
+
+
+@pytest.fixture
+def server(tmp_path, zip_cbr_files):
+    socket_path = tmp_path / 'server.sock'
+    server_thread = threading.Thread(target = pjs.runServer, args = (socket_path, 1), daemon = True)
+    server_thread.start()
+    for _ in range(100):
+        if socket_path.exists():
+            break
+        time.sleep(0.05)
+    yield socket_path, server_thread
+    if server_thread.is_alive():
+        pjs.sendJob({'command' : 'shutdown'}, socket_path)
+        server_thread.join(5)
+
+
+def test_idle_connection_does_not_hold_up_jobs(tmp_path, server):
+    socket_path, server_thread = server
+    cbr_file_path = make_cbr(tmp_path / 'Book.cbr', 2)
+
+    # With one worker, an idle connection read on the pool would keep this job from ever running.
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as idle_connection:
+        idle_connection.connect(str(socket_path))
+        response = pjs.sendJob({'archive_path' : str(cbr_file_path), 'preset' : {'SAVE_DIR_PATH' : str(tmp_path / 'out')}}, socket_path)
+
+    assert response['ok'], response.get('error')
+    assert len(response['pages']) == 2
+
+
+def test_shutdown_with_open_connection(server):
+    socket_path, server_thread = server
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as idle_connection:
+        idle_connection.connect(str(socket_path))
+        assert pjs.sendJob({'command' : 'shutdown'}, socket_path)['ok']
+        server_thread.join(5)
+        assert not server_thread.is_alive()
+
+    assert not socket_path.exists()
+
+
+def test_socket_is_only_for_this_user(server):
+    socket_path, server_thread = server
+    assert socket_path.stat().st_mode & 0o077 == 0
+
+
+def test_progress_is_kept_for_each_thread():
+    apes = pjs.apes
+    counters = apes.RunCounters()
+    apes.progress.start(counters)
+    try:
+        seen = []
+        other_thread = threading.Thread(target = lambda: seen.append(apes.progress.counters))
+        other_thread.start()
+        other_thread.join()
+        assert seen == [None]
+        assert apes.progress.counters is counters
+    finally:
+        apes.progress.finish()
+
+
+def test_jobs_saving_to_the_same_directory_run_one_at_a_time(tmp_path, zip_cbr_files, monkeypatch):
+    apes = pjs.apes
+    extract_edit_save_pages = apes.extractEditSavePages
+    running = []
+    overlapped = []
+
+    def slowExtractEditSavePages(all_the_data):
+        running.append(True)
+        overlapped.append(len(running) > 1)
+        time.sleep(0.2)
+        try:
+            return extract_edit_save_pages(all_the_data)
+        finally:
+            running.pop()
+
+    monkeypatch.setattr(apes, 'extractEditSavePages', slowExtractEditSavePages)
+
+    def runJobs(save_dirs):
+        responses = []
+        jobs = [
+            threading.Thread(target = lambda number = number, save_dir = save_dir: responses.append(pjs.runJob({
+                'archive_path' : str(make_cbr(tmp_path / f'Book {number}.cbr', 2)),
+                'preset' : {'SAVE_DIR_PATH' : str(save_dir), 'KEEP_FILE_PATHS_INTACT' : False}
+            })))
+            for number, save_dir in enumerate(save_dirs)
+        ]
+        for job in jobs:
+            job.start()
+        for job in jobs:
+            job.join()
+        assert len(responses) == len(save_dirs) and all(response['ok'] for response in responses)
+
+    runJobs([tmp_path / 'out', tmp_path / 'other' / '..' / 'out'])
+    assert overlapped == [False, False]
+
+    overlapped.clear()
+    runJobs([tmp_path / 'a', tmp_path / 'b'])
+    assert overlapped == [False, True]
+
+
+def test_save_directory_locks_are_taken_in_order(tmp_path):
+    locks = pjs.getSaveDirectoryLocks([tmp_path / 'b', tmp_path / 'a', tmp_path / 'a' / '..' / 'b'])
+    assert len(locks) == 2
+    assert locks == pjs.getSaveDirectoryLocks([tmp_path / 'a', tmp_path / 'b'])
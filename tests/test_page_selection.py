@@ -0,0 +1,63 @@
+import pytest
+
+import auto_page_extract_edit_save as apes
+
+
+def selectPages(pages, total_pages = 10):
+    return list(apes.compilePageSelection(pages, total_pages))
+
+
+@pytest.mark.parametrize('pages, page_indexes', [
+    ('3', [2]),
+    ('-1', [9]),
+    ('2-4', [1, 2, 3]),
+    ('4-2', [1, 2, 3]),
+    ('0-2', [0, 1]),
+    ('0:5', [0, 1, 2, 3, 4]),
+    (':3', [0, 1, 2]),
+    ('8:', [7, 8, 9]),
+    ('-3:-1', [7, 8, 9]),
+    ('odd', [0, 2, 4, 6, 8]),
+    ('even', [1, 3, 5, 7, 9]),
+    ('every 4th', [3, 7]),
+    ('every 4th from 1', [0, 4, 8]),
+    ('every 3rd from -2', [8]),
+    ('first, last', [0, 9]),
+    ('all, !1, !-1', [1, 2, 3, 4, 5, 6, 7, 8]),
+    ('5, 1-3, 2', [4, 0, 1, 2]),
+])
+def test_selection_terms(pages, page_indexes):
+    assert selectPages(pages) == page_indexes
+
+
+@pytest.mark.parametrize('pages, page_indexes', [
+    ((2, 4), [1, 2, 3]),
+    ((-2, None), [8, 9]),
+    ([1, 3, -1], [0, 2, 9]),
+    (3, [2]),
+    (None, list(range(10))),
+])
+def test_ranges_lists_and_single_pages(pages, page_indexes):
+    assert selectPages(pages) == page_indexes
+
+
+@pytest.mark.parametrize('pages, page_indexes', [
+    ('11', []),
+    ('-11', []),
+    ('0', []),
+    ('8-20', [7, 8, 9]),
+    ('-20:2', [0, 1]),
+    ('every 4th from 20', []),
+    ([0, 2, 11], [1]),
+])
+def test_out_of_bounds_pages(pages, page_indexes):
+    assert selectPages(pages) == page_indexes
+
+
+def test_unknown_term_is_disregarded(capsys):
+    assert selectPages('3, sometimes') == [2]
+    assert '"sometimes" is not a proper page selection' in capsys.readouterr().out
+
+
+def test_no_pages():
+    assert selectPages('all', 0) == []
@@ -0,0 +1,60 @@
+import pytest
+
+import auto_page_extract_edit_save as apes
+from conftest import make_cbr
+
+
+def test_page_table_has_no_dict():
+    page_table = apes.PageTable(['01.jpg'])
+    with pytest.raises(AttributeError):
+        page_table.other = None
+
+
+def test_page_names_are_interned():
+    names = [''.join(['Comic/', '01.jpg']), ''.join(['Comic/', '01.jpg'])]
+    first, other = apes.PageTable(names[:1]), apes.PageTable(names[1:])
+    assert first.page_names[0] is other.page_names[0]
+
+
+def test_save_details_and_errors():
+    page_table = apes.PageTable(['01.jpg', '02.jpg', '03.jpg'])
+    page_table.setSaveDetail(1, apes.SAVE_ERROR, 'Disk Full')
+    assert bytes(page_table.save_details) == bytes([apes.NO_SAVE_DETAILS, apes.SAVE_ERROR, apes.NO_SAVE_DETAILS])
+    assert page_table.save_errors == {1 : 'Disk Full'}
+
+    # Errors are only kept for pages that have one.
+    page_table.setSaveDetail(1, apes.NEW_SAVE)
+    assert page_table.save_errors == {}
+
+
+def test_extraction_failed_only_after_both_methods():
+    page_table = apes.PageTable(['01.jpg'])
+    page_table.extract_errors[0] = ['rarfile']
+    assert not page_table.failedExtraction(0)
+    page_table.extract_errors[0].append('patool')
+    assert page_table.failedExtraction(0)
+
+
+def test_times_add_to_page_and_cbr_file():
+    page_table = apes.PageTable(['01.jpg', '02.jpg'])
+    page_table.addTime(apes.TIME_EXTRACT, (1.0, 0.5), 0)
+    page_table.addTime(apes.TIME_SAVE, (2.0, 1.0), 0)
+    page_table.addTime(apes.TIME_EXTRACT, (3.0, 1.5), 1)
+    page_table.addTime(apes.TIME_LIST, (0.25, 0.25))
+
+    assert page_table.getPageTime(0) == (3.0, 1.5)
+    assert page_table.archive_times[apes.TIME_EXTRACT] == [4.0, 2.0]
+    assert page_table.page_times[1] == {apes.TIME_EXTRACT : [3.0, 1.5]}
+    assert page_table.archive_times[apes.TIME_LIST] == [0.25, 0.25]
+
+
+def test_log_numbers_come_from_run_counters(tmp_path, zip_cbr_files):
+    cbr_file_path = make_cbr(tmp_path / 'Book.cbr', 3)
+    preset = {apes.SAVE_DIR_PATH : str(tmp_path / 'out'), apes.PAGES_TO_EXTRACT : [1, 3]}
+    all_the_data = apes.findCBRFiles(cbr_file_path, apes.changePreset(preset, {}))
+    all_the_data = apes.extractEditSavePages(all_the_data)
+
+    assert apes.getLogNumbers(all_the_data) == (2, 0, 2, 0, 0)
+    page_table = all_the_data[apes.LOG_DATA][apes.PAGE_DATA][cbr_file_path]
+    assert sorted(page_table.save_paths) == [0, 2]
+    assert page_table.isComplete()
@@ -0,0 +1,63 @@
+import auto_page_extract_edit_save as apes
+from conftest import make_cbr
+
+
+def planRun(tmp_path, cbr_file_paths, options = {}):
+    preset = {apes.SAVE_DIR_PATH : str(tmp_path / 'out'), **options}
+    all_the_data = apes.changePreset(preset, {})
+    for cbr_file_path in cbr_file_paths:
+        all_the_data = apes.findCBRFiles(cbr_file_path, all_the_data)
+        all_the_data = apes.planSavePaths(all_the_data, cbr_file_path)
+    return all_the_data
+
+
+def plannedNames(all_the_data, cbr_file_path):
+    page_table = all_the_data[apes.LOG_DATA][apes.PAGE_DATA][cbr_file_path]
+    return [page_table.save_plan[page_index][3].name for page_index in page_table.save_plan]
+
+
+def test_conflicts_are_renamed(tmp_path, zip_cbr_files):
+    first = make_cbr(tmp_path / 'first.cbr', 2)
+    other = make_cbr(tmp_path / 'other.cbr', 2, (10, 20, 30))
+    all_the_data = planRun(tmp_path, [first, other], {apes.RESOLVE_NAME_CONFLICTS : True})
+
+    assert plannedNames(all_the_data, first) == ['01.jpg', '02.jpg']
+    assert plannedNames(all_the_data, other) == ['01 (2).jpg', '02 (2).jpg']
+
+    all_the_data = apes.extractEditSavePages(all_the_data)
+    assert sorted(path.name for path in (tmp_path / 'out' / 'Comic').iterdir()) == ['01 (2).jpg', '01.jpg', '02 (2).jpg', '02.jpg']
+
+
+def test_conflicts_are_reported_before_extracting(tmp_path, zip_cbr_files, capsys):
+    first = make_cbr(tmp_path / 'first.cbr', 2)
+    other = make_cbr(tmp_path / 'other.cbr', 2, (10, 20, 30))
+    all_the_data = planRun(tmp_path, [first, other])
+
+    assert plannedNames(all_the_data, other) == ['01.jpg', '02.jpg']
+    output = capsys.readouterr().out
+    assert 'Page 1 and page 1 of "first.cbr" will both be saved to' in output
+    assert '2 page(s) of "other.cbr" will be saved over other pages' in output
+    assert not (tmp_path / 'out' / 'Comic' / '01.jpg').exists()
+
+
+def test_each_directory_is_listed_once(tmp_path, zip_cbr_files, monkeypatch):
+    listed = []
+    list_file_names = apes.ListFileNames
+    monkeypatch.setattr(apes, 'ListFileNames', lambda directory: listed.append(directory) or list_file_names(directory))
+    cbr_file_path = make_cbr(tmp_path / 'Book.cbr', 5)
+    all_the_data = planRun(tmp_path, [cbr_file_path])
+    apes.extractEditSavePages(all_the_data)
+
+    assert listed == [tmp_path / 'out' / 'Comic']
+    assert len(list((tmp_path / 'out' / 'Comic').iterdir())) == 5
+
+
+def test_existing_files_are_not_saved_over(tmp_path, zip_cbr_files):
+    (tmp_path / 'out' / 'Comic').mkdir(parents = True)
+    (tmp_path / 'out' / 'Comic' / '02.jpg').write_bytes(b'keep')
+    cbr_file_path = make_cbr(tmp_path / 'Book.cbr', 2)
+    all_the_data = apes.extractEditSavePages(planRun(tmp_path, [cbr_file_path]))
+    page_table = all_the_data[apes.LOG_DATA][apes.PAGE_DATA][cbr_file_path]
+
+    assert [page_table.save_details[page_index] for page_index in (0, 1)] == [apes.NEW_SAVE, apes.NOT_SAVED]
+    assert (tmp_path / 'out' / 'Comic' / '02.jpg').read_bytes() == b'keep'
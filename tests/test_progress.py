@@ -0,0 +1,72 @@
+import json
+
+import auto_page_extract_edit_save as apes
+from conftest import make_cbr
+
+
+class Clock:
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def startProgress(monkeypatch, clock):
+    monkeypatch.setattr(apes, 'perf_counter', clock)
+    monkeypatch.setattr(apes, 'verbosity', apes.SHOW_PROGRESS)
+    monkeypatch.setattr(apes, 'progress_as_json', True)
+    monkeypatch.setattr(apes, 'progress_interval', 0.5)
+    counters = apes.RunCounters()
+    counters.archives_found, counters.pages_to_extract = 2, 40
+    progress = apes.Progress()
+    progress.start(counters)
+    return progress, counters
+
+
+def test_progress_is_shown_at_most_every_interval(monkeypatch, capsys):
+    clock = Clock()
+    progress, counters = startProgress(monkeypatch, clock)
+    for _ in range(20):
+        clock.now += 0.125
+        counters.pages_done += 1
+        progress.update()
+
+    statuses = [json.loads(line) for line in capsys.readouterr().err.splitlines()]
+    assert [status['pages_done'] for status in statuses] == [1, 5, 9, 13, 17]
+
+
+def test_progress_as_json(monkeypatch, capsys):
+    clock = Clock()
+    progress, counters = startProgress(monkeypatch, clock)
+    clock.now += 4.0
+    counters.archives_done, counters.pages_done = 1, 20
+    counters.bytes_read, counters.bytes_written = 8 * 1048576, 4 * 1048576
+    progress.finish()
+
+    assert json.loads(capsys.readouterr().err) == {
+        'archives_done' : 1, 'archives_found' : 2, 'pages_done' : 20, 'pages_to_extract' : 40,
+        'pages_per_second' : 5.0, 'mb_read_per_second' : 2.0, 'mb_written_per_second' : 1.0,
+        'elapsed_seconds' : 4.0, 'eta_seconds' : 4.0
+    }
+    assert progress.counters is None
+
+
+def test_no_progress_shown_below_progress_verbosity(monkeypatch, capsys):
+    progress, counters = startProgress(monkeypatch, Clock())
+    monkeypatch.setattr(apes, 'verbosity', apes.SHOW_ERRORS)
+    progress.update(force = True)
+    assert capsys.readouterr() == ('', '')
+
+
+def test_pages_only_printed_when_showing_everything(tmp_path, zip_cbr_files, monkeypatch, capsys):
+    monkeypatch.setattr(apes, 'progress_as_json', True)
+    for level, out_dir in ((apes.SHOW_PROGRESS, 'progress'), (apes.SHOW_EVERYTHING, 'everything')):
+        monkeypatch.setattr(apes, 'verbosity', level)
+        cbr_file_path = make_cbr(tmp_path / 'Book.cbr', 2)
+        all_the_data = apes.findCBRFiles(cbr_file_path, apes.changePreset({apes.SAVE_DIR_PATH : str(tmp_path / out_dir)}, {}))
+        apes.extractEditSavePages(all_the_data)
+        output = capsys.readouterr()
+        assert ('Saving Page' in output.out) == (level == apes.SHOW_EVERYTHING)
+        assert json.loads(output.err.splitlines()[-1])['pages_done'] == 2
@@ -0,0 +1,42 @@
+import auto_page_extract_edit_save as apes
+from conftest import make_cbr
+
+
+def runWithLog(tmp_path, cbr_file_path, monkeypatch, options = {}):
+    monkeypatch.setattr(apes, 'create_log_file', True)
+    preset = {apes.SAVE_DIR_PATH : str(tmp_path / 'out'), **options}
+    all_the_data = apes.changePreset(preset, {})
+    apes.openRunLog(all_the_data, tmp_path / 'run.jsonl')
+    all_the_data = apes.findCBRFiles(cbr_file_path, all_the_data)
+    return apes.extractEditSavePages(all_the_data)
+
+
+def test_report_of_run_stopped_early_counts_failed_combine_once(tmp_path, zip_cbr_files, monkeypatch):
+    def combinePages(*args, **kwargs):
+        raise ValueError('Test')
+    monkeypatch.setattr(apes, 'combinePages', combinePages)
+    cbr_file_path = make_cbr(tmp_path / 'Book.cbr', 4)
+    all_the_data = runWithLog(tmp_path, cbr_file_path, monkeypatch, {apes.COMBINE_PAGES : [(apes.HORIZONTAL, 2, 4)]})
+    assert all_the_data[apes.LOG_DATA][apes.RUN_COUNTERS].edit_errors == 1
+
+    # Stopped before the "end" record was written.
+    all_the_data[apes.LOG_DATA][apes.RUN_LOG].close()
+    assert not any(record['record'] == 'end' for record in apes.readRunLog(tmp_path / 'run.jsonl'))
+
+    log_file_path = apes.createTextReport(tmp_path / 'run.jsonl', tmp_path / 'log.txt')
+    report = log_file_path.read_text(encoding = 'utf-8')
+    assert '- Total Pages Extracted: 4' in report
+    assert '- Total Page Edits That Failed*: 1' in report
+    # Shown on both pages, counted once.
+    assert report.count('ERROR: Image Combining Error: Test') == 2
+
+
+def test_report_of_finished_run_uses_run_counters(tmp_path, zip_cbr_files, monkeypatch):
+    cbr_file_path = make_cbr(tmp_path / 'Book.cbr', 3)
+    all_the_data = runWithLog(tmp_path, cbr_file_path, monkeypatch)
+    all_the_data[apes.LOG_DATA][apes.RUN_COUNTERS].pages_saved = 7
+    run_log_path = apes.closeRunLog(all_the_data)
+
+    report = apes.createTextReport(run_log_path, tmp_path / 'log.txt').read_text(encoding = 'utf-8')
+    assert '- Total Pages Saved: 7' in report
+    assert report.count('    Page ') == 3
@@ -0,0 +1,45 @@
+import auto_page_extract_edit_save as apes
+from conftest import make_cbr
+
+
+def savePDF(tmp_path, cbr_file_path, monkeypatch, options = {}):
+    pages_held = []
+    add_image_page = apes.PDFWriter.addImagePage
+    def addImagePage(pdf_writer, *args):
+        pages_held.append(len(all_the_data[apes.IMAGE_DATA]))
+        return add_image_page(pdf_writer, *args)
+    monkeypatch.setattr(apes.PDFWriter, 'addImagePage', addImagePage)
+
+    preset = {apes.CHANGE_IMAGE_FORMAT : apes.PDF, apes.SAVE_DIR_PATH : str(tmp_path / 'out'), **options}
+    all_the_data = apes.changePreset(preset, {})
+    all_the_data = apes.findCBRFiles(cbr_file_path, all_the_data)
+    all_the_data = apes.extractEditSavePages(all_the_data)
+    assert all_the_data[apes.LOG_DATA][apes.RUN_COUNTERS].pages_done == len(all_the_data[apes.LOG_DATA][apes.PAGE_DATA][cbr_file_path].page_indexes)
+    return all_the_data[apes.LOG_DATA][apes.PAGE_DATA][cbr_file_path], pages_held
+
+
+def test_one_page_held_at_a_time(tmp_path, zip_cbr_files, monkeypatch):
+    cbr_file_path = make_cbr(tmp_path / 'Book.cbr', 5)
+    page_table, pages_held = savePDF(tmp_path, cbr_file_path, monkeypatch)
+
+    assert pages_held == [1] * 5
+    pdf_file_path = apes.Path(page_table.save_paths[0])
+    assert pdf_file_path.suffix == '.pdf'
+    assert pdf_file_path.read_bytes().startswith(b'%PDF')
+    assert set(page_table.save_paths.values()) == {str(pdf_file_path)}
+
+
+def test_pages_combined_are_held_together(tmp_path, zip_cbr_files, monkeypatch):
+    cbr_file_path = make_cbr(tmp_path / 'Book.cbr', 5)
+    page_table, pages_held = savePDF(tmp_path, cbr_file_path, monkeypatch, {apes.COMBINE_PAGES : [(apes.HORIZONTAL, 2, 4)]})
+
+    # Page 4 is combined into page 2 and not saved on it's own.
+    assert sorted(page_table.save_paths) == [0, 1, 2, 4]
+    assert max(pages_held) == 1
+    assert len(pages_held) == 4
+
+
+def test_pdf_named_after_cbr_file_when_name_is_only_page_numbers(tmp_path, zip_cbr_files, monkeypatch):
+    cbr_file_path = make_cbr(tmp_path / 'Book.cbr', 2)
+    page_table, pages_held = savePDF(tmp_path, cbr_file_path, monkeypatch, {apes.MODIFY_FILE_NAMES : [apes.INSERT_PAGE_NUMBER]})
+    assert apes.Path(page_table.save_paths[0]).name == 'Book.pdf'
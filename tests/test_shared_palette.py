@@ -0,0 +1,47 @@
+import pytest
+
+import auto_page_extract_edit_save as apes
+from conftest import make_cbr
+
+
+@pytest.mark.parametrize('image_format', [apes.GIF, apes.PNG])
+def test_every_page_shares_one_palette(tmp_path, zip_cbr_files, monkeypatch, image_format):
+    palettes_made = []
+    quantize = apes.Image.Image.quantize
+    def quantizeCounted(image, *args, **kwargs):
+        if 'palette' not in kwargs:
+            palettes_made.append(image.size)
+        return quantize(image, *args, **kwargs)
+    monkeypatch.setattr(apes.Image.Image, 'quantize', quantizeCounted)
+    shared_palettes = set()
+    get_shared_palette = apes.getSharedPalette
+    def getSharedPalette(*args):
+        palette = get_shared_palette(*args)
+        shared_palettes.add(id(palette))
+        return palette
+    monkeypatch.setattr(apes, 'getSharedPalette', getSharedPalette)
+
+    cbr_file_path = make_cbr(tmp_path / 'Book.cbr', 5)
+    preset = {apes.SAVE_DIR_PATH : str(tmp_path / 'out'), apes.CHANGE_IMAGE_FORMAT : image_format,
+              apes.IMAGE_SAVING_PARAMS : {apes.SHARED_PALETTE : 16}}
+    all_the_data = apes.findCBRFiles(cbr_file_path, apes.changePreset(preset, {}))
+    all_the_data = apes.extractEditSavePages(all_the_data)
+    page_table = all_the_data[apes.LOG_DATA][apes.PAGE_DATA][cbr_file_path]
+
+    # One palette made and used for every page.
+    assert len(palettes_made) == 1
+    assert len(shared_palettes) == 1
+    saved_pages = [apes.Image.open(page_table.save_paths[page_index]) for page_index in range(5)]
+    assert all(saved_page.mode == 'P' for saved_page in saved_pages)
+    # Pages are sampled from across the CBR file, so every page keeps it's own color.
+    colors = [saved_page.convert('RGB').getcolors() for saved_page in saved_pages]
+    assert all(len(page_colors) == 1 for page_colors in colors)
+    assert len({page_colors[0][1] for page_colors in colors}) == 5
+    assert page_table.palette is None
+
+
+def test_pages_with_transparency_keep_their_own_colors(zip_cbr_files):
+    all_the_data = apes.changePreset({apes.IMAGE_SAVING_PARAMS : {apes.SHARED_PALETTE : True}}, {})
+    page = apes.Image.new('RGBA', (10, 10), (10, 20, 30, 100))
+    assert apes.applySharedPalette(all_the_data, apes.PageTable(['01.png']), page, '.png') is page
+    assert apes.applySharedPalette(all_the_data, apes.PageTable(['01.jpg']), page.convert('RGB'), '.jpg').mode == 'RGB'
@@ -0,0 +1,73 @@
+import os
+import signal
+import subprocess
+import sys
+import time
+
+from conftest import ROOT_DIR, make_cbr
+
+# A worker processing CBR files (see make_cbr) in a directory, sharing the work through a lease directory.
+# Each CBR file takes at least "delay" seconds so a worker can be stopped mid-run.
+WORKER_SCRIPT = '''
+import sys, time
+sys.path.insert(0, sys.argv[1])
+from benchmark_pipeline import ZipRarFile
+import auto_page_extract_edit_save as apes
+root, expiry, delay = apes.Path(sys.argv[2]), float(sys.argv[3]), float(sys.argv[4])
+apes.rarfile.RarFile = ZipRarFile
+apes.verbosity = apes.SHOW_ERRORS
+apes.create_log_file = False
+save_pages = apes.savePages
+def slowSavePages(all_the_data, cbr_file_path):
+    print(f'start {cbr_file_path.name}', flush=True)
+    time.sleep(delay)
+    all_the_data = save_pages(all_the_data, cbr_file_path)
+    print(f'done {cbr_file_path.name}', flush=True)
+    return all_the_data
+apes.savePages = slowSavePages
+all_the_data = apes.changePreset({**apes.preset_options[0], apes.SAVE_DIR_PATH : str(root / "out"), apes.MODIFY_FILE_NAMES : [apes.INSERT_FILE_NAME, "-", apes.INSERT_PAGE_NUMBER]}, {})
+all_the_data[apes.LOG_DATA][apes.WORK_LEASES] = apes.WorkLeases(root / "leases", expiry)
+all_the_data = apes.findCBRFiles(root / "in", all_the_data)
+all_the_data = apes.extractEditSavePages(all_the_data)
+all_the_data[apes.LOG_DATA][apes.WORK_LEASES].close()
+'''
+
+
+def startWorker(root, expiry, delay):
+    return subprocess.Popen(
+        [sys.executable, '-c', WORKER_SCRIPT, str(ROOT_DIR), str(root), str(expiry), str(delay)],
+        stdout=subprocess.PIPE, text=True, cwd=ROOT_DIR
+    )
+
+
+def makeInbox(root, total_archives):
+    (root / 'in').mkdir()
+    for number in range(total_archives):
+        make_cbr(root / 'in' / f'c{number}.cbr', 2, (number * 30, 100, 50))
+
+
+def test_workers_share_cbr_files(tmp_path):
+    makeInbox(tmp_path, 6)
+    workers = [startWorker(tmp_path, 30.0, 0.1) for _ in range(3)]
+    outputs = [worker.communicate(timeout=120)[0] for worker in workers]
+    done = [line.split()[1] for output in outputs for line in output.splitlines() if line.startswith('done')]
+    assert sorted(done) == [f'c{number}.cbr' for number in range(6)]
+    assert all(worker.returncode == 0 for worker in workers)
+
+
+def test_cbr_file_of_killed_worker_is_taken_over(tmp_path):
+    makeInbox(tmp_path, 3)
+    killed = startWorker(tmp_path, 2.0, 60.0)
+    assert killed.stdout.readline().startswith('start')
+    
+    survivor = startWorker(tmp_path, 2.0, 0.1)
+    time.sleep(0.5)
+    os.kill(killed.pid, signal.SIGKILL)
+    killed.wait()
+    
+    output = survivor.communicate(timeout=120)[0]
+    done = [line.split()[1] for line in output.splitlines() if line.startswith('done')]
+    assert sorted(done) == ['c0.cbr', 'c1.cbr', 'c2.cbr']
+    assert survivor.returncode == 0
+    assert len(list((tmp_path / 'leases').glob('*.done'))) == 3
+    assert not list((tmp_path / 'leases').glob('*.lease'))
@@ -0,0 +1,75 @@
+from pathlib import Path
+
+import pytest
+
+import common_functions as cf
+
+
+PAGE_NAMES = ['Page 100.jpg', 'Page 9.jpg', 'Page 10.jpg', 'Cover.jpg', 'Page 9a.jpg']
+
+
+@pytest.mark.parametrize('sort_method, sorted_names', [
+    (cf.SORT_ALPHA, ['Cover.jpg', 'Page 10.jpg', 'Page 100.jpg', 'Page 9.jpg', 'Page 9a.jpg']),
+    (cf.SORT_ALPHA_NUMBER, ['Cover.jpg', 'Page 9.jpg', 'Page 9a.jpg', 'Page 10.jpg', 'Page 100.jpg']),
+])
+def test_sort_methods(sort_method, sorted_names):
+    assert sorted(PAGE_NAMES, key = cf.GetSortKeyFunction(sort_method)) == sorted_names
+
+
+def test_numbers_only_ignores_letters_and_sorts_names_without_numbers_last():
+    page_names = ['b12.jpg', 'a100.jpg', 'cover.jpg', 'c3.jpg']
+    assert sorted(page_names, key = cf.GetSortKeyFunction(cf.SORT_NUMBERS_ONLY)) == ['c3.jpg', 'b12.jpg', 'a100.jpg', 'cover.jpg']
+
+
+def test_numbers_of_any_length():
+    page_names = ['p' + '9' * 20, 'p1' + '0' * 20, 'p2']
+    assert sorted(page_names, key = cf.GetSortKeyFunction(cf.SORT_ALPHA_NUMBER)) == ['p2', 'p' + '9' * 20, 'p1' + '0' * 20]
+
+
+def test_leading_zeros_are_the_same_number():
+    assert cf.MakeSortKey('Page 009.jpg', cf.SORT_ALPHA_NUMBER) == cf.MakeSortKey('Page 9.jpg', cf.SORT_ALPHA_NUMBER)
+    assert cf.MakeSortKey('Page 009.jpg', cf.SORT_ALPHA) < cf.MakeSortKey('Page 9.jpg', cf.SORT_ALPHA)
+
+
+def test_names_starting_with_numbers_sort_with_the_rest():
+    page_names = ['10 End.jpg', 'Page 2.jpg', '2 Start.jpg']
+    assert sorted(page_names, key = cf.GetSortKeyFunction(cf.SORT_ALPHA_NUMBER)) == ['2 Start.jpg', '10 End.jpg', 'Page 2.jpg']
+
+
+@pytest.mark.parametrize('path', ['Comic/Page 2.jpg', 'Comic\\Page 2.jpg', 'Page 2.jpg'])
+def test_file_name_only(path):
+    assert cf.MakeSortKey(path, cf.SORT_ALPHA_NUMBER, file_name_only = True) == ('Page ', 2, '.jpg')
+
+
+def test_folders_sort_pages_without_file_name_only():
+    page_paths = ['B/01.jpg', 'A/02.jpg']
+    assert sorted(page_paths, key = cf.GetSortKeyFunction(cf.SORT_ALPHA_NUMBER)) == ['A/02.jpg', 'B/01.jpg']
+    assert sorted(page_paths, key = cf.GetSortKeyFunction(cf.SORT_ALPHA_NUMBER, True)) == ['B/01.jpg', 'A/02.jpg']
+
+
+def test_keys_are_cached_for_each_sort_method(monkeypatch):
+    monkeypatch.setattr(cf, 'sort_key_caches', {})
+    made = []
+    make_sort_key = cf.MakeSortKey
+    monkeypatch.setattr(cf, 'MakeSortKey', lambda *args: made.append(args[0]) or make_sort_key(*args))
+
+    sorted(PAGE_NAMES, key = cf.GetSortKeyFunction(cf.SORT_ALPHA_NUMBER))
+    sorted(PAGE_NAMES, key = cf.GetSortKeyFunction(cf.SORT_ALPHA_NUMBER))
+    assert sorted(made) == sorted(PAGE_NAMES)
+    sorted(PAGE_NAMES, key = cf.GetSortKeyFunction(cf.SORT_NUMBERS_ONLY))
+    assert len(made) == 2 * len(PAGE_NAMES)
+
+
+def test_full_cache_is_cleared(monkeypatch):
+    monkeypatch.setattr(cf, 'sort_key_caches', {})
+    monkeypatch.setattr(cf, 'SORT_KEY_CACHE_SIZE', 2)
+    get_sort_key = cf.GetSortKeyFunction(cf.SORT_ALPHA_NUMBER)
+    for page_name in PAGE_NAMES:
+        get_sort_key(page_name)
+    assert len(cf.sort_key_caches[(cf.SORT_ALPHA_NUMBER, False)]) <= 2
+    assert get_sort_key('Page 9.jpg') == ('Page ', 9, '.jpg')
+
+
+def test_sort_files_by_file_name():
+    files = [(Path('x/Page 10.jpg'),), (Path('y/Page 9.jpg'),)]
+    assert sorted(files, key = lambda file: cf.SortFiles(file, 0)) == files[::-1]
@@ -0,0 +1,58 @@
+import pytest
+
+import auto_page_extract_edit_save as apes
+from conftest import make_cbr
+
+
+@pytest.fixture
+def hooks():
+    registered = []
+    yield lambda callback, *args: registered.append(apes.registerStageHook(callback, *args)) or callback
+    for callback in registered:
+        apes.unregisterStageHook(callback)
+    assert not apes.stage_hooks
+
+
+def runBook(tmp_path, total_pages = 2):
+    cbr_file_path = make_cbr(tmp_path / 'Book.cbr', total_pages)
+    all_the_data = apes.findCBRFiles(cbr_file_path, apes.changePreset({apes.SAVE_DIR_PATH : str(tmp_path / 'out')}, {}))
+    return cbr_file_path, apes.extractEditSavePages(all_the_data)
+
+
+def test_hooks_called_before_and_after_each_stage(tmp_path, zip_cbr_files, hooks):
+    calls = []
+    hooks(lambda *call: calls.append(call), [apes.TIME_EXTRACT, apes.TIME_SAVE])
+    cbr_file_path, all_the_data = runBook(tmp_path)
+
+    assert [(event, stage, page_index) for event, stage, path, page_index, timing in calls] == [
+        (apes.BEFORE_STAGE, apes.TIME_EXTRACT, 0), (apes.AFTER_STAGE, apes.TIME_EXTRACT, 0),
+        (apes.BEFORE_STAGE, apes.TIME_EXTRACT, 1), (apes.AFTER_STAGE, apes.TIME_EXTRACT, 1),
+        (apes.BEFORE_STAGE, apes.TIME_SAVE, 0), (apes.AFTER_STAGE, apes.TIME_SAVE, 0),
+        (apes.BEFORE_STAGE, apes.TIME_SAVE, 1), (apes.AFTER_STAGE, apes.TIME_SAVE, 1),
+    ]
+    assert all(path == cbr_file_path for event, stage, path, page_index, timing in calls)
+    assert all((timing is None) == (event == apes.BEFORE_STAGE) for event, stage, path, page_index, timing in calls)
+    # The timing given is the one recorded.
+    page_table = all_the_data[apes.LOG_DATA][apes.PAGE_DATA][cbr_file_path]
+    assert list(calls[1][4]) == page_table.page_times[0][apes.TIME_EXTRACT]
+
+
+def test_failing_hook_is_reported_and_skipped(tmp_path, zip_cbr_files, hooks, capsys):
+    def failingHook(*call):
+        raise RuntimeError('Exporter Down')
+    calls = []
+    hooks(failingHook, [apes.TIME_SAVE], [apes.AFTER_STAGE])
+    hooks(lambda *call: calls.append(call), [apes.TIME_SAVE], [apes.AFTER_STAGE])
+    cbr_file_path, all_the_data = runBook(tmp_path)
+
+    assert len(calls) == 2
+    assert capsys.readouterr().out.count('Stage Hook Error: RuntimeError: Exporter Down') == 2
+    assert len(all_the_data[apes.LOG_DATA][apes.PAGE_DATA][cbr_file_path].save_paths) == 2
+
+
+def test_unregistered_hook_is_not_called(tmp_path, zip_cbr_files, hooks):
+    calls = []
+    callback = apes.registerStageHook(lambda *call: calls.append(call))
+    apes.unregisterStageHook(callback)
+    runBook(tmp_path)
+    assert not calls
@@ -0,0 +1,43 @@
+import pytest
+
+import auto_page_extract_edit_save as apes
+
+
+def gradientPage(size):
+    page = apes.Image.linear_gradient('L').resize(size).convert('RGB')
+    return apes.Image.merge('RGB', (page.getchannel(0), page.getchannel(1).transpose(apes.Image.Transpose.FLIP_TOP_BOTTOM), page.getchannel(2)))
+
+
+@pytest.mark.parametrize('resample, pillow_resample', [
+    (apes.NEAREST, apes.Image.Resampling.NEAREST),
+    (apes.BILINEAR, apes.Image.Resampling.BILINEAR),
+    (apes.BICUBIC, apes.Image.Resampling.BICUBIC),
+])
+def test_band_resize_matches_one_resize(monkeypatch, resample, pillow_resample):
+    monkeypatch.setattr(apes, 'TALL_PAGE_HEIGHT', 300)
+    monkeypatch.setattr(apes, 'BAND_HEIGHT', 32)
+    page = gradientPage((80, 1000))
+    resized_page = apes.resizeImage(page, (apes.CHANGE_TO, 40), (apes.CHANGE_TO, 500), False, resample)
+
+    assert resized_page.size == (40, 500)
+    assert resized_page.tobytes() == page.resize((40, 500), resample = pillow_resample).tobytes()
+
+
+def test_slices_numbered_after_page_number(tmp_path, monkeypatch):
+    monkeypatch.setattr(apes, 'verbosity', apes.SHOW_ERRORS)
+    monkeypatch.setattr(apes, 'create_log_file', False)
+    cbr_file_path = tmp_path / 'Book.cbr'
+    preset = {apes.SAVE_DIR_PATH : str(tmp_path / 'out'), apes.SLICE_TALL_PAGES : 200,
+              apes.MODIFY_FILE_NAMES : [apes.INSERT_PAGE_NUMBER, '-', apes.INSERT_COUNTER]}
+    all_the_data = apes.changePreset(preset, {})
+    page_table = apes.PageTable(['01.png', '02.png', '03.png'])
+    page_table.page_indexes.add(range(3))
+    all_the_data[apes.LOG_DATA][apes.PAGE_DATA][cbr_file_path] = page_table
+    all_the_data[apes.IMAGE_DATA] = {0 : gradientPage((60, 90)), 1 : gradientPage((60, 450)), 2 : gradientPage((60, 90))}
+
+    apes.savePages(all_the_data, cbr_file_path)
+
+    assert sorted(path.name for path in (tmp_path / 'out').iterdir()) == ['1-1.png', '2_1-2.png', '2_2-3.png', '2_3-4.png', '3-5.png']
+    assert [apes.Image.open(tmp_path / 'out' / name).height for name in ('2_1-2.png', '2_2-3.png', '2_3-4.png')] == [200, 200, 50]
+    assert page_table.save_paths[1].endswith('2_1-2.png')
+    assert [apes.Path(path).name for path in page_table.slices[1]] == ['2_1-2.png', '2_2-3.png', '2_3-4.png']
@@ -0,0 +1,103 @@
+import shutil
+
+import auto_page_extract_edit_save as apes
+from conftest import make_cbr
+
+
+def processBatch(all_the_data, cbr_file_paths):
+    for cbr_file_path in cbr_file_paths:
+        all_the_data = apes.findCBRFiles(cbr_file_path, all_the_data)
+    all_the_data = apes.extractEditSavePages(all_the_data)
+    return apes.evictFinishedArchives(all_the_data)
+
+
+def newRun(tmp_path):
+    preset = {**apes.preset_options[0], apes.SAVE_DIR_PATH : str(tmp_path / 'out'), apes.MODIFY_FILE_NAMES : [apes.INSERT_FILE_NAME, '-', apes.INSERT_PAGE_NUMBER]}
+    return apes.changePreset(preset, {})
+
+
+def test_finished_cbr_files_are_let_go(tmp_path, zip_cbr_files):
+    first = make_cbr(tmp_path / 'first.cbr', 3)
+    other = make_cbr(tmp_path / 'other.cbr', 2, (10, 20, 30))
+    all_the_data = processBatch(newRun(tmp_path), [first, other])
+    log_data = all_the_data[apes.LOG_DATA]
+
+    assert not log_data[apes.CBR_FILE_PATHS]
+    assert not log_data[apes.PLANNED_SAVE_PATHS]
+    # Kept only so later copies can reuse their saved pages.
+    assert set(log_data[apes.PAGE_DATA]) == {first, other}
+    assert all(not page_table.page_times for page_table in log_data[apes.PAGE_DATA].values())
+    assert log_data[apes.RUN_COUNTERS].archives_done == 2
+
+
+def test_copy_in_later_batch_reuses_saved_pages(tmp_path, zip_cbr_files):
+    first = make_cbr(tmp_path / 'first.cbr', 3)
+    all_the_data = processBatch(newRun(tmp_path), [first])
+
+    copy = shutil.copy(first, tmp_path / 'copy.cbr')
+    all_the_data = apes.findCBRFiles(apes.Path(copy), all_the_data)
+    page_table = all_the_data[apes.LOG_DATA][apes.PAGE_DATA][apes.Path(copy)]
+    assert page_table.duplicate_of == first
+    assert apes.canReuseArchive(all_the_data, apes.Path(copy))
+
+    all_the_data = apes.extractEditSavePages(all_the_data)
+    assert len(page_table.save_paths) == 3
+    assert all((tmp_path / 'out' / 'Comic' / f'copy-{number}.jpg').exists() for number in range(1, 4))
+
+
+def test_cbr_files_kept_for_reuse_are_limited(tmp_path, zip_cbr_files, monkeypatch):
+    monkeypatch.setattr(apes, 'WATCH_REUSABLE_ARCHIVES', 1)
+    cbr_file_paths = [make_cbr(tmp_path / f'c{number}.cbr', 2, (number * 40, 20, 30)) for number in range(3)]
+    all_the_data = newRun(tmp_path)
+    for cbr_file_path in cbr_file_paths:
+        all_the_data = processBatch(all_the_data, [cbr_file_path])
+    log_data = all_the_data[apes.LOG_DATA]
+
+    assert list(log_data[apes.PAGE_DATA]) == [cbr_file_paths[-1]]
+    assert list(log_data[apes.ARCHIVE_FINGERPRINTS].values()) == [cbr_file_paths[-1]]
+
+
+def test_forgetting_cbr_file_frees_its_planned_save_paths(tmp_path, zip_cbr_files):
+    first = make_cbr(tmp_path / 'first.cbr', 3)
+    all_the_data = apes.findCBRFiles(first, newRun(tmp_path))
+    all_the_data = apes.planSavePaths(all_the_data, first)
+    assert len(all_the_data[apes.LOG_DATA][apes.PLANNED_SAVE_PATHS]) == 3
+
+    all_the_data = apes.forgetArchive(all_the_data, first)
+    assert not all_the_data[apes.LOG_DATA][apes.PLANNED_SAVE_PATHS]
+    assert all_the_data[apes.LOG_DATA][apes.RUN_COUNTERS].archives_found == 0
+
+
+def watchUntil(all_the_data, watch_dir, monkeypatch, polls):
+    waits = []
+    def wait(seconds):
+        waits.append(seconds)
+        if len(waits) >= polls:
+            raise KeyboardInterrupt
+    monkeypatch.setattr(apes, 'Wait', wait)
+    return apes.watchDirectories(all_the_data, [watch_dir], poll_interval = 0, settle_time = 0)
+
+
+def test_watching_is_quiet_when_only_showing_errors(tmp_path, zip_cbr_files, monkeypatch, capsys):
+    watch_dir = tmp_path / 'watch'
+    watch_dir.mkdir()
+    make_cbr(watch_dir / 'Book.cbr', 2)
+    all_the_data = apes.changePreset({apes.SAVE_DIR_PATH : str(tmp_path / 'out')}, {})
+
+    # Seen on the first poll, settled and saved on the second.
+    watchUntil(all_the_data, watch_dir, monkeypatch, 2)
+
+    assert len(list((tmp_path / 'out').rglob('*.jpg'))) == 2
+    assert 'Watching' not in capsys.readouterr().out
+
+
+def test_watching_is_shown_with_progress(tmp_path, zip_cbr_files, monkeypatch, capsys):
+    monkeypatch.setattr(apes, 'verbosity', apes.SHOW_PROGRESS)
+    watch_dir = tmp_path / 'watch'
+    all_the_data = apes.changePreset({apes.SAVE_DIR_PATH : str(tmp_path / 'out')}, {})
+
+    watchUntil(all_the_data, watch_dir, monkeypatch, 1)
+
+    output = capsys.readouterr().out
+    assert f'Watching: {watch_dir}' in output
+    assert 'Stopped watching.' in output
@@ -0,0 +1,86 @@
+import json
+import os
+import time
+
+import auto_page_extract_edit_save as apes
+
+
+def test_claim_is_exclusive(tmp_path):
+    first = apes.WorkLeases(tmp_path / 'leases', 60.0)
+    second = apes.WorkLeases(tmp_path / 'leases', 60.0)
+    second.worker = 'other-worker'
+    try:
+        assert first.claim(tmp_path / 'a.cbr')
+        assert not second.claim(tmp_path / 'a.cbr')
+        assert second.claim(tmp_path / 'b.cbr')
+    finally:
+        first.close()
+        second.close()
+
+
+def test_done_is_never_claimed_again(tmp_path):
+    first = apes.WorkLeases(tmp_path / 'leases', 60.0)
+    second = apes.WorkLeases(tmp_path / 'leases', 60.0)
+    assert first.claim(tmp_path / 'a.cbr')
+    first.finish(tmp_path / 'a.cbr')
+    assert second.isDone(tmp_path / 'a.cbr')
+    assert not second.claim(tmp_path / 'a.cbr')
+    assert not first.getLeasePath(tmp_path / 'a.cbr').exists()
+
+
+def test_release_lets_others_claim(tmp_path):
+    first = apes.WorkLeases(tmp_path / 'leases', 60.0)
+    second = apes.WorkLeases(tmp_path / 'leases', 60.0)
+    assert first.claim(tmp_path / 'a.cbr')
+    first.release(tmp_path / 'a.cbr')
+    assert second.claim(tmp_path / 'a.cbr')
+    second.close()
+
+
+def test_expired_lease_is_taken_over(tmp_path):
+    leases = apes.WorkLeases(tmp_path / 'leases', 5.0)
+    lease_path = leases.getLeasePath(tmp_path / 'a.cbr')
+    lease_path.write_text(json.dumps({'worker' : 'crashed'}))
+    os.utime(lease_path, (time.time() - 60, time.time() - 60))
+    assert leases.claim(tmp_path / 'a.cbr')
+    assert json.loads(lease_path.read_text())['worker'] == leases.worker
+    leases.close()
+
+
+def test_fresh_lease_is_not_taken_over(tmp_path):
+    leases = apes.WorkLeases(tmp_path / 'leases', 5.0)
+    lease_path = leases.getLeasePath(tmp_path / 'a.cbr')
+    lease_path.write_text(json.dumps({'worker' : 'busy'}))
+    assert not leases.claim(tmp_path / 'a.cbr')
+    assert json.loads(lease_path.read_text())['worker'] == 'busy'
+
+
+def test_take_over_race_puts_new_lease_back(tmp_path, monkeypatch):
+    leases = apes.WorkLeases(tmp_path / 'leases', 5.0)
+    lease_path = leases.getLeasePath(tmp_path / 'a.cbr')
+    lease_path.write_text(json.dumps({'worker' : 'crashed'}))
+    os.utime(lease_path, (time.time() - 60, time.time() - 60))
+    
+    # Another worker takes over the expired lease and claims it right before this worker renames it.
+    rename = os.rename
+    def renameAfterOtherWorker(source, destination):
+        lease_path.unlink()
+        lease_path.write_text(json.dumps({'worker' : 'other-worker'}))
+        monkeypatch.setattr(apes.os, 'rename', rename)
+        rename(source, destination)
+    monkeypatch.setattr(apes.os, 'rename', renameAfterOtherWorker)
+    
+    assert not leases.takeOver(lease_path)
+    assert json.loads(lease_path.read_text())['worker'] == 'other-worker'
+    assert [path.name for path in lease_path.parent.iterdir()] == [lease_path.name]
+
+
+def test_heartbeat_renews_leases(tmp_path):
+    leases = apes.WorkLeases(tmp_path / 'leases', 0.3)
+    assert leases.claim(tmp_path / 'a.cbr')
+    lease_path = leases.getLeasePath(tmp_path / 'a.cbr')
+    os.utime(lease_path, (0, 0))
+    time.sleep(0.35)
+    assert time.time() - lease_path.stat().st_mtime < 1
+    leases.close()
+    assert not lease_path.exists()